@@ -0,0 +1,63 @@
+'''Compares loading the game's assets from their source files with reading them back from the asset manager's disk cache.
+Run with "python -m benchmarks.bench_assets" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import pygame
+import shutil
+import tempfile
+
+core_object = boot()
+
+from utils.asset_manager import AssetManager
+
+IMAGES : list[tuple[str, dict]] = [
+    ('assets/graphics/player/main.png', {'colorkey' : [0, 255, 0], 'flatten' : True}),
+    ('assets/graphics/enemy/flash_dark.png', {'colorkey' : [0, 255, 0], 'flatten' : True}),
+    ('assets/graphics/enemy/normal/main.png', {'colorkey' : [73, 197, 2], 'flatten' : True}),
+    ('assets/graphics/enemy/quick/main.png', {'colorkey' : [73, 197, 2], 'flatten' : True}),
+    ('assets/graphics/enemy/tank/main.png', {'colorkey' : [73, 197, 2], 'flatten' : True}),
+    ('assets/graphics/enemy/ranged/main.png', {'colorkey' : [0, 255, 0], 'flatten' : True}),
+    ('assets/graphics/ui/heart_green_colorkey.png', {'colorkey' : [0, 255, 0], 'scale' : 0.1}),
+    ('assets/graphics/ui/resized_token_green_colorkey.png', {'colorkey' : [0, 255, 0], 'scale' : 0.075}),
+    ('assets/graphics/button_templates/textbox_green_colorkey.png', {'alpha' : False, 'colorkey' : (0, 255, 0)}),
+    ('assets/graphics/button_templates/green_button.png', {}),
+    ('assets/graphics/button_templates/hover_icon.png', {}),
+]
+SOUNDS : list[tuple[str, float]] = [('assets/audio/stress_theme.ogg', 0.35), ('assets/audio/main_theme.ogg', 0.25),
+                                    ('assets/audio/hit.ogg', 0.15), ('assets/audio/shot.ogg', 0.10)]
+
+def load_all(cache_dir : str, use_disk_cache : bool = True) -> AssetManager:
+    manager = AssetManager(cache_dir)
+    manager.use_disk_cache = use_disk_cache
+    for path, params in IMAGES:
+        manager.get_image(path, **params)
+    for path, volume in SOUNDS:
+        manager.get_sound(path, volume)
+    return manager
+
+def signature(image : pygame.Surface) -> tuple:
+    return image.get_size(), image.get_colorkey(), pygame.image.tobytes(image, 'RGBA')
+
+def check(cache_dir : str):
+    source = load_all(cache_dir)
+    cached = load_all(cache_dir)
+    assert cached.disk_hits == len(IMAGES) + len(SOUNDS) and cached.misses == 0, 'the disk cache was not used'
+    for key, image in source.images.items():
+        assert signature(image) == signature(cached.images[key]), f'cached {key[0]} differs'
+    for key, sound in source.sounds.items():
+        assert sound.get_raw() == cached.sounds[key].get_raw(), f'cached {key[0]} differs'
+    assert cached.get_image(*IMAGES[0][:1], **IMAGES[0][1]) is cached.images[next(iter(cached.images))], 'repeated loads are not shared'
+
+def main():
+    cache_dir = tempfile.mkdtemp()
+    try:
+        check(cache_dir)
+        source_time = time_it(lambda : load_all(cache_dir, False), 3)
+        cached_time = time_it(lambda : load_all(cache_dir), 3)
+    finally:
+        shutil.rmtree(cache_dir)
+    print(f'{len(IMAGES)} images and {len(SOUNDS)} sounds')
+    print(f'{"source files (ms)":>18} {"disk cache (ms)":>16} {"speedup":>8}')
+    print(f'{source_time:>18.1f} {cached_time:>16.1f} {source_time / cached_time:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+'''Compares zombies drawing from the render atlas with the old zombies, which carried a Pivot2D, a flash Timer and their own
+instance dictionary, and swapped surfaces through the image setter and the mask cache to flash.
+OldZombie reproduces the old spawn and flash code. Run with "python -m benchmarks.bench_atlas" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import random
+import tracemalloc
+import pygame
+
+core_object = boot()
+
+from game.sprite import Sprite
+from game.enemy import BaseZombie, NormalZombie
+from utils.indexed_list import IndexedList
+from utils.pivot_2d import Pivot2D
+from utils.my_timer import Timer
+from utils.render_atlas import render_atlas
+
+COUNT : int = 1000
+REPEATS : int = 20
+
+class OldZombie(BaseZombie):
+    '''Gets an instance dictionary back by not declaring __slots__, like every zombie class before the atlas.'''
+    inactive_elements : IndexedList['OldZombie'] = IndexedList()
+    active_elements : IndexedList['OldZombie'] = IndexedList()
+    test_image : pygame.Surface = NormalZombie.test_image
+    flash_image : pygame.Surface = BaseZombie.flash_image
+    def __init__(self) -> None:
+        super().__init__()
+        self.dynamic_mask = True
+        self.flash_timer : Timer
+        self.og_image : pygame.Surface|None = None
+
+    @classmethod
+    def spawn(cls, new_pos : pygame.Vector2, health : int, speed : int = 3, damage : int = 1):
+        element = cls.get_inactive()
+        element.image = cls.test_image
+        element.rect = element.image.get_rect()
+        element.position = new_pos
+        element.align_rect()
+        element.zindex = 10
+        element.pivot = Pivot2D(element._position, element.image, (0, 0, 255))
+        element.max_hp = health
+        element.hp = health
+        element.speed = speed
+        element.damage = damage
+        element.flashing = False
+        element.flash_timer = Timer(-1, core_object.game.game_timer.get_time)
+        element.og_image = None
+        element.is_dying = False
+        cls.unpool(element)
+        return element
+
+    def start_flashing(self):
+        if self.flashing: self.flash_timer.restart(); return
+        self.flashing = True
+        self.flash_timer.set_duration(0.15)
+        self.og_image = self.image
+        self.image = self.flash_image
+
+    def stop_flashing(self):
+        if not self.flashing: return
+        self.flashing = False
+        self.flash_timer.set_duration(-1)
+        self.image = self.og_image
+        self.og_image = None
+
+def spawn_all(zombie_class : type[Sprite], positions : list[pygame.Vector2]) -> list[Sprite]:
+    return [zombie_class.spawn(position.copy(), 9, 3.5) for position in positions]
+
+def flash_all(zombies : list[Sprite]):
+    for zombie in zombies:
+        zombie.start_flashing()
+    for zombie in zombies:
+        zombie.stop_flashing()
+
+def get_spawn_memory(zombie_class : type[Sprite], positions : list[pygame.Vector2]) -> float:
+    '''Bytes allocated per zombie to construct and spawn COUNT of them from an empty pool.'''
+    Sprite.kill_all_sprites()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    zombies = spawn_all(zombie_class, positions)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(zombies) == COUNT
+    return (after - before) / COUNT
+
+def check(positions : list[pygame.Vector2]):
+    old = spawn_all(OldZombie, positions[:50])
+    new = spawn_all(NormalZombie, positions[:50])
+    for old_zombie, new_zombie in zip(old, new):
+        assert old_zombie.rect == new_zombie.rect and old_zombie.image is new_zombie.image, 'atlas zombies spawn differently'
+        old_zombie.start_flashing()
+        new_zombie.start_flashing()
+        assert pygame.image.tobytes(old_zombie.image, 'RGBA') == pygame.image.tobytes(new_zombie.image, 'RGBA'), 'the flash surfaces differ'
+        assert new_zombie.rect.size == render_atlas.get_size(NormalZombie.base_skin), 'flashing changed the rect size'
+        assert new_zombie.mask is render_atlas.masks[NormalZombie.flash_skin], 'the flash mask is not the precomputed one'
+        assert old_zombie.mask.count() == new_zombie.mask.count(), 'the flash masks differ'
+        new_zombie.stop_flashing()
+        assert new_zombie.image is NormalZombie.test_image and new_zombie.mask is render_atlas.masks[NormalZombie.base_skin]
+    assert not hasattr(new[0], '__dict__'), 'atlas zombies still carry an instance dictionary'
+    Sprite.kill_all_sprites()
+
+def main():
+    random.seed(COUNT)
+    positions = [pygame.Vector2(random.uniform(0, 960), random.uniform(0, 540)) for _ in range(COUNT)]
+    check(positions)
+    old_memory = get_spawn_memory(OldZombie, positions[:COUNT])
+    new_memory = get_spawn_memory(NormalZombie, positions[:COUNT])
+
+    Sprite.kill_all_sprites()
+    old_spawn = time_it(lambda : (spawn_all(OldZombie, positions), Sprite.kill_all_sprites()), REPEATS)
+    new_spawn = time_it(lambda : (spawn_all(NormalZombie, positions), Sprite.kill_all_sprites()), REPEATS)
+    old_zombies = spawn_all(OldZombie, positions)
+    old_flash = time_it(lambda : flash_all(old_zombies), REPEATS)
+    Sprite.kill_all_sprites()
+    new_zombies = spawn_all(NormalZombie, positions)
+    new_flash = time_it(lambda : flash_all(new_zombies), REPEATS)
+    Sprite.kill_all_sprites()
+
+    print(f'{COUNT} zombies')
+    print(f'{"":>22} {"old":>9} {"atlas":>9} {"ratio":>7}')
+    for name, old, new in (('bytes per zombie', old_memory, new_memory), ('spawn + pool (ms)', old_spawn, new_spawn),
+                           ('flash on + off (ms)', old_flash, new_flash)):
+        print(f'{name:>22} {old:>9.2f} {new:>9.2f} {old / new:>6.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+'''Compares the fill rate of the brightness pass and of fade overlays before and after they were sized to the display.
+The old paths are reproduced here: a 2000x2000 brightness surface blitted over the display, and an overlay surface allocated
+on every tween step. Run with "python -m benchmarks.bench_brightness" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import random
+import pygame
+
+core_object = boot()
+
+from utils.ui.brightness_overlay import BrightnessOverlay
+
+FRAMES : int = 200
+BRIGHTNESS_LEVELS : list[int] = [-60, -20, 30, 80]
+
+def make_scene(display : pygame.Surface):
+    random.seed(1)
+    display.fill((94, 129, 162))
+    for _ in range(300):
+        color = (random.randrange(256), random.randrange(256), random.randrange(256))
+        pygame.draw.circle(display, color, (random.randrange(960), random.randrange(540)), random.randrange(5, 40))
+
+def make_old_map(brightness : int) -> tuple[pygame.Surface, int]:
+    brightness_map = pygame.Surface((2000, 2000), pygame.SRCALPHA)
+    abs_brightness = abs(brightness)
+    pygame.draw.rect(brightness_map, (abs_brightness, abs_brightness, abs_brightness), (0, 0, 2000, 2000))
+    return brightness_map, pygame.BLEND_RGB_ADD if brightness >= 0 else pygame.BLEND_RGB_SUB
+
+def old_overlay_step(display : pygame.Surface, brightness : int):
+    '''The old BrightnessOverlay: a new surface per tween step, blitted in the blend mode.'''
+    abs_brightness = abs(brightness) if brightness >= 0 else 255 - abs(brightness)
+    surf = pygame.Surface(display.get_size())
+    surf.fill((abs_brightness, abs_brightness, abs_brightness))
+    display.blit(surf, (0, 0), special_flags=pygame.BLEND_RGB_ADD if brightness >= 0 else pygame.BLEND_RGB_MULT)
+
+def check(display : pygame.Surface, scene : pygame.Surface):
+    for brightness in BRIGHTNESS_LEVELS:
+        brightness_map, blend_mode = make_old_map(brightness)
+        display.blit(scene, (0, 0))
+        display.blit(brightness_map, (0, 0), special_flags=blend_mode)
+        expected = pygame.image.tobytes(display, 'RGB')
+        core_object.set_brightness(brightness)
+        display.blit(scene, (0, 0))
+        display.fill(core_object.brightness_color, special_flags=core_object.brightness_blend_mode)
+        assert pygame.image.tobytes(display, 'RGB') == expected, f'brightness {brightness} differs'
+
+        overlay = BrightnessOverlay(0, display.get_rect(), 0)
+        overlay.brightness = brightness
+        display.blit(scene, (0, 0))
+        old_overlay_step(display, brightness)
+        expected = pygame.image.tobytes(display, 'RGB')
+        display.blit(scene, (0, 0))
+        overlay.draw(display)
+        assert pygame.image.tobytes(display, 'RGB') == expected, f'overlay at {brightness} differs'
+
+def main():
+    display = core_object.main_display
+    make_scene(display)
+    scene = display.copy()
+    check(display, scene)
+    megapixels = display.get_width() * display.get_height() / 1e6
+
+    brightness_map, blend_mode = make_old_map(-40)
+    old_pass = time_it(lambda : display.blit(brightness_map, (0, 0), special_flags=blend_mode), FRAMES)
+    core_object.set_brightness(-40)
+    new_pass = time_it(lambda : display.fill(core_object.brightness_color, special_flags=core_object.brightness_blend_mode), FRAMES)
+
+    steps = iter(range(10 ** 9))
+    old_fade = time_it(lambda : old_overlay_step(display, -(next(steps) % 255)), FRAMES)
+    overlay = BrightnessOverlay(0, display.get_rect(), 0)
+    def new_fade_step():
+        overlay.brightness = -(next(steps) % 255)
+        overlay.draw(display)
+    new_fade = time_it(new_fade_step, FRAMES)
+
+    print(f'{"pass":>16} {"before (ms)":>12} {"after (ms)":>11} {"speedup":>8} {"fill rate after (Mpx/s)":>24}')
+    for name, before, after in (('brightness', old_pass, new_pass), ('fade tween step', old_fade, new_fade)):
+        print(f'{name:>16} {before:>12.3f} {after:>11.3f} {before / after:>7.1f}x {megapixels / after * 1000:>24.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+'''Compares the old pairwise zombie cluster search with the grid search in utils.clustering.
+Run with "python -m benchmarks.bench_clusters" from the project root.'''
+from benchmarks.bench_setup import time_it
+import random
+import pygame
+from utils.clustering import find_clusters
+from utils.helpers import tuple_vec_average
+
+FRAMES : int = 10
+SIZES : list[int] = [50, 200, 500, 1000]
+
+def pairwise_clusters(positions : list[tuple[float, float]]) -> dict[tuple[float, float], int]:
+    '''The search BaseZombie.update_class used to run every frame.'''
+    vectors = [pygame.Vector2(position) for position in positions]
+    clusters : dict[tuple[float, float], set[int]] = {}
+    for i, zombie_pos in enumerate(vectors):
+        result : set[int] = {i}
+        for j, other_zombie_pos in enumerate(vectors):
+            if i >= j: continue
+            if (zombie_pos - other_zombie_pos).magnitude_squared() <= 18 * 18:
+                result.add(j)
+        if len(result) >= 3: clusters[(zombie_pos.x, zombie_pos.y)] = result
+
+    grouped_clusters : dict[tuple[float, float], int] = {}
+    banned_clusters : list[tuple[float, float]] = []
+    for i, cluster in enumerate(clusters):
+        if cluster in banned_clusters: continue
+        group : list[tuple[float, float]] = [cluster]
+        for j, other_cluster in enumerate(clusters):
+            if i >= j: continue
+            if other_cluster in banned_clusters: continue
+            if (cluster[0] - other_cluster[0]) ** 2 + (cluster[1] - other_cluster[1]) ** 2 < 18 * 18:
+                group.append(other_cluster)
+                banned_clusters.append(other_cluster)
+        banned_clusters.append(cluster)
+        grouped_clusters[tuple_vec_average(group)] = len(set().union(*[clusters[pos] for pos in group]))
+    return grouped_clusters
+
+def make_positions(count : int) -> list[tuple[float, float]]:
+    '''Zombies bunched around the center of the screen, the way they crowd around the player. Some sit exactly 18px apart.'''
+    positions = [(random.gauss(480, 120), random.gauss(270, 80)) for _ in range(count)]
+    for index in range(0, count, 10):
+        x, y = positions[index]
+        positions.append((x + 18, y))
+    return positions[:count]
+
+def check():
+    for seed in range(50):
+        random.seed(seed)
+        positions = make_positions(random.randint(1, 300))
+        assert find_clusters(positions, 18, 3) == pairwise_clusters(positions), 'grid clusters differ from the pairwise search'
+
+def main():
+    check()
+    print(f'{"zombies":>8} {"clusters":>9} {"pairwise (ms)":>14} {"grid (ms)":>10} {"speedup":>8}')
+    for count in SIZES:
+        random.seed(count)
+        positions = make_positions(count)
+        cluster_count = len(find_clusters(positions, 18, 3))
+        pairwise_time = time_it(lambda : pairwise_clusters(positions), FRAMES)
+        grid_time = time_it(lambda : find_clusters(positions, 18, 3), FRAMES)
+        print(f'{count:>8} {cluster_count:>9} {pairwise_time:>14.2f} {grid_time:>10.2f} {pairwise_time / grid_time:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
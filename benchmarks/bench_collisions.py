@@ -0,0 +1,60 @@
+'''Compares the brute-force collision scan with the spatial hash.
+Run with "python -m benchmarks.bench_collisions" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import random
+import pygame
+
+core_object = boot()
+
+from game.sprite import Sprite
+from game.enemy import BaseZombie, NormalZombie
+from game.projectiles import BaseProjectile, NormalProjectile
+
+FRAMES : int = 30
+SIZES : list[tuple[int, int]] = [(50, 25), (100, 50), (200, 100), (400, 200)]
+
+def populate(zombie_count : int, bullet_count : int):
+    Sprite.kill_all_sprites()
+    while len(NormalZombie.inactive_elements) < zombie_count: NormalZombie()
+    while len(NormalProjectile.inactive_elements) < bullet_count: NormalProjectile()
+    for _ in range(zombie_count):
+        NormalZombie.spawn(pygame.Vector2(random.uniform(0, 960), random.uniform(0, 540)), 10)
+    for _ in range(bullet_count):
+        direction = pygame.Vector2(1, 0).rotate(random.uniform(0, 360))
+        NormalProjectile.spawn(pygame.Vector2(random.uniform(0, 960), random.uniform(0, 540)), 7, direction)
+
+def step():
+    for bullet in BaseProjectile.active_elements:
+        bullet.position += bullet.velocity
+    for zombie in BaseZombie.active_elements:
+        zombie.position += pygame.Vector2(random.uniform(-3, 3), random.uniform(-3, 3))
+
+def brute_force() -> int:
+    step()
+    group = [BaseProjectile.active_elements]
+    return sum(len(zombie.get_all_colliding(group)) for zombie in BaseZombie.active_elements)
+
+def hashed() -> int:
+    step()
+    return sum(len(zombie.get_all_colliding(BaseProjectile)) for zombie in BaseZombie.active_elements)
+
+def check():
+    group = [BaseProjectile.active_elements]
+    for zombie in BaseZombie.active_elements:
+        expected = set(zombie.get_all_colliding(group))
+        assert set(zombie.get_all_colliding(BaseProjectile)) == expected, 'spatial hash results differ from the brute-force scan'
+
+def main():
+    print(f'{"zombies":>8} {"bullets":>8} {"brute (ms)":>11} {"hashed (ms)":>12} {"speedup":>8}')
+    for zombie_count, bullet_count in SIZES:
+        random.seed(zombie_count)
+        populate(zombie_count, bullet_count)
+        check()
+        brute_time = time_it(brute_force, FRAMES)
+        hashed_time = time_it(hashed, FRAMES)
+        check()
+        print(f'{zombie_count:>8} {bullet_count:>8} {brute_time:>11.2f} {hashed_time:>12.2f} {brute_time / hashed_time:>7.1f}x')
+    Sprite.kill_all_sprites()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+'''Compares drawing the sprites one blit at a time after a sort by zindex, like the old draw_all_sprites,
+with the zindex buckets and batched blits.
+Run with "python -m benchmarks.bench_draw" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import random
+import pygame
+
+core_object = boot()
+
+from game.sprite import Sprite
+from game.enemy import NormalZombie, TankZombie
+from game.projectiles import NormalProjectile, BaseProjectile
+
+FRAMES : int = 200
+SIZES : list[int] = [50, 200, 600]
+
+def populate(count : int):
+    Sprite.kill_all_sprites()
+    while len(NormalZombie.inactive_elements) < count: NormalZombie()
+    while len(TankZombie.inactive_elements) < count: TankZombie()
+    while len(NormalProjectile.inactive_elements) < count: NormalProjectile()
+    for index in range(count):
+        position = pygame.Vector2(random.uniform(0, 960), random.uniform(0, 540))
+        (NormalZombie if index % 2 else TankZombie).spawn(position, 10)
+        NormalProjectile.spawn(position, 5, pygame.Vector2(1, 0), BaseProjectile.TEAMS.friendly, 1)
+
+def draw_sorted(display : pygame.Surface):
+    for element in sorted(Sprite.active_elements, key=lambda sprite : sprite.zindex):
+        element.draw(display)
+
+def check(display : pygame.Surface, other : pygame.Surface):
+    order = Sprite.get_draw_order()
+    assert set(order) == set(Sprite.active_elements), 'the buckets do not hold the active sprites'
+    assert all(first.zindex <= second.zindex for first, second in zip(order, order[1:])), 'the buckets are out of order'
+    display.fill('Black')
+    for element in order: element.draw(display)
+    other.fill('Black')
+    Sprite.draw_all_sprites(other)
+    assert pygame.image.tobytes(display, 'RGB') == pygame.image.tobytes(other, 'RGB'), 'batched drawing differs'
+
+def main():
+    display = core_object.main_display
+    other = display.copy()
+    print(f'{"sprites":>8} {"sorted (ms)":>12} {"buckets (ms)":>13} {"speedup":>8}')
+    for count in SIZES:
+        random.seed(count)
+        populate(count)
+        check(display, other)
+        sorted_time = time_it(lambda : draw_sorted(display), FRAMES)
+        bucket_time = time_it(lambda : Sprite.draw_all_sprites(display), FRAMES)
+        print(f'{len(Sprite.active_elements):>8} {sorted_time:>12.3f} {bucket_time:>13.3f} {sorted_time / bucket_time:>7.1f}x')
+    Sprite.kill_all_sprites()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+'''Compares picking the sprites under a click by testing every active sprite (the old handle_mouse_event) with Sprite.pick,
+and dispatching events through the old handler lists with the snapshotted handler tuples.
+Run with "python -m benchmarks.bench_events" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import random
+import pygame
+
+core_object = boot()
+
+from game.sprite import Sprite
+from game.enemy import NormalZombie, TankZombie
+from game.projectiles import NormalProjectile
+
+CLICKS : int = 2000
+EVENTS : int = 20000
+SIZES : list[tuple[int, int]] = [(100, 50), (400, 200), (800, 400)]
+
+def populate(zombie_count : int, bullet_count : int):
+    Sprite.kill_all_sprites()
+    random.seed(zombie_count)
+    direction = pygame.Vector2(1, 0)
+    for index in range(zombie_count):
+        zombie_class = NormalZombie if index % 2 else TankZombie
+        zombie_class.spawn(pygame.Vector2(random.uniform(0, 960), random.uniform(0, 540)), 10)
+    for _ in range(bullet_count):
+        NormalProjectile.spawn(pygame.Vector2(random.uniform(0, 960), random.uniform(0, 540)), 1, direction)
+
+def old_pick(pos : tuple[int, int]) -> list[Sprite]:
+    hit = [sprite for sprite in Sprite.active_elements if sprite.rect.collidepoint(pos)]
+    hit.sort(key = lambda sprite : sprite.zindex)
+    return hit
+
+def check(clicks : list[tuple[int, int]]):
+    for pos in clicks[:200]:
+        expected = old_pick(pos)
+        hit = Sprite.pick(pos)
+        assert set(hit) == set(expected), 'picked different sprites'
+        assert [sprite.zindex for sprite in hit] == [sprite.zindex for sprite in expected], 'picked sprites are out of order'
+
+class OldDispatch:
+    '''The old EventManger.process_event, iterating the live handler lists.'''
+    def __init__(self, bound_actions : dict[int, list]) -> None:
+        self.bound_actions : dict[int, list] = bound_actions
+
+    def process_event(self, event : pygame.Event):
+        if event.type in self.bound_actions:
+            for callback in self.bound_actions[event.type]:
+                callback(event)
+
+def main():
+    print(f'{"sprites":>8} {"test all (ms)":>14} {"pick (ms)":>10} {"speedup":>8}')
+    for zombie_count, bullet_count in SIZES:
+        populate(zombie_count, bullet_count)
+        clicks = [(random.randrange(960), random.randrange(540)) for _ in range(CLICKS)]
+        check(clicks)
+        old_time = time_it(lambda : [old_pick(pos) for pos in clicks])
+        new_time = time_it(lambda : [Sprite.pick(pos) for pos in clicks])
+        print(f'{zombie_count + bullet_count:>8} {old_time:>14.2f} {new_time:>10.2f} {old_time / new_time:>7.1f}x')
+    Sprite.kill_all_sprites()
+
+    event_manager = core_object.event_manager
+    counter = [0]
+    def count(event : pygame.Event): counter[0] += 1
+    event_types = [pygame.USEREVENT + offset for offset in range(4)]
+    for event_type in event_types[:2]:
+        event_manager.bind(event_type, [count, lambda event : None])
+    events = [pygame.Event(random.choice(event_types)) for _ in range(EVENTS)]
+    old_manager = OldDispatch(event_manager.bound_actions)
+    old_time = time_it(lambda : [old_manager.process_event(event) for event in events])
+    expected, counter[0] = counter[0], 0
+    new_time = time_it(lambda : [event_manager.process_event(event) for event in events])
+    assert counter[0] == expected, 'dispatch called a different number of actions'
+    print(f'{EVENTS} events dispatched: lists {old_time:.2f} ms, tuples {new_time:.2f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+'''Simulates the same stretch of a scaled endless wave at every shed level of the quality governor and reports the frame cost,
+after checking that the governor sheds and restores features as the frame time crosses its budget.
+Run with "python -m benchmarks.bench_governor" from the project root.'''
+from benchmarks.headless import HeadlessRunner, core_object
+from benchmarks.bench_setup import time_it
+from core.governor import QualityGovernor
+from game.enemy import BaseZombie
+from utils.particle_effects import ParticleEffect
+
+WAVE : int = 30
+WARM_UP_FRAMES : int = 900
+FRAMES : int = 600
+
+def check_governor():
+    governor = QualityGovernor(10)
+    governor.enable()
+    for _ in range(governor.shed_frames * 3 + 20):
+        governor.add_sample(25)
+    assert governor.get_shed() == list(QualityGovernor.SHED_ORDER[:3]), 'the governor did not shed one feature per shed_frames'
+    assert not governor.hit_flash and governor.sfx, 'the shed flags are wrong'
+    for _ in range(governor.restore_frames + 40):
+        governor.add_sample(1)
+    assert governor.level == 2, 'the governor did not restore a feature'
+    for _ in range(governor.restore_frames * 10):
+        governor.add_sample(8)
+    assert governor.level == 2, 'the governor restored features while frames were close to the budget'
+    governor.disable()
+    assert governor.level == 0 and all(getattr(governor, feature) for feature in QualityGovernor.SHED_ORDER), 'disabling kept features shed'
+
+    core_object.governor.set_level(len(QualityGovernor.SHED_ORDER))
+    assert not core_object.bg_manager.sfx_enabled and not ParticleEffect.emission_enabled, 'the core did not apply the shed level'
+    core_object.governor.set_level(0)
+    assert core_object.bg_manager.sfx_enabled and ParticleEffect.emission_enabled, 'the core did not restore the features'
+
+def run_level(runner : HeadlessRunner, level : int) -> tuple[float, int]:
+    runner.start_wave(WAVE)
+    core_object.governor.set_level(0)
+    for _ in range(WARM_UP_FRAMES):
+        runner.step()
+    core_object.governor.set_level(level)
+    frame_time = time_it(runner.step, FRAMES)
+    return frame_time, len(BaseZombie.active_elements)
+
+def main():
+    check_governor()
+    runner = HeadlessRunner(render=True)
+    core_object.game.endless = True
+    wave = core_object.game.wave_table.get_wave(WAVE)
+    print(f'wave {WAVE}: {wave.get_total()} zombies, {wave.spawn_delay:.3f}s spawn delay, {wave.zombie_per_heat} per heat')
+    print(f'{"level":>5} {"shed":>16} {"zombies":>8} {"frame (ms)":>11} {"vs full":>8}')
+    full_time : float|None = None
+    for level in range(len(QualityGovernor.SHED_ORDER) + 1):
+        frame_time, zombies = run_level(runner, level)
+        if full_time is None: full_time = frame_time
+        shed = QualityGovernor.SHED_ORDER[level - 1] if level else '-'
+        print(f'{level:>5} {shed:>16} {zombies:>8} {frame_time:>11.3f} {full_time / frame_time:>7.2f}x')
+    core_object.governor.set_level(0)
+
+if __name__ == '__main__':
+    main()
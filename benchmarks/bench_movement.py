@@ -0,0 +1,70 @@
+'''Moves zombies and pivoted bullets the way their update methods do, through the old position properties and through Sprite.move.
+old_move reproduces the old properties: hasattr checks, and the pivot position rebuilt on every align.
+Run with "python -m benchmarks.bench_movement" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import random
+import pygame
+
+core_object = boot()
+
+from game.sprite import Sprite
+from game.enemy import NormalZombie
+from game.projectiles import NormalProjectile
+
+FRAMES : int = 60
+COUNT : int = 2000
+
+def old_move(sprite : Sprite, velocity : pygame.Vector2, scale : float):
+    if not hasattr(sprite, 'pivot'): sprite.pivot = None
+    position = sprite._position if sprite.pivot is None else sprite.pivot.origin
+    position += velocity * scale
+    if not hasattr(sprite, 'pivot'): sprite.pivot = None
+    if sprite.pivot is None: sprite._position = position
+    else: sprite.pivot.origin = position
+    if not hasattr(sprite, 'pivot'): sprite.pivot = None
+    sprite.rect.center = round(sprite._position if sprite.pivot is None else sprite.pivot.position)
+    for spatial_hash in sprite._spatial_hashes:
+        spatial_hash.update(sprite, sprite.rect)
+
+def populate() -> list[tuple[Sprite, pygame.Vector2]]:
+    Sprite.kill_all_sprites()
+    random.seed(COUNT)
+    movers = []
+    for index in range(COUNT):
+        position = pygame.Vector2(random.uniform(0, 960), random.uniform(0, 540))
+        velocity = pygame.Vector2(random.uniform(-3, 3), random.uniform(-3, 3))
+        if index % 2:
+            movers.append((NormalZombie.spawn(position, 10), velocity))
+        else:
+            movers.append((NormalProjectile.spawn(position, 1, velocity), velocity))
+    return movers
+
+def run(movers : list[tuple[Sprite, pygame.Vector2]], use_move : bool):
+    if use_move:
+        for sprite, velocity in movers:
+            sprite.move(velocity, 0.5)
+    else:
+        for sprite, velocity in movers:
+            old_move(sprite, velocity, 0.5)
+
+def check(movers : list[tuple[Sprite, pygame.Vector2]]):
+    for sprite, velocity in movers[:50]:
+        start = sprite.position.copy()
+        old_move(sprite, velocity, 0.5)
+        old_rect = sprite.rect.copy()
+        sprite.position = start.copy()
+        sprite.move(velocity, 0.5)
+        assert sprite.rect == old_rect and sprite.position == start + velocity * 0.5, 'Sprite.move moved differently'
+
+def main():
+    movers = populate()
+    check(movers)
+    old_time = time_it(lambda : run(movers, False), FRAMES)
+    new_time = time_it(lambda : run(movers, True), FRAMES)
+    Sprite.kill_all_sprites()
+    print(f'{COUNT} zombies and pivoted bullets moved per frame')
+    print(f'{"old properties (ms)":>20} {"Sprite.move (ms)":>17} {"speedup":>8}')
+    print(f'{old_time:>20.2f} {new_time:>17.2f} {old_time / new_time:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+'''Compares the Particle sprites with the vectorized ParticleBatch, updating and drawing a burst effect.
+Run with "python -m benchmarks.bench_particles" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import random
+import pygame
+
+core_object = boot()
+
+from utils.particle_effects import ParticleEffect, Particle, TEMPLATE, particle_batch
+import utils.particle_effects as particle_effects
+
+FRAMES : int = 30
+SIZES : list[int] = [1000, 10000, 20000]
+
+SPARKS = TEMPLATE | {'offset_x' : [-100, 100], 'offset_y' : [-100, 100], 'velocity_x' : None, 'velocity_y' : None,
+                     'angle' : [0, 360], 'speed' : [0.5, 3], 'accel_y' : [0.02, 0.05], 'drag' : [0, 0.02],
+                     'lifetime' : [1000, 1000], 'destroy_offscreen' : False}
+
+def play(count : int, batched : bool) -> ParticleEffect:
+    effect = ParticleEffect(SPARKS | {'init_spawn_count' : count}, False)
+    effect.batched = batched
+    effect.play(pygame.Vector2(480, 270))
+    return effect
+
+def frame(display : pygame.Surface):
+    ParticleEffect.update_particles(1, display.get_rect())
+    display.fill((94,129,162))
+    ParticleEffect.draw_particles(display)
+
+def check(display : pygame.Surface):
+    '''Both backends must move a particle to the same place.'''
+    data = TEMPLATE | {'velocity_x' : 2, 'velocity_y' : -3, 'accel_y' : 0.1, 'drag' : 0.05, 'lifetime' : 1000, 'destroy_offscreen' : False}
+    particle = Particle()
+    particle.spawn(pygame.Vector2(100, 200), 1000, 'simulated', data['main_texture'], velocity=pygame.Vector2(2, -3),
+                   accel=pygame.Vector2(0, 0.1), drag=0.05, destroy_offscreen=False)
+    particle_batch.emit(particle_batch.acquire_track(), 1, pygame.Vector2(100, 200), data, 0)
+    for _ in range(10):
+        frame(display)
+    assert abs(particle_batch.positions[0][0] - particle.position.x) < 1e-6, 'batched particles move differently'
+    assert abs(particle_batch.positions[0][1] - particle.position.y) < 1e-6, 'batched particles move differently'
+    Particle.clear_elements()
+    particle_batch.clear()
+
+def main():
+    display = core_object.main_display
+    check(display)
+    print(f'{"particles":>10} {"sprites (ms)":>13} {"batch (ms)":>11} {"speedup":>8}')
+    for count in SIZES:
+        while len(Particle.inactive_elements) < count: Particle()
+        random.seed(count)
+        effect = play(count, False)
+        sprite_time = time_it(lambda : frame(display), FRAMES)
+        effect.cancel_all()
+        effect = play(count, True)
+        batch_time = time_it(lambda : frame(display), FRAMES)
+        assert particle_batch.count == count, 'particles were culled'
+        effect.cancel_all()
+        print(f'{count:>10} {sprite_time:>13.2f} {batch_time:>11.2f} {sprite_time / batch_time:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+'''Spawns and kills 10k projectiles through the shared Sprite pools.
+The list-based pool reproduces the old "in" checks and list.remove calls for comparison.
+Run with "python -m benchmarks.bench_pools" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+from collections import deque
+import pygame
+
+core_object = boot()
+
+from game.sprite import Sprite
+from utils.indexed_list import IndexedList
+from game.projectiles import BaseProjectile, NormalProjectile
+
+CYCLES : int = 10000
+POOL_SIZE : int = 600
+LIVE_COUNT : int = 300
+
+class ListPool:
+    '''Old pooling strategy: one active and one inactive list per class level.'''
+    def __init__(self, levels : int = 3, container : type = list) -> None:
+        self.levels : list[tuple[list, list]] = [(container(), container()) for _ in range(levels)]
+
+    def pool(self, element):
+        for active, inactive in self.levels:
+            if element in active: active.remove(element)
+            if element not in inactive: inactive.append(element)
+
+    def unpool(self, element):
+        for active, inactive in self.levels:
+            if element not in active: active.append(element)
+            if element in inactive: inactive.remove(element)
+
+def run_container_pool(container : type):
+    pool = ListPool(container=container)
+    elements = [object() for _ in range(POOL_SIZE)]
+    for element in elements: pool.pool(element)
+    live : deque = deque()
+    inactive = pool.levels[0][1]
+    for _ in range(CYCLES):
+        element = inactive[0]
+        pool.unpool(element)
+        live.append(element)
+        if len(live) > LIVE_COUNT: pool.pool(live.popleft())
+
+def run_sprite_pool():
+    live : deque[BaseProjectile] = deque()
+    direction = pygame.Vector2(1, 0)
+    for _ in range(CYCLES):
+        live.append(NormalProjectile.spawn(pygame.Vector2(480, 270), 7, direction))
+        if len(live) > LIVE_COUNT: live.popleft().kill_instance()
+    while live: live.popleft().kill_instance()
+
+def main():
+    while len(NormalProjectile.inactive_elements) < POOL_SIZE: NormalProjectile()
+    list_time = time_it(lambda : run_container_pool(list))
+    indexed_time = time_it(lambda : run_container_pool(IndexedList))
+    sprite_time = time_it(run_sprite_pool)
+    print(f'{CYCLES} spawn/kill cycles, {POOL_SIZE} pooled, {LIVE_COUNT} alive')
+    print(f'list containers         : {list_time:8.2f} ms')
+    print(f'IndexedList containers  : {indexed_time:8.2f} ms')
+    print(f'NormalProjectile spawns : {sprite_time:8.2f} ms')
+
+if __name__ == '__main__':
+    main()
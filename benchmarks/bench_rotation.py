@@ -0,0 +1,95 @@
+'''Compares rotating sprites with and without the shared rotation cache, for sprites spinning through whole-degree angles,
+which come back to the same angles, and for sprites aiming at arbitrary angles, which almost never do.
+Pivot2D only uses the cache when one is passed to it. Run with "python -m benchmarks.bench_rotation" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import random
+import pygame
+
+core_object = boot()
+
+from game.sprite import Sprite
+from game.enemy import NormalZombie, TankZombie
+from utils.indexed_list import IndexedList
+from utils.pivot_2d import Pivot2D
+from utils.rotation_cache import rotation_cache
+
+FRAMES : int = 60
+SIZES : list[int] = [20, 100, 300]
+
+class SpinningZombie(Sprite):
+    '''A pivoted sprite showing a zombie surface. Zombies draw from the render atlas without a pivot, so they cannot rotate themselves.'''
+    inactive_elements : IndexedList['SpinningZombie'] = IndexedList()
+    active_elements : IndexedList['SpinningZombie'] = IndexedList()
+
+    @classmethod
+    def spawn(cls, new_pos : pygame.Vector2, image : pygame.Surface):
+        element = cls.get_inactive()
+        element.image = image
+        element.rect = element.image.get_rect()
+        element.position = new_pos
+        element.zindex = 10
+        element.pivot = Pivot2D(element._position, element.image, (0, 0, 255), rotation_cache)
+        cls.unpool(element)
+        return element
+
+    def clean_instance(self):
+        self.image = None
+        self.rect = None
+        self.pivot = None
+        self._position = pygame.Vector2(0,0)
+        self.zindex = None
+
+def populate(zombie_count : int) -> list[SpinningZombie]:
+    Sprite.kill_all_sprites()
+    zombies = []
+    for index in range(zombie_count):
+        image = NormalZombie.test_image if index % 2 else TankZombie.test_image
+        zombies.append(SpinningZombie.spawn(pygame.Vector2(random.uniform(0, 960), random.uniform(0, 540)), image))
+    return zombies
+
+def spin(zombies : list[SpinningZombie]):
+    '''Every zombie plays a death spin, each at its own point of the spin.'''
+    for index, zombie in enumerate(zombies):
+        zombie.angle = (zombie.angle + 6 + index % 7) % 360
+
+def aim(zombies : list[SpinningZombie]):
+    '''Every zombie turns towards a point of its own, like the player following the mouse.'''
+    for zombie in zombies:
+        zombie.angle = random.uniform(0, 360)
+
+def set_cache(zombies : list[SpinningZombie], enabled : bool):
+    for zombie in zombies:
+        zombie.pivot.cache = rotation_cache if enabled else None
+
+def check(zombies : list[SpinningZombie]):
+    for zombie in zombies[:10]:
+        for angle in (0, 37, 90, 181, 359):
+            zombie.pivot.cache = rotation_cache
+            zombie.angle = angle
+            cached_image, cached_rect = zombie.image, zombie.rect.copy()
+            zombie.pivot.cache = None
+            zombie.angle = angle
+            assert cached_rect == zombie.rect, 'cached rotation moved the sprite'
+            assert pygame.image.tobytes(cached_image, 'RGBA') == pygame.image.tobytes(zombie.image, 'RGBA'), 'cached rotation differs'
+
+def main():
+    print(f'{"workload":>9} {"zombies":>8} {"uncached (ms)":>14} {"cached (ms)":>12} {"speedup":>8} {"hit rate":>9} {"cache (KB)":>11}')
+    for name, workload in (('spin', spin), ('aim', aim)):
+        for zombie_count in SIZES:
+            random.seed(zombie_count)
+            zombies = populate(zombie_count)
+            check(zombies)
+            rotation_cache.clear()
+            rotation_cache.hits = rotation_cache.misses = 0
+            set_cache(zombies, False)
+            uncached_time = time_it(lambda : workload(zombies), FRAMES)
+            set_cache(zombies, True)
+            cached_time = time_it(lambda : workload(zombies), FRAMES)
+            hit_rate = rotation_cache.hits / max(1, rotation_cache.hits + rotation_cache.misses)
+            print(f'{name:>9} {zombie_count:>8} {uncached_time:>14.2f} {cached_time:>12.2f} {uncached_time / cached_time:>7.1f}x '
+                  f'{hit_rate:>8.0%} {rotation_cache.memory_used // 1024:>11}')
+    Sprite.kill_all_sprites()
+    rotation_cache.clear()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+'''Times TaskScheduler.update with many tasks pending in the future, against the old scheduler that polled a Timer per task.
+Run with "python -m benchmarks.bench_scheduler" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+from utils.my_timer import Timer
+from utils.helpers import Task
+
+core_object = boot()
+
+from core.task_scheduler import TaskScheduler
+
+UPDATES : int = 200
+SIZES : list[int] = [10, 1000, 10000]
+
+class PollingScheduler:
+    '''Old strategy: every update asks the Timer of every task whether it is over.'''
+    def __init__(self) -> None:
+        self.scheduled_tasks : dict[Task, Timer] = {}
+
+    def schedule_task(self, time, callback, *args, **kwargs):
+        new_task = Task(callback, *args, **kwargs)
+        self.scheduled_tasks[new_task] = Timer(time[0], time[1], time[2])
+        return new_task
+
+    def update(self):
+        to_remove = []
+        for task in self.scheduled_tasks:
+            if self.scheduled_tasks[task].isover():
+                task.execute()
+                to_remove.append(task)
+        for task in to_remove:
+            self.scheduled_tasks.pop(task)
+
+def main():
+    game_timer = Timer(-1, core_object.global_timer.get_time)
+    print(f'{"pending":>8} {"polling (ms)":>13} {"heap (ms)":>10} {"speedup":>8}')
+    for count in SIZES:
+        times = []
+        for scheduler_class in (PollingScheduler, TaskScheduler):
+            scheduler = scheduler_class()
+            for index in range(count):
+                scheduler.schedule_task((1000 + index, game_timer.get_time, 1), print, 'never')
+            times.append(time_it(scheduler.update, UPDATES))
+        polling_time, heap_time = times
+        print(f'{count:>8} {polling_time:>13.4f} {heap_time:>10.4f} {polling_time / heap_time:>7.0f}x')
+
+if __name__ == '__main__':
+    main()
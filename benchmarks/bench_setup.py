@@ -0,0 +1,33 @@
+import os
+import sys
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from time import perf_counter
+from typing import Callable
+
+def boot(window_size : tuple[int, int] = (960, 540)):
+    '''Initializes pygame and the core object without a window. Returns the core object.'''
+    pygame.init()
+    window = pygame.display.set_mode(window_size)
+    from core.core import core_object
+    core_object.init(window)
+
+    from game.sprite import Sprite
+    Sprite._core_hint()
+    from utils.animation import _sprite_hint
+    _sprite_hint()
+    from utils.my_timer import Timer
+    core_object.game.game_timer = Timer(-1)
+    core_object.game.init()
+    return core_object
+
+def time_it(func : Callable, repeats : int = 1) -> float:
+    '''Returns the average time taken by func in milliseconds.'''
+    start = perf_counter()
+    for _ in range(repeats):
+        func()
+    return (perf_counter() - start) * 1000 / repeats
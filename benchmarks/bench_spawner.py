@@ -0,0 +1,106 @@
+'''Compares playing out the spawns of a wave frame by frame the old way, a weighted random.choices over rebuilt key and value lists
+and a match on the zombie type per spawn, with compiling the wave into a SpawnSchedule and walking its cursor.
+The schedule timings include compiling it. Run with "python -m benchmarks.bench_spawner" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+from random import choices
+import random
+import pygame
+
+core_object = boot()
+
+from game.waves import WaveInfo, SpawnSchedule
+from game.enemy import ZombieTypes, NormalZombie, QuickZombie, TankZombie, RangedZombie
+
+WAVES : list[int] = [1, 10, 15, 30, 45]
+REPEATS : int = 20
+BOUNDS : tuple[int, int] = (960, 540)
+FRAME : float = 1 / 60
+
+def old_spawn(ztype : str, spawned : list, area : int):
+    buffer : int = 60
+    if random.randint(0,1):
+        spawn_pos = pygame.Vector2((-buffer, 960 + buffer)[random.randint(0,1)], random.randint(-buffer, 540 + buffer))
+    else:
+        spawn_pos = pygame.Vector2(random.randint(-buffer, 960 + buffer), (-buffer, 540 + buffer)[random.randint(0,1)])
+    match ztype:
+        case ZombieTypes.normal:
+            spawned.append((NormalZombie, spawn_pos, {'health' : 9, 'speed' : 3.5}))
+        case ZombieTypes.quick:
+            spawned.append((QuickZombie, spawn_pos, {'health' : 6, 'speed' : 5}))
+        case ZombieTypes.tank:
+            spawned.append((TankZombie, spawn_pos, {'health' : 20, 'speed' : 3, 'damage' : 2}))
+        case ZombieTypes.ranged:
+            spawned.append((RangedZombie, spawn_pos, {'health' : 8, 'speed' : 1 + (area * 0.6)}))
+
+def run_old(wave : WaveInfo, area : int) -> list:
+    '''The old active_logic one frame at a time, with the enemy timer restarted on every spawn tick.'''
+    wave = wave.copy()
+    spawned : list = []
+    elapsed : float = 0
+    tick_start : float = 0
+    while wave.is_zombie_remaining():
+        elapsed += FRAME
+        if elapsed - tick_start < wave.spawn_delay: continue
+        tick_start = elapsed
+        for _ in range(wave.zombie_per_heat):
+            if not wave.is_zombie_remaining(): break
+            zombies_left = wave.zombie_count
+            zombie_type = choices(list(zombies_left.keys()), list(zombies_left.values()))[0]
+            if zombies_left[zombie_type] > 0: zombies_left[zombie_type] -= 1
+            old_spawn(zombie_type, spawned, area)
+    return spawned
+
+def run_new(wave : WaveInfo, area : int, seed : int) -> list:
+    '''Compiles the wave and advances the cursor one frame at a time, like Game.active_logic.'''
+    table = core_object.game.wave_table
+    spawners = {ztype : (ZombieTypes.convert(ztype), table.get_spawn_kwargs(ztype, area)) for ztype in wave.zombie_count}
+    schedule = SpawnSchedule(wave, seed, BOUNDS)
+    spawned : list = []
+    elapsed : float = 0
+    end_time : float = schedule.times[-1] if schedule.times else 0
+    advance = schedule.advance
+    types = schedule.types
+    positions = schedule.positions
+    while elapsed <= end_time:
+        elapsed += FRAME
+        for index in advance(elapsed):
+            zombie_class, kwargs = spawners[types[index]]
+            spawned.append((zombie_class, pygame.Vector2(positions[index]), kwargs))
+    return spawned
+
+def summarize(spawned : list) -> dict:
+    summary : dict = {}
+    for zombie_class, _, kwargs in spawned:
+        summary[zombie_class] = (summary.get(zombie_class, (0, None))[0] + 1, kwargs)
+    return summary
+
+def on_edge(position : pygame.Vector2) -> bool:
+    return position.x in (-60, BOUNDS[0] + 60) or position.y in (-60, BOUNDS[1] + 60)
+
+def check(wave_num : int):
+    wave = core_object.game.wave_table.get_wave(wave_num)
+    old = run_old(wave, 1)
+    new = run_new(wave, 1, wave_num)
+    assert len(new) == wave.get_total(), 'the schedule spawned a different number of zombies'
+    assert summarize(old) == summarize(new), 'the schedule spawned different zombies'
+    assert all(on_edge(position) for _, position, _ in new), 'a zombie spawned off the edge'
+    assert [entry[1] for entry in new] == [entry[1] for entry in run_new(wave, 1, wave_num)], 'the same seed compiled a different schedule'
+    schedule = SpawnSchedule(wave, wave_num, BOUNDS)
+    assert schedule.times == sorted(schedule.times) and schedule.times[-1] <= schedule.get_remaining() * wave.spawn_delay, 'spawns are out of order'
+
+def main():
+    table = core_object.game.wave_table
+    for wave_num in WAVES:
+        check(wave_num)
+    assert table.get_wave(16).get_total() > table.get_wave(15).get_total(), 'waves past the table do not scale'
+    print(f'{"wave":>5} {"zombies":>8} {"delay (s)":>10} {"old (ms)":>9} {"schedule (ms)":>14} {"speedup":>8} {"spawns/ms":>10}')
+    for wave_num in WAVES:
+        wave = table.get_wave(wave_num)
+        old_time = time_it(lambda : run_old(wave, 1), REPEATS)
+        seeds = iter(range(10 ** 9))
+        new_time = time_it(lambda : run_new(wave, 1, next(seeds)), REPEATS)
+        total = wave.get_total()
+        print(f'{wave_num:>5} {total:>8} {wave.spawn_delay:>10.3f} {old_time:>9.3f} {new_time:>14.3f} {old_time / new_time:>7.1f}x {total / new_time:>10.0f}')
+
+if __name__ == '__main__':
+    main()
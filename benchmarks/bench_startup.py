@@ -0,0 +1,66 @@
+'''Compares building the sprite pools eagerly at startup with growing them on demand,
+and checks that spawning past the old 99 bullet pool no longer runs out of elements.
+Run with "python -m benchmarks.bench_startup" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import pygame
+
+core_object = boot()
+
+from game.sprite import Sprite
+from game.projectiles import BaseProjectile, NormalProjectile, PeirceProjectile
+from game.enemy import NormalZombie, QuickZombie, TankZombie, RangedZombie
+
+EAGER_POOLS : dict[type[Sprite], int] = {NormalProjectile : 99, PeirceProjectile : 99,
+                                         NormalZombie : 90, QuickZombie : 90, TankZombie : 90, RangedZombie : 90}
+HEAVY_FIRE : int = 500
+
+def reset_pools():
+    Sprite.kill_all_sprites()
+    for sprite_class in EAGER_POOLS:
+        for element in list(sprite_class.inactive_elements):
+            for pool_class in element._pool_classes:
+                pool_class.inactive_elements.discard(element)
+
+def build_eager():
+    reset_pools()
+    for sprite_class, count in EAGER_POOLS.items():
+        for _ in range(count):
+            sprite_class()
+
+def build_lazy():
+    reset_pools()
+    #The first spawn of each class only builds one chunk
+    for sprite_class in EAGER_POOLS:
+        sprite_class.grow_pool(sprite_class.POOL_CHUNK)
+
+def check_heavy_fire():
+    reset_pools()
+    direction = pygame.Vector2(1, 0)
+    bullets = [NormalProjectile.spawn(pygame.Vector2(480, 270), 7, direction) for _ in range(HEAVY_FIRE)]
+    assert len(set(bullets)) == HEAVY_FIRE, 'a pooled bullet was handed out twice'
+    assert len(NormalProjectile.active_elements) == HEAVY_FIRE
+    assert NormalProjectile.get_pool_size() < HEAVY_FIRE + NormalProjectile.POOL_CHUNK
+    Sprite.kill_all_sprites()
+
+def check_warm_up():
+    reset_pools()
+    Sprite.pool_targets.update(EAGER_POOLS)
+    frames = 1
+    while not Sprite.warm_up_pools(0.002): frames += 1
+    for sprite_class, count in EAGER_POOLS.items():
+        assert sprite_class.get_pool_size() >= count, 'warm up stopped short of its target'
+    Sprite.pool_targets.clear()
+    return frames
+
+def main():
+    check_heavy_fire()
+    warm_up_frames = check_warm_up()
+    eager_time = time_it(build_eager, 5)
+    lazy_time = time_it(build_lazy, 5)
+    reset_pools()
+    print(f'{"eager pools (ms)":>17} {"first chunks (ms)":>18} {"speedup":>8} {"warm up frames":>15}')
+    print(f'{eager_time:>17.2f} {lazy_time:>18.2f} {eager_time / lazy_time:>7.1f}x {warm_up_frames:>15}')
+    print(f'{HEAVY_FIRE} bullets alive at once without running out of pooled elements')
+
+if __name__ == '__main__':
+    main()
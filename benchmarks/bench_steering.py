@@ -0,0 +1,82 @@
+'''Compares per-instance zombie movement with the batched NumPy steering.
+Run with "python -m benchmarks.bench_steering" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import random
+import pygame
+
+core_object = boot()
+
+from game.sprite import Sprite
+from game.enemy import BaseZombie, NormalZombie
+from game.steering import SteeringBatch
+
+FRAMES : int = 30
+SIZES : list[int] = [100, 500, 1000, 2000]
+TARGET : pygame.Vector2 = pygame.Vector2(480, 270)
+
+def populate(zombie_count : int):
+    Sprite.kill_all_sprites()
+    while len(NormalZombie.inactive_elements) < zombie_count: NormalZombie()
+    for _ in range(zombie_count):
+        NormalZombie.spawn(pygame.Vector2(random.uniform(-200, 1160), random.uniform(-200, 740)), 10, random.uniform(1, 3))
+
+def per_instance():
+    for zombie in BaseZombie.active_elements:
+        player_direction = (TARGET - zombie.position).normalize()
+        zombie.position += player_direction * zombie.speed
+
+def batched():
+    BaseZombie.steering.step(TARGET, 1)
+
+def slow_down():
+    '''Halves the speed of every other zombie in the middle of the check, like a slow would.'''
+    for zombie in BaseZombie.active_elements[::2]:
+        zombie.speed /= 2
+
+def snapshot() -> list[tuple[float, float]]:
+    return [tuple(zombie.position) for zombie in BaseZombie.active_elements]
+
+def rect_snapshot() -> list[pygame.Rect]:
+    return [zombie.rect.copy() for zombie in BaseZombie.active_elements]
+
+def check(zombie_count : int):
+    random.seed(zombie_count)
+    populate(zombie_count)
+    BaseZombie.steering = None
+    for frame in range(FRAMES):
+        if frame == FRAMES // 2: slow_down()
+        per_instance()
+    expected = snapshot()
+    expected_rects = rect_snapshot()
+    random.seed(zombie_count)
+    BaseZombie.enable_batched_steering()
+    populate(zombie_count)
+    for frame in range(FRAMES):
+        if frame == FRAMES // 2: slow_down()
+        batched()
+    for (x1, y1), (x2, y2) in zip(expected, snapshot()):
+        assert abs(x1 - x2) < 1e-6 and abs(y1 - y2) < 1e-6, 'batched steering differs from per-instance movement'
+    assert expected_rects == rect_snapshot(), 'batched steering left rects out of place'
+    spatial_hash = BaseZombie.spatial_hash
+    for zombie in BaseZombie.active_elements:
+        assert spatial_hash.spans[zombie] == spatial_hash.get_span(zombie.rect), 'batched steering left a zombie in the wrong cells'
+
+def main():
+    if not SteeringBatch.is_available():
+        print('numpy is not installed')
+        return
+    print(f'{"zombies":>8} {"per-instance (ms)":>18} {"batched (ms)":>13} {"speedup":>8}')
+    for zombie_count in SIZES:
+        check(zombie_count)
+        BaseZombie.steering = None
+        random.seed(zombie_count)
+        populate(zombie_count)
+        instance_time = time_it(per_instance, FRAMES)
+        BaseZombie.enable_batched_steering()
+        batched_time = time_it(batched, FRAMES)
+        print(f'{zombie_count:>8} {instance_time:>18.2f} {batched_time:>13.2f} {instance_time / batched_time:>7.1f}x')
+    Sprite.kill_all_sprites()
+    BaseZombie.steering = None
+
+if __name__ == '__main__':
+    main()
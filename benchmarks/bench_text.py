@@ -0,0 +1,46 @@
+'''Changes the text of stroked and plain TextSprites like the score, fps and cluster labels do,
+rendering through font.render and through the glyph atlases and line cache.
+Run with "python -m benchmarks.bench_text" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+import pygame
+
+core_object = boot()
+
+from utils.ui.textsprite import TextSprite
+from utils.ui import glyph_atlas
+from utils.ui.glyph_atlas import text_renderer
+
+CHANGES : int = 2000
+
+def make_sprites() -> list[tuple[TextSprite, list[str]]]:
+    font_40 = pygame.font.Font('assets/fonts/Pixeltype.ttf', 40)
+    font_50 = pygame.font.Font('assets/fonts/Pixeltype.ttf', 50)
+    score = TextSprite(pygame.Vector2(5, 535), 'bottomleft', 0, 'Score : 0', text_settings=(font_50, 'White', False),
+                       text_stroke_settings=('Black', 2), colorkey=(255, 0, 0))
+    fps = TextSprite(pygame.Vector2(15, 10), 'topleft', 0, 'FPS : 0', text_settings=(font_40, 'White', False),
+                     text_stroke_settings=('Black', 2), colorkey=(255, 0, 0))
+    cluster = TextSprite(pygame.Vector2(480, 270), 'midbottom', 0, 'X3', text_settings=(font_50, 'White', False),
+                         text_stroke_settings=('Black', 2), colorkey=(0, 255, 0))
+    wave = TextSprite(pygame.Vector2(480, 90), 'midtop', 0, 'Wave 1', text_settings=(font_50, 'Black', False), colorkey=(0, 255, 0))
+    return [(score, [f'Score : {value}' for value in range(0, 4000, 2)]), (fps, [f'FPS : {value}' for value in range(55, 125)]),
+            (cluster, [f'X{value}' for value in range(3, 15)]), (wave, [f'Wave {value}' for value in range(1, 21)])]
+
+def run(sprites : list[tuple[TextSprite, list[str]]]):
+    for index in range(CHANGES):
+        for sprite, texts in sprites:
+            sprite.text = texts[index % len(texts)]
+
+def main():
+    sprites = make_sprites()
+    render = text_renderer.render
+    text_renderer.render = lambda *args, **kwargs : None
+    font_time = time_it(lambda : run(sprites), 1)
+    text_renderer.render = render
+    atlas_time = time_it(lambda : run(sprites), 1)
+    hit_rate = text_renderer.hits / max(1, text_renderer.hits + text_renderer.misses)
+    print(f'{CHANGES} text changes on 4 sprites')
+    print(f'{"font.render (ms)":>17} {"atlas (ms)":>11} {"speedup":>8} {"line hits":>10}')
+    print(f'{font_time:>17.1f} {atlas_time:>11.1f} {font_time / atlas_time:>7.1f}x {hit_rate:>9.0%}')
+
+if __name__ == '__main__':
+    main()
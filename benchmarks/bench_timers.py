@@ -0,0 +1,42 @@
+'''Checks isover on timers running on the game timer, with the clocks read through the chain of timers and with frame snapshots.
+Run with "python -m benchmarks.bench_timers" from the project root.'''
+from benchmarks.bench_setup import boot, time_it
+from utils.my_timer import Timer
+
+core_object = boot()
+
+FRAMES : int = 200
+SIZES : list[int] = [100, 1000, 5000]
+
+def check_all(timers : list[Timer]):
+    for timer in timers:
+        timer.isover()
+
+def snapshot_frame(timers : list[Timer]):
+    core_object.snapshot_clocks()
+    check_all(timers)
+
+def release_clocks():
+    core_object.global_timer.release_snapshot()
+    core_object.game.game_timer.release_snapshot()
+
+def main():
+    game_timer = core_object.game.game_timer
+    precise = Timer(5, game_timer.get_time, precise=True)
+    snapshot = Timer(5, game_timer.get_time)
+    core_object.snapshot_clocks()
+    first_reads = (snapshot.get_time(), precise.get_time())
+    time_it(lambda : None, 10000)
+    assert snapshot.get_time() == first_reads[0], 'timers should read the frame snapshot'
+    assert precise.get_time() > first_reads[1], 'precise timers should read the real time'
+    release_clocks()
+    print(f'{"timers":>7} {"chained (ms)":>13} {"snapshot (ms)":>14} {"speedup":>8}')
+    for count in SIZES:
+        timers = [Timer(1000 + index, game_timer.get_time) for index in range(count)]
+        chained_time = time_it(lambda : check_all(timers), FRAMES)
+        snapshot_time = time_it(lambda : snapshot_frame(timers), FRAMES)
+        release_clocks()
+        print(f'{count:>7} {chained_time:>13.3f} {snapshot_time:>14.3f} {chained_time / snapshot_time:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+'''Updates 1000 concurrent tweens, with the accessors and lerps picked at play time and with the old per-update dispatch.
+Run with "python -m benchmarks.bench_tweens" from the project root.'''
+from benchmarks.bench_setup import time_it
+import pygame
+import utils.interpolation as interpolation
+import utils.tween_module as TweenModule
+from utils.tween_module import TweenTrack, TweenInfo
+
+TWEENS : int = 1000
+UPDATES : int = 100
+
+class Target:
+    def __init__(self, index : int) -> None:
+        self.rect = pygame.Rect(index % 960, index % 540, 20, 20)
+        self.position = pygame.Vector2(index, 0)
+        self.color = pygame.Color(0, 0, 0)
+        self.center = (0, 0)
+
+class LegacyTweenTrack(TweenTrack):
+    '''Splits the attribute paths and goes through compatibilty_lerp on every update, like tweens used to.'''
+    def update(self):
+        if not self.timer: return
+        if not self.is_playing: return
+        alpha = self.timer.get_time() / self.timer.duration
+        if alpha > 1:
+            alpha = 1
+            self.has_finished = True
+            self.is_playing = False
+        for attr in self.goal:
+            result = interpolation.compatibilty_lerp(self.start[attr], self.goal[attr], self.info.easying_style(alpha))
+            self.set_chained_attribute(self.target, attr, result)
+
+def make_tracks(track_class : type[TweenTrack], clock : list[float]) -> list[TweenTrack]:
+    tracks = []
+    for index in range(TWEENS):
+        goal = {'rect.centery' : 300, 'position' : pygame.Vector2(500, 200), 'color' : pygame.Color(255, 128, 0), 'center' : (100, 50)}
+        track = track_class(Target(index), TweenInfo(interpolation.quad_ease_out, 10), goal, time_source=lambda : clock[0])
+        track.play()
+        tracks.append(track)
+    return tracks
+
+def run(tracks : list[TweenTrack], clock : list[float]):
+    clock[0] += 0.05
+    for track in tracks:
+        track.update()
+
+def main():
+    results = []
+    for track_class in (LegacyTweenTrack, TweenTrack):
+        clock = [0.0]
+        tracks = make_tracks(track_class, clock)
+        results.append((time_it(lambda : run(tracks, clock), UPDATES), tracks))
+    (legacy_time, legacy_tracks), (compiled_time, compiled_tracks) = results
+    for legacy, compiled in zip(legacy_tracks, compiled_tracks):
+        for attr in ('rect', 'position', 'color', 'center'):
+            assert getattr(legacy.target, attr) == getattr(compiled.target, attr), f'compiled tweens set {attr} differently'
+    print(f'{TWEENS} tweens, 4 properties each')
+    print(f'{"legacy (ms)":>12} {"compiled (ms)":>14} {"speedup":>8}')
+    print(f'{legacy_time:>12.2f} {compiled_time:>14.2f} {legacy_time / compiled_time:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+'''Runs the game without a window at a fixed time step, as fast as the CPU allows.
+Every wave starts from a fresh game with the same seed, so two runs of the same build with the same options simulate the same frames.
+Run with "python -m benchmarks.headless --waves 1-15" from the project root.'''
+import benchmarks.bench_setup
+import argparse
+import json
+import random
+from dataclasses import dataclass, asdict
+from time import perf_counter
+import pygame
+
+pygame.init()
+window = pygame.display.set_mode((960, 540))
+pygame.mixer.set_num_channels(48)
+
+from core.core import core_object
+core_object.init(window)
+
+from game.sprite import Sprite
+from game.test_player import TestPlayer
+from game.player import Player, PlayerController
+from game.projectiles import BaseProjectile
+from game.enemy import BaseZombie
+from game.background import Background
+from utils.animation import _sprite_hint
+from utils.mask_cache import mask_cache
+from utils.particle_effects import ParticleEffect
+
+@dataclass
+class WaveResult:
+    wave : int
+    frames : int
+    sim_time : float
+    wall_time : float
+    peak_zombies : int
+    peak_bullets : int
+    score : int
+    cleared : bool
+    masks_built : int
+    shed_level : int
+
+    @property
+    def sim_fps(self) -> float:
+        return self.frames / self.wall_time if self.wall_time > 0 else 0
+
+class HeadlessRunner:
+    '''Boots the game the way main.py does, minus the window, the menu and the saved settings.
+    The global timer reads a simulated clock that advances by exactly one step per frame.'''
+    def __init__(self, seed : int = 1, fps : int = 60, render : bool = False, invincible : bool = True, weapon : str = 'Pistol',
+                 endless : bool = False) -> None:
+        self.seed : int = seed
+        self.fps : int = fps
+        self.render : bool = render
+        self.invincible : bool = invincible
+        self.weapon : str = weapon
+        self.endless : bool = endless
+        self.sim_time : float = 0
+        self.core = core_object
+        self.window : pygame.Surface = window
+        self.boot()
+
+    def get_sim_time(self) -> float:
+        return self.sim_time
+
+    def boot(self):
+        core = self.core
+        core.global_timer.time_source = self.get_sim_time
+        core.global_timer.restart()
+        Sprite._core_hint()
+        _sprite_hint()
+
+        TestPlayer()
+        Player()
+        Background()
+
+        core.settings.set_defualt({'Brightness' : 0})
+        core.settings.load_default()
+        core.storage.weapon_equipped = self.weapon
+        core.game.init()
+        Player.controller = KitingController()
+
+    def start_wave(self, wave : int):
+        '''Starts a fresh game and skips straight to the given wave.'''
+        random.seed(self.seed * 1000 + wave)
+        game = self.core.game
+        if game.active:
+            game.end_game()
+            self.core.main_ui.clear_all()
+        game.endless = self.endless
+        game.start_game()
+        game.start_wave(wave)
+
+    def step(self):
+        '''Simulates one frame the way the main loop does.'''
+        core = self.core
+        profiler = core.profiler
+        self.sim_time += 1 / self.fps
+        core.dt = 60 / self.fps
+        core.snapshot_clocks()
+        profiler.begin_frame()
+        core.governor.begin_frame()
+        for event in pygame.event.get():
+            core.event_manager.process_event(event)
+        profiler.mark('events')
+        if core.game.state != core.game.STATES.paused:
+            Sprite.update_all_sprites(core.dt)
+            profiler.mark('sprites')
+            Sprite.update_all_registered_classes(core.dt)
+            profiler.mark('classes')
+            ParticleEffect.update_particles(core.dt, self.window.get_rect())
+            profiler.mark('particles')
+            if self.invincible: core.game.player.hp = core.game.player.max_hp
+            core.game.main_logic(core.dt)
+            profiler.mark('logic')
+        if self.render and core.DIRTY_RENDERING and not ParticleEffect.has_particles():
+            core.main_ui.update()
+            core.renderer.render(self.window, Sprite.get_draw_order(), core.main_ui.get_draw_order())
+            profiler.mark('draw')
+        elif self.render:
+            core.renderer.request_full_redraw()
+            self.window.fill((94,129,162))
+            Sprite.draw_all_sprites(self.window)
+            ParticleEffect.draw_particles(self.window)
+            profiler.mark('draw')
+            core.main_ui.update()
+            core.main_ui.render(self.window)
+            profiler.mark('ui')
+        core.update()
+        profiler.mark('core')
+        profiler.end_frame()
+        core.governor.end_frame()
+
+    def run_wave(self, wave : int, max_frames : int = 60 * 60 * 5) -> WaveResult:
+        '''Plays a wave until every zombie of it has spawned and died, the game leaves the wave or max_frames is reached.'''
+        self.start_wave(wave)
+        game = self.core.game
+        frames : int = 0
+        peak_zombies : int = 0
+        peak_bullets : int = 0
+        peak_shed : int = 0
+        sim_start : float = self.sim_time
+        mask_misses : int = mask_cache.misses
+        start = perf_counter()
+        while frames < max_frames:
+            self.step()
+            frames += 1
+            peak_zombies = max(peak_zombies, len(BaseZombie.active_elements))
+            peak_bullets = max(peak_bullets, len(BaseProjectile.active_elements))
+            peak_shed = max(peak_shed, self.core.governor.level)
+            if game.current_wave_num != wave or game.current_wave is None: break
+            if not game.is_zombie_remaining() and not BaseZombie.active_elements: break
+        wall_time = perf_counter() - start
+        return WaveResult(wave, frames, self.sim_time - sim_start, wall_time, peak_zombies, peak_bullets, game.score, frames < max_frames,
+                          mask_cache.misses - mask_misses, peak_shed)
+
+class KitingController(PlayerController):
+    '''Backs away from nearby zombies while drifting back towards the middle of the screen, and always fires at the nearest one.'''
+    danger_radius : float = 200
+
+    def get_move_direction(self, player : Player) -> pygame.Vector2:
+        position = player.position
+        direction = (pygame.Vector2(480, 270) - position) * 0.002
+        for zombie in BaseZombie.active_elements:
+            offset = position - zombie.position
+            distance_squared = offset.magnitude_squared()
+            if distance_squared == 0 or distance_squared > self.danger_radius ** 2: continue
+            direction += offset / distance_squared * 50
+        return direction
+
+def parse_waves(text : str) -> list[int]:
+    '''Accepts "5", "1-15" or "1,3,7".'''
+    waves : list[int] = []
+    for part in text.split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            waves.extend(range(int(first), int(last) + 1))
+        else:
+            waves.append(int(part))
+    return waves
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulates waves headlessly and reports simulated frames per second.')
+    parser.add_argument('--waves', default='1-15', help='waves to run, like "1-15" or "3,7"')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--fps', type=int, default=60, help='simulated frames per second of game time')
+    parser.add_argument('--max-frames', type=int, default=60 * 60 * 5, help='frame cap per wave')
+    parser.add_argument('--render', action='store_true', help='also draw every frame to the hidden display')
+    parser.add_argument('--dirty', action='store_true', help='draw with the dirty rect renderer, implies --render')
+    parser.add_argument('--mortal', action='store_true', help='let the player die instead of refilling their health')
+    parser.add_argument('--weapon', default='Pistol', choices=['Pistol', 'Rifle', 'Shotgun', 'Piercer'])
+    parser.add_argument('--steering', action='store_true', help='enable batched zombie steering')
+    parser.add_argument('--endless', action='store_true',
+                        help='play in endless mode: the final wave moves on to the next wave instead of ending in a victory')
+    parser.add_argument('--governor', type=float, default=None, metavar='BUDGET_MS',
+                        help='turn on performance mode with this frame budget, the shed column is the most features shed during the wave')
+    parser.add_argument('--json', default=None, help='also write the results to this file')
+    parser.add_argument('--profile', default=None, help='time each frame phase and write the trace to this .csv or .json file')
+    args = parser.parse_args()
+
+    core_object.DIRTY_RENDERING = args.dirty
+    runner = HeadlessRunner(args.seed, args.fps, args.render or args.dirty, not args.mortal, args.weapon, args.endless)
+    if args.profile: core_object.profiler.enable()
+    if args.governor is not None: core_object.set_performance_mode(True, args.governor)
+    core_object.BATCHED_STEERING = args.steering
+    if core_object.BATCHED_STEERING and not BaseZombie.enable_batched_steering(): print('numpy is not installed, steering stays per-instance')
+    results : list[WaveResult] = []
+    print(f'{"wave":>5} {"frames":>7} {"sim (s)":>8} {"wall (s)":>9} {"sim fps":>8} {"zombies":>8} {"bullets":>8} {"score":>6} {"masks":>6} {"shed":>5}')
+    for wave in parse_waves(args.waves):
+        result = runner.run_wave(wave, args.max_frames)
+        results.append(result)
+        cleared = '' if result.cleared else ' (frame cap)'
+        print(f'{result.wave:>5} {result.frames:>7} {result.sim_time:>8.1f} {result.wall_time:>9.2f} {result.sim_fps:>8.0f} '
+              f'{result.peak_zombies:>8} {result.peak_bullets:>8} {result.score:>6} {result.masks_built:>6} {result.shed_level:>5}{cleared}')
+    total_frames = sum(result.frames for result in results)
+    total_time = sum(result.wall_time for result in results)
+    print(f'total {total_frames} frames in {total_time:.2f}s, {total_frames / total_time:.0f} sim fps')
+    if args.profile:
+        profiler = core_object.profiler
+        print(f'{"phase (ms)":>10} {"p50":>7} {"p95":>7} {"p99":>7}')
+        for phase in profiler.samples:
+            p50, p95, p99 = profiler.get_percentiles(phase)
+            print(f'{phase:>10} {p50:>7.3f} {p95:>7.3f} {p99:>7.3f}')
+        profiler.dump(args.profile)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump([asdict(result) | {'sim_fps' : result.sim_fps} for result in results], file, indent=4)
+
+if __name__ == '__main__':
+    main()
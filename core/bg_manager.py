@@ -10,6 +10,8 @@ class BgManager:
         self.current : dict[pygame.mixer.Channel, TrackInfo] = {}
         self.global_volume = 1
         self.sound_types = SoundTypes
+        #Turned off by the quality governor, play_sfx then skips sounds of the SFX type
+        self.sfx_enabled : bool = True
 
     def set_global_volume(self, new_volume):
         self.global_volume = new_volume
@@ -22,13 +24,16 @@ class BgManager:
     def play(self, track : pygame.mixer.Sound, volume, loops = -1, maxtime = 0, fade_ms = 0, sound_type : str|None = 'Music'):
         '''Used for playing music.'''
         channel = track.play(loops, maxtime, fade_ms)
+        if channel is None: return None
         channel.set_volume(volume * self.global_volume)
         self.current[channel] = TrackInfo(volume, sound_type)
         return channel
     
     def play_sfx(self, sfx : pygame.mixer.Sound, volume, loops = 0, maxtime = 0, fade_ms = 0, sound_type : str|None = 'SFX'):
         '''Used for playing short sound effects.'''
+        if not self.sfx_enabled and sound_type == SoundTypes.sfx: return None
         channel = sfx.play(loops, maxtime, fade_ms)
+        if channel is None: return None
         channel.set_volume(volume * self.global_volume)
         self.current[channel] = TrackInfo(volume, sound_type)
         return channel
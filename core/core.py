@@ -13,8 +13,12 @@ import core.menu
 from game.game_module import Game
 from core.game_storage import GameStorage
 from core.task_scheduler import TaskScheduler
+from core.profiler import FrameProfiler
+from core.governor import QualityGovernor
+from core.dirty_renderer import DirtyRenderer
 from utils.tween_module import TweenTrack, TweenChain
 from utils.animation import AnimationTrack
+from utils.particle_effects import ParticleEffect
 import sys
 import platform
 from typing import Any
@@ -28,18 +32,31 @@ class Core:
     IS_DEBUG : bool = False
     def __init__(self) -> None:
         self.FPS = 60
+        #Policy switch of the quality governor: when on, optional work is shed while frames run over budget. See set_performance_mode
         self.PERFORMANCE_MODE = False
+        self.DIRTY_RENDERING = False
+        #Moves every zombie chasing the player in one NumPy pass instead of one Vector2 step each. Needs numpy
+        self.BATCHED_STEERING = False
+        #Fixed timestep mode: the game is simulated in ticks of 1/TICK_RATE seconds and drawn in between them at FPS
+        self.FIXED_TIMESTEP = False
+        self.TICK_RATE = 60
+        #Spiral of death clamp: frames run at most this many ticks and drop the time beyond it, slowing the game down instead
+        self.MAX_TICKS_PER_FRAME = 5
         self.WEBPLATFORM = 'emscripten'
         self.CURRENT_PLATFORM = sys.platform
         self.main_display : pygame.Surface
-        self.brightness_map = pygame.Surface((2000, 2000), pygame.SRCALPHA)
-        pygame.draw.rect(self.brightness_map, (255, 255, 255, 0), (0,0, 2000, 2000))
+        #Brightness is applied by filling the display with this color in the blend mode, no full screen surface needed
+        self.brightness_color : tuple[int, int, int] = (0, 0, 0)
+        self.brightness_blend_mode : int = pygame.BLENDMODE_NONE
         self.event_manager = EventManger()
         self.make_connections()
 
         self.active_fingers : dict[int, tuple[float, float]] = {}
         self.dt : float = 1
         self.last_dt_measurment : float = 0
+        self.tick_dt : float = 1
+        self.accumulator : float = 0
+        self.alpha : float = 0
 
         self.settings = Settings()
         self.bg_manager = BgManager()
@@ -48,12 +65,16 @@ class Core:
         self.game = Game()
         self.storage = GameStorage()
         self.task_scheduler = TaskScheduler()
+        self.profiler = FrameProfiler()
+        self.governor = QualityGovernor(1000 / self.FPS, self.apply_quality)
         self.delta_stream : deque[float] = deque([1 for _ in range(30)])
         self.dirty_display_rects : list[pygame.Rect] = []
-        self.brightness_map_blend_mode = pygame.BLENDMODE_NONE
+        self.renderer = DirtyRenderer(self.dirty_display_rects)
 
         self.global_timer : Timer = Timer(-1, perf_counter, 1)
         Timer.time_source = self.global_timer.get_time
+        #Clocks sampled once per frame by snapshot_clocks, sources first. The game timer is sampled after them while it exists
+        self.frame_clocks : list[Timer] = [self.global_timer]
 
         self.window_bools : dict = {'Shown' : True, 'input_focused' : True}
 
@@ -74,6 +95,8 @@ class Core:
     
     def close_game(self, event : pygame.Event):
         self.settings.save()
+        #The trace is only written by debug builds, and never on the web where there is no install directory to write to
+        if self.IS_DEBUG and self.profiler.trace and not self.is_web(): self.profiler.dump()
         pygame.quit()
         exit()
     
@@ -86,55 +109,85 @@ class Core:
             self.dt = (mark - self.last_dt_measurment) * target_fps
             self.last_dt_measurment = mark
     
+    def snapshot_clocks(self):
+        '''Samples the frame clocks once. Until the next call, timers reading them get the time of the start of the frame
+        without going down to perf_counter. Timers created with precise=True still read the real time.'''
+        for clock in self.frame_clocks:
+            clock.take_snapshot()
+        if self.game.game_timer is not None: self.game.game_timer.take_snapshot()
+
+    def update_fixed_step(self) -> int:
+        '''Adds the frame time measured by update_dt to the accumulator and returns how many ticks to simulate.
+        Afterwards tick_dt holds the delta of a tick and alpha how far the frame is between the last tick and the next one.'''
+        self.tick_dt = 60 / self.TICK_RATE
+        self.accumulator += self.dt
+        ticks = int(self.accumulator // self.tick_dt)
+        if ticks > self.MAX_TICKS_PER_FRAME:
+            ticks = self.MAX_TICKS_PER_FRAME
+            self.accumulator = self.accumulator % self.tick_dt + ticks * self.tick_dt
+        self.accumulator -= ticks * self.tick_dt
+        self.alpha = self.accumulator / self.tick_dt
+        return ticks
+
+    def reset_fixed_step(self):
+        self.accumulator = 0
+        self.alpha = 0
+
+    def set_performance_mode(self, enabled : bool, budget : float|None = None):
+        '''Turns the quality governor on or off. budget is in milliseconds of work per frame and defaults to a frame at FPS.'''
+        self.PERFORMANCE_MODE = enabled
+        if enabled: self.governor.enable(budget if budget is not None else 1000 / self.FPS)
+        else: self.governor.disable()
+
+    def apply_quality(self, governor : QualityGovernor):
+        '''Called by the governor whenever it sheds or restores a feature. Game code reads the governor flags directly.'''
+        self.bg_manager.sfx_enabled = governor.sfx
+        ParticleEffect.emission_enabled = governor.particles
+
     def set_debug_message(self, text : str):
         debug_textsprite : TextSprite = core_object.main_ui.get_sprite('debug_sprite')
         if not debug_textsprite: return
         debug_textsprite.text = text
     
     def set_brightness(self, new_val : int):
-        brightness = new_val
         abs_brightness = abs(new_val)
-        if brightness >= 0:
-            pygame.draw.rect(self.brightness_map, (abs_brightness, abs_brightness, abs_brightness), (0,0, 2000, 2000))
-            self.brightness_map_blend_mode = pygame.BLEND_RGB_ADD
-        else:
-            pygame.draw.rect(self.brightness_map, (abs_brightness, abs_brightness, abs_brightness), (0,0, 2000, 2000))
-            self.brightness_map_blend_mode = pygame.BLEND_RGB_SUB
+        self.brightness_color = (abs_brightness, abs_brightness, abs_brightness)
+        self.brightness_blend_mode = pygame.BLEND_RGB_ADD if new_val >= 0 else pygame.BLEND_RGB_SUB
+
+    def get_brightness_pass(self) -> tuple[tuple[int, int, int], int]|None:
+        '''Returns the color and blend mode to fill the display with, or None while the brightness setting is 0.'''
+        if self.settings.info['Brightness'] == 0: return None
+        return self.brightness_color, self.brightness_blend_mode
     
     def make_connections(self):
-        self.event_manager.bound_actions[pygame.QUIT] = [self.close_game]
+        self.event_manager.set_actions(pygame.QUIT, [self.close_game])
 
         self.event_manager.bind(pygame.WINDOWHIDDEN, self.handle_window_event)
         self.event_manager.bind(pygame.WINDOWSHOWN, self.handle_window_event)
         self.event_manager.bind(pygame.WINDOWFOCUSGAINED, self.handle_window_event)
         self.event_manager.bind(pygame.WINDOWFOCUSLOST, self.handle_window_event)
 
-        self.event_manager.bind(pygame.FINGERDOWN, self.process_touch_event)
-        self.event_manager.bind(pygame.FINGERMOTION, self.process_touch_event)
-        self.event_manager.bind(pygame.FINGERUP, self.process_touch_event)
+        self.event_manager.bind(pygame.FINGERDOWN, self.track_finger)
+        self.event_manager.bind(pygame.FINGERMOTION, self.track_finger)
+        self.event_manager.bind(pygame.FINGERUP, self.release_finger)
+
+        self.event_manager.bind(pygame.KEYDOWN, self.handle_debug_key)
     
-    def process_touch_event(self, event : pygame.Event):
-        if event.type == pygame.FINGERDOWN:
-            x = event.x * self.main_display.get_width()
-            y = event.y * self.main_display.get_height()
-            self.active_fingers[event.finger_id] = (x,y)
-        
-        elif event.type == pygame.FINGERUP:
-            self.active_fingers.pop(event.finger_id, None)
-        
-        elif event.type == pygame.FINGERMOTION:
-            x = event.x * self.main_display.get_width()
-            y = event.y * self.main_display.get_height()
-            self.active_fingers[event.finger_id] = (x,y)
-        
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            self.active_fingers[10] = (event.pos)
-        
-        elif event.type == pygame.MOUSEMOTION:
-            self.active_fingers[10] = (event.pos)
+    def handle_debug_key(self, event : pygame.Event):
+        if event.key == pygame.K_F3 and self.IS_DEBUG:
+            self.profiler.toggle()
+            self.renderer.request_full_redraw()
+        elif event.key == pygame.K_F4 and self.IS_DEBUG:
+            self.set_performance_mode(not self.PERFORMANCE_MODE)
+    
+    def track_finger(self, event : pygame.Event):
+        '''FINGERDOWN and FINGERMOTION handler.'''
+        main_display = self.main_display
+        self.active_fingers[event.finger_id] = (event.x * main_display.get_width(), event.y * main_display.get_height())
 
-        elif event.type == pygame.MOUSEBUTTONUP:
-            self.active_fingers.pop(10, None)
+    def release_finger(self, event : pygame.Event):
+        '''FINGERUP handler.'''
+        self.active_fingers.pop(event.finger_id, None)
     
     def process_core_event():
         pass
@@ -0,0 +1,102 @@
+import pygame
+from typing import Any
+from utils.ui.ui_sprite import UiSprite
+from utils.ui.brightness_overlay import BrightnessOverlay
+
+class DirtyRenderer:
+    '''Redraws only the parts of the screen that changed since the last frame.
+    A sprite is dirty when its image or rect changed. UI elements are small and can change their surface in place, so they are always dirty.
+    Falls back to a full redraw while a BrightnessOverlay is shown, when the dirty area gets too large or when asked to.'''
+    def __init__(self, dirty_rects : list[pygame.Rect]|None = None, bg_color : pygame.Color|tuple = (94,129,162)) -> None:
+        self.dirty_rects : list[pygame.Rect] = dirty_rects if dirty_rects is not None else []
+        self.bg_color : pygame.Color|tuple = bg_color
+        self.previous : dict[Any, tuple[pygame.Surface, pygame.Rect]] = {}
+        self.force_full_redraw : bool = True
+        self.full_redraw : bool = True
+        self.full_redraw_ratio : float = 0.5
+
+    def request_full_redraw(self):
+        '''The next frame redraws the whole screen, for when something drew over it outside of the renderer.'''
+        self.force_full_redraw = True
+
+    def render(self, display : pygame.Surface, sprites : list['Sprite'], ui_elements : list[UiSprite],
+               brightness : tuple[tuple[int, int, int], int]|None = None, extra_rects : list[pygame.Rect]|None = None):
+        '''Draws sprites then ui_elements, both already sorted by zindex, and fills the drawn area with the brightness color and blend mode.
+        Afterwards full_redraw tells whether the whole display changed. If not, dirty_rects holds the regions to pass to display.update.'''
+        previous = self.previous
+        current : dict[Any, tuple[pygame.Surface, pygame.Rect]] = {}
+        dirty : list[pygame.Rect] = list(extra_rects) if extra_rects else []
+        full_redraw : bool = self.force_full_redraw
+
+        #Surfaces are blitted at the topleft of their rect, and can be larger than it (TextSprite keeps its rect when the text changes)
+        sprite_rects : list[pygame.Rect] = []
+        for sprite in sprites:
+            image = sprite.image
+            rect = pygame.Rect(sprite.rect.topleft, image.get_size())
+            sprite_rects.append(rect)
+            last = previous.pop(sprite, None)
+            if last is None:
+                dirty.append(rect)
+            elif last[0] is not image or last[1] != rect:
+                dirty.append(last[1])
+                dirty.append(rect)
+            current[sprite] = (image, rect)
+
+        ui_rects : list[pygame.Rect] = []
+        for element in ui_elements:
+            if type(element) is BrightnessOverlay: full_redraw = True
+            surf = element.surf
+            rect = pygame.Rect(element.rect.topleft, surf.get_size()) if surf is not None else element.rect.copy()
+            ui_rects.append(rect)
+            last = previous.pop(element, None)
+            if last is not None and last[1] != rect: dirty.append(last[1])
+            dirty.append(rect)
+            current[element] = (surf, rect)
+
+        for _, rect in previous.values():
+            dirty.append(rect)
+        self.previous = current
+
+        screen_rect = display.get_rect()
+        merged : list[pygame.Rect] = []
+        if not full_redraw:
+            merged = self.merge_rects(dirty, screen_rect)
+            dirty_area : int = sum(rect.w * rect.h for rect in merged)
+            if dirty_area > screen_rect.w * screen_rect.h * self.full_redraw_ratio: full_redraw = True
+
+        self.force_full_redraw = False
+        self.full_redraw = full_redraw
+        self.dirty_rects.clear()
+        if full_redraw:
+            display.fill(self.bg_color)
+            for sprite in sprites:
+                sprite.draw(display)
+            for element in ui_elements:
+                element.draw(display)
+            if brightness: display.fill(brightness[0], special_flags=brightness[1])
+            return
+
+        for rect in merged:
+            display.set_clip(rect)
+            display.fill(self.bg_color, rect)
+            for index in rect.collidelistall(sprite_rects):
+                sprites[index].draw(display)
+            for index in rect.collidelistall(ui_rects):
+                ui_elements[index].draw(display)
+            if brightness: display.fill(brightness[0], rect, special_flags=brightness[1])
+        display.set_clip(None)
+        self.dirty_rects.extend(merged)
+
+    @staticmethod
+    def merge_rects(rects : list[pygame.Rect], bounds : pygame.Rect) -> list[pygame.Rect]:
+        '''Clips the rects to bounds and unions the overlapping ones, so no pixel is drawn twice. The rects are not modified.'''
+        merged : list[pygame.Rect] = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if not rect.w or not rect.h: continue
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
@@ -2,12 +2,56 @@ import pygame
 from sys import exit
 
 class EventManger:
+    '''Calls the actions bound to each event type. Dispatch goes through a tuple of actions per event type,
+    rebuilt only when the bindings of that type change, so actions can bind and unbind while an event is processed.
+    With filtering enabled, the FILTERED_TYPES without any action are blocked and never enter the pygame queue.'''
+    #Event types the game has no use for: joysticks, controllers, drag and drop, audio devices, MIDI and system events.
+    #Every other type stays in the queue, bound or not
+    FILTERED_TYPES : tuple[int, ...] = tuple(getattr(pygame, name) for name in (
+        'JOYAXISMOTION', 'JOYBALLMOTION', 'JOYHATMOTION', 'JOYBUTTONDOWN', 'JOYBUTTONUP', 'JOYDEVICEADDED', 'JOYDEVICEREMOVED',
+        'CONTROLLERAXISMOTION', 'CONTROLLERBUTTONDOWN', 'CONTROLLERBUTTONUP', 'CONTROLLERDEVICEADDED', 'CONTROLLERDEVICEREMOVED',
+        'CONTROLLERDEVICEREMAPPED', 'CONTROLLERTOUCHPADDOWN', 'CONTROLLERTOUCHPADMOTION', 'CONTROLLERTOUCHPADUP', 'CONTROLLERSENSORUPDATE',
+        'DROPFILE', 'DROPTEXT', 'DROPBEGIN', 'DROPCOMPLETE', 'AUDIODEVICEADDED', 'AUDIODEVICEREMOVED', 'MIDIIN', 'MIDIOUT',
+        'MULTIGESTURE', 'CLIPBOARDUPDATE', 'KEYMAPCHANGED', 'LOCALECHANGED', 'SYSWMEVENT') if hasattr(pygame, name))
     def __init__(self) -> None:
         self.bound_actions : dict[int, list['function']] = {pygame.QUIT : [self.close_game]}
+        self.dispatch_table : dict[int, tuple['function', ...]] = {pygame.QUIT : (self.close_game,)}
+        self.filtering : bool = False
     
     def close_game(self, event):
         pygame.quit()
         exit()
+
+    def refresh(self, event_type : int):
+        '''Rebuilds the dispatch tuple of event_type from bound_actions.'''
+        actions = self.bound_actions.get(event_type, None)
+        if actions:
+            self.dispatch_table[event_type] = tuple(actions)
+        else:
+            self.dispatch_table.pop(event_type, None)
+        if self.filtering: self.update_filter(event_type)
+
+    def set_actions(self, event_type : int, actions : list['function']):
+        '''Replaces every action bound to event_type, QUIT included.'''
+        self.bound_actions[event_type] = list(actions)
+        self.refresh(event_type)
+
+    def enable_filtering(self):
+        '''Blocks the FILTERED_TYPES that have no actions. Binding one of them lets it through again. Needs pygame to be initialized.'''
+        self.filtering = True
+        blocked = [event_type for event_type in self.FILTERED_TYPES if event_type not in self.dispatch_table]
+        if blocked: pygame.event.set_blocked(blocked)
+
+    def disable_filtering(self):
+        self.filtering = False
+        pygame.event.set_allowed(None)
+
+    def update_filter(self, event_type : int):
+        if event_type not in self.FILTERED_TYPES: return
+        if event_type in self.dispatch_table:
+            pygame.event.set_allowed(event_type)
+        else:
+            pygame.event.set_blocked(event_type)
     
     def bind(self, event_type : int, actions : list['function'], duplicate = False):
         '''The action parameter must be a function or list of functions that accepts exactly one pygame.Event argument. 
@@ -25,8 +69,9 @@ class EventManger:
                 if action not in self.bound_actions[event_type] or duplicate is True:
                     self.bound_actions[event_type].append(action)
         else:
-            self.bound_actions[event_type] = actions
+            self.bound_actions[event_type] = list(actions)
         
+        self.refresh(event_type)
         return True
 
     def unbind(self, event_type : int, target_actions : list['function']):
@@ -46,6 +91,7 @@ class EventManger:
             if action in self.bound_actions[event_type]:
                 self.bound_actions[event_type].remove(action)
                 
+        self.refresh(event_type)
         return True
     
     def unbind_all(self, event_type : int):
@@ -56,9 +102,14 @@ class EventManger:
             return False
         
         self.bound_actions.pop(event_type)
+        self.refresh(event_type)
         return True
+
+    def is_bound(self, event_type : int) -> bool:
+        return event_type in self.dispatch_table
     
     def process_event(self, event : pygame.Event):
-        if event.type in self.bound_actions:
-            for callback in self.bound_actions[event.type]:
-                callback(event)
+        actions = self.dispatch_table.get(event.type, None)
+        if actions is None: return
+        for callback in actions:
+            callback(event)
@@ -0,0 +1,80 @@
+from time import perf_counter
+from typing import Callable
+
+class QualityGovernor:
+    '''Keeps frames within a time budget by shedding optional work, one feature at a time in SHED_ORDER,
+    while the smoothed frame time stays over the budget. Features come back in reverse order once frames are well under it.
+    Every feature stays on while the governor is disabled.'''
+    SHED_ORDER : tuple[str, ...] = ('cluster_labels', 'particles', 'hit_flash', 'sfx', 'mask_collisions')
+    def __init__(self, budget : float = 1000 / 60, on_change : Callable[['QualityGovernor'], None]|None = None) -> None:
+        self.enabled : bool = False
+        #Milliseconds of work allowed per frame, waiting for the next frame excluded
+        self.budget : float = budget
+        self.on_change : Callable[['QualityGovernor'], None]|None = on_change
+        self.smoothing : float = 0.1
+        #Frames the average must stay over budget before shedding, and under restore_ratio * budget before restoring
+        self.shed_frames : int = 30
+        self.restore_frames : int = 180
+        self.restore_ratio : float = 0.6
+
+        self.level : int = 0
+        self.average : float = 0
+        self.frames_over : int = 0
+        self.frames_under : int = 0
+        self.frame_start : float = 0
+
+        self.cluster_labels : bool = True
+        self.particles : bool = True
+        self.hit_flash : bool = True
+        self.sfx : bool = True
+        self.mask_collisions : bool = True
+
+    def enable(self, budget : float|None = None):
+        if budget is not None: self.budget = budget
+        self.enabled = True
+        self.average = 0
+        self.frames_over = 0
+        self.frames_under = 0
+
+    def disable(self):
+        self.enabled = False
+        self.set_level(0)
+
+    def begin_frame(self):
+        if not self.enabled: return
+        self.frame_start = perf_counter()
+
+    def end_frame(self):
+        if not self.enabled: return
+        self.add_sample((perf_counter() - self.frame_start) * 1000)
+
+    def add_sample(self, frame_time : float):
+        '''Feeds the time a frame took, in milliseconds, and sheds or restores a feature when the average calls for it.'''
+        self.average += (frame_time - self.average) * self.smoothing
+        if self.average > self.budget:
+            self.frames_under = 0
+            self.frames_over += 1
+            if self.frames_over >= self.shed_frames:
+                self.frames_over = 0
+                self.set_level(self.level + 1)
+        elif self.average < self.budget * self.restore_ratio:
+            self.frames_over = 0
+            self.frames_under += 1
+            if self.frames_under >= self.restore_frames:
+                self.frames_under = 0
+                self.set_level(self.level - 1)
+        else:
+            self.frames_over = 0
+            self.frames_under = 0
+
+    def set_level(self, level : int):
+        '''Sheds the first level features of SHED_ORDER and restores the others.'''
+        level = max(0, min(level, len(self.SHED_ORDER)))
+        if level == self.level: return
+        self.level = level
+        for index, feature in enumerate(self.SHED_ORDER):
+            setattr(self, feature, index >= level)
+        if self.on_change: self.on_change(self)
+
+    def get_shed(self) -> list[str]:
+        return list(self.SHED_ORDER[:self.level])
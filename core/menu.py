@@ -8,6 +8,7 @@ import utils.tween_module as TweenModule
 import utils.interpolation as interpolation
 from utils.my_timer import Timer
 from utils.ui.brightness_overlay import BrightnessOverlay
+from utils.asset_manager import assets
 from math import floor
 
 class BaseMenu:
@@ -179,18 +180,11 @@ class BaseMenu:
                     sprite.on_click()
 
 class Menu(BaseMenu):
-    token_image : pygame.Surface = pygame.image.load('assets/graphics/ui/resized_token_green_colorkey.png')
-    token_image.set_colorkey([0, 255, 0])
-    token_image = scale_surf(token_image, 0.075)
+    token_image : pygame.Surface = assets.get_image('assets/graphics/ui/resized_token_green_colorkey.png', colorkey=[0, 255, 0], scale=0.075)
 
-    fail_theme : pygame.mixer.Sound = pygame.mixer.Sound('assets/audio/stress_theme.ogg')
-    fail_theme.set_volume(0.35)
-
-    victory_theme : pygame.mixer.Sound = fail_theme #pygame.mixer.Sound('assets/audio/stress_theme.ogg')
-    victory_theme.set_volume(0.35)
-
-    main_theme : pygame.mixer.Sound = fail_theme # pygame.mixer.Sound('assets/audio/stress_theme.ogg')
-    main_theme.set_volume(0.35)
+    fail_theme : pygame.mixer.Sound = assets.get_sound('assets/audio/stress_theme.ogg', 0.35)
+    victory_theme : pygame.mixer.Sound = assets.get_sound('assets/audio/stress_theme.ogg', 0.35)
+    main_theme : pygame.mixer.Sound = assets.get_sound('assets/audio/stress_theme.ogg', 0.35)
     USE_RESULT_THEME = True
     def init(self):
         self.bg_color = (94, 129, 162)
@@ -0,0 +1,154 @@
+import pygame
+import json
+import os
+from time import perf_counter
+from collections import deque
+from math import ceil
+
+class FrameProfiler:
+    '''Times the phases of each frame and keeps rolling percentiles of them.
+    Phases are timed as laps: mark(phase) charges the time since the previous mark to phase.
+    Every call returns right away while the profiler is disabled.'''
+    PERCENTILES : tuple[int, int, int] = (50, 95, 99)
+    def __init__(self, window : int = 300, trace_limit : int = 36000, trace_path : str = 'assets/profiles/frame_trace.csv') -> None:
+        self.enabled : bool = False
+        self.window : int = window
+        self.samples : dict[str, deque[float]] = {}
+        self.trace : deque[dict[str, float]] = deque(maxlen=trace_limit)
+        self.trace_path : str = trace_path
+        self.current : dict[str, float] = {}
+        self.frame_start : float = 0
+        self.last_mark : float = 0
+
+        self.overlay_font : pygame.Font|None = None
+        self.overlay_surf : pygame.Surface|None = None
+        self.overlay_refresh_time : float = 0.25
+        self.last_overlay_refresh : float = 0
+
+    def enable(self):
+        if self.enabled: return
+        self.enabled = True
+        self.current = {}
+        self.frame_start = self.last_mark = perf_counter()
+
+    def disable(self):
+        self.enabled = False
+        self.overlay_surf = None
+
+    def toggle(self):
+        if self.enabled: self.disable()
+        else: self.enable()
+
+    def begin_frame(self):
+        if not self.enabled: return
+        self.current = {}
+        self.frame_start = self.last_mark = perf_counter()
+
+    def mark(self, phase : str):
+        if not self.enabled: return
+        now = perf_counter()
+        current = self.current
+        current[phase] = current.get(phase, 0) + (now - self.last_mark) * 1000
+        self.last_mark = now
+
+    def end_frame(self):
+        if not self.enabled: return
+        current = self.current
+        current['frame'] = (perf_counter() - self.frame_start) * 1000
+        samples = self.samples
+        for phase, time in current.items():
+            phase_samples = samples.get(phase, None)
+            if phase_samples is None:
+                phase_samples = samples[phase] = deque(maxlen=self.window)
+            phase_samples.append(time)
+        self.trace.append(current)
+        self.current = {}
+
+    def get_percentiles(self, phase : str) -> tuple[float, ...]:
+        '''Returns the nearest-rank percentiles of the last frames of phase, in milliseconds.'''
+        values = sorted(self.samples.get(phase, ()))
+        if not values: return tuple(0 for _ in self.PERCENTILES)
+        count = len(values)
+        return tuple(values[max(0, ceil(percentile / 100 * count) - 1)] for percentile in self.PERCENTILES)
+
+    def get_summary(self) -> dict[str, dict[str, float]]:
+        summary : dict[str, dict[str, float]] = {}
+        for phase in self.samples:
+            p50, p95, p99 = self.get_percentiles(phase)
+            summary[phase] = {'p50' : p50, 'p95' : p95, 'p99' : p99}
+        return summary
+
+    def draw(self, display : pygame.Surface):
+        '''Draws the percentile table in the top left corner. The table is only re-rendered a few times per second.'''
+        if not self.enabled: return
+        now = perf_counter()
+        if self.overlay_surf is None or now - self.last_overlay_refresh >= self.overlay_refresh_time:
+            self.overlay_surf = self.render_overlay()
+            self.last_overlay_refresh = now
+        display.blit(self.overlay_surf, (5, 5))
+
+    def get_overlay_rect(self) -> pygame.Rect|None:
+        if not self.enabled or self.overlay_surf is None: return None
+        return self.overlay_surf.get_rect(topleft = (5, 5))
+
+    def render_overlay(self) -> pygame.Surface:
+        if self.overlay_font is None: self.overlay_font = pygame.font.Font('assets/fonts/Pixeltype.ttf', 26)
+        font = self.overlay_font
+        rows : list[tuple[str, ...]] = [('ms', *(f'p{percentile}' for percentile in self.PERCENTILES))]
+        for phase in self.samples:
+            rows.append((phase, *(f'{time:.2f}' for time in self.get_percentiles(phase))))
+        name_width : int = 90
+        column_width : int = 65
+        line_height : int = font.get_linesize()
+        surf = pygame.Surface((name_width + column_width * 3 + 10, line_height * len(rows) + 10), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 170))
+        for y, row in enumerate(rows):
+            for x, cell in enumerate(row):
+                left = 5 if x == 0 else 5 + name_width + (x - 1) * column_width
+                surf.blit(font.render(cell, False, 'White'), (left, 5 + y * line_height))
+        return surf
+
+    def dump(self, path : str|None = None):
+        '''Writes every recorded frame to path. The format is picked from the extension, ".json" or ".csv".'''
+        path = path or self.trace_path
+        directory = os.path.dirname(path)
+        if directory: os.makedirs(directory, exist_ok=True)
+        phases : list[str] = list(self.samples)
+        if path.endswith('.json'):
+            with open(path, 'w') as file:
+                json.dump({'phases' : phases, 'summary' : self.get_summary(), 'frames' : list(self.trace)}, file)
+            return
+        with open(path, 'w') as file:
+            file.write(','.join(phases) + '\n')
+            for frame in self.trace:
+                file.write(','.join(f'{frame[phase]:.4f}' if phase in frame else '' for phase in phases) + '\n')
+
+class StartupReport:
+    '''Times the steps of the startup, from the first line of main.py to the first frame on screen.
+    Steps are timed as laps like FrameProfiler phases. The report is written next to the frame trace of the FrameProfiler.'''
+    def __init__(self, start_time : float|None = None, report_path : str = 'assets/profiles/startup_report.txt') -> None:
+        self.start_time : float = perf_counter() if start_time is None else start_time
+        self.report_path : str = report_path
+        self.last_mark : float = self.start_time
+        self.steps : dict[str, float] = {}
+
+    def mark(self, step : str):
+        now = perf_counter()
+        self.steps[step] = self.steps.get(step, 0) + (now - self.last_mark) * 1000
+        self.last_mark = now
+
+    def get_total(self) -> float:
+        '''Returns the time from the start to the last mark, in milliseconds.'''
+        return (self.last_mark - self.start_time) * 1000
+
+    def get_report(self) -> str:
+        lines : list[str] = [f'{step:<16}{time:>9.1f} ms' for step, time in self.steps.items()]
+        lines.append(f'{"total":<16}{self.get_total():>9.1f} ms')
+        return '\n'.join(lines)
+
+    def dump(self, path : str|None = None):
+        path = path or self.report_path
+        directory = os.path.dirname(path)
+        if directory: os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(self.get_report() + '\n')
@@ -1,46 +1,129 @@
 from utils.my_timer import Timer
 from typing import Callable
 from utils.helpers import Task
+from heapq import heappush, heappop
+from itertools import count
+
+TimeType = float|tuple[float, Callable[[], float], float]
+
+class ScheduledTask(Task):
+    '''A task handed out by the TaskScheduler. It can be cancelled until it has run for the last time.'''
+    def __init__(self, callback : Callable, *args, **kwargs) -> None:
+        super().__init__(callback, *args, **kwargs)
+        self.clock : Callable[[], float]
+        self.deadline : float = 0
+        self.interval : float|None = None
+        self.end_time : float|None = None
+        self.cancelled : bool = False
+        self.finished : bool = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def pending(self) -> bool:
+        return not (self.cancelled or self.finished)
 
 class TaskScheduler:
+    '''Runs tasks once their time has passed. Times are either a duration in seconds of the global timer,
+    or (duration, time source, scale factor) like the arguments of a Timer, to follow another clock such as the game timer.
+    Each clock keeps its tasks in a heap by deadline, so an update only reads each clock once and only looks at the tasks that are due.
+    Clocks that exclude their paused time (like the game timer) delay their tasks by the length of the pause.'''
     def __init__(self) -> None:
-        self.scheduled_tasks : dict[Task, Timer] = {}
-        self.continous_tasks : dict[Task, Timer] = {}
+        self.heaps : dict[Callable[[], float], list[tuple[float, int, ScheduledTask]]] = {}
+        self.continous_tasks : dict[ScheduledTask, None] = {}
+        self.counter = count()
 
-    def schedule_task(self, time : float|tuple[float, Callable[[], float], float], callback : Callable, *args, **kwargs):
-        new_task = Task(callback, *args, **kwargs)
+    @staticmethod
+    def read_time(time : TimeType) -> tuple[float, Callable[[], float]]:
+        '''Returns the duration in units of the time source and the time source.'''
         t = type(time)
-        if (t == int) or t == (float):
-            self.scheduled_tasks[new_task] = Timer(time)
-        else:
-            self.scheduled_tasks[new_task] = Timer(time[0], time[1], time[2])
+        if t == int or t == float:
+            return time, Timer.time_source
+        duration, time_source, scale_factor = time
+        return duration / scale_factor, time_source or Timer.time_source
+
+    def push(self, task : ScheduledTask):
+        heap = self.heaps.get(task.clock, None)
+        if heap is None: heap = self.heaps[task.clock] = []
+        heappush(heap, (task.deadline, next(self.counter), task))
+
+    def schedule_task(self, time : TimeType, callback : Callable, *args, **kwargs) -> ScheduledTask:
+        '''Runs callback once, after time.'''
+        new_task = ScheduledTask(callback, *args, **kwargs)
+        duration, new_task.clock = self.read_time(time)
+        new_task.deadline = new_task.clock() + duration
+        self.push(new_task)
         return new_task
-    
-    def schedule_continuous_task(self, time : float|tuple[float, Callable[[], float], float], callback : Callable, *args, **kwargs):
-        new_task = Task(callback, *args, **kwargs)
-        t = type(time)
-        if t == int or float:
-            self.continous_tasks[new_task] = Timer(time)
-        else:
-            self.continous_tasks[new_task] = Timer(time[0], time[1], time[2])
+
+    def schedule_repeating_task(self, interval : TimeType, duration : float, callback : Callable, *args, **kwargs) -> ScheduledTask:
+        '''Runs callback every interval for duration (in the same clock and units as interval), or until cancelled if duration is negative.
+        After a hitch, missed runs are skipped rather than run back to back.'''
+        new_task = ScheduledTask(callback, *args, **kwargs)
+        new_task.interval, new_task.clock = self.read_time(interval)
+        if new_task.interval <= 0: raise ValueError('Repeating tasks need a positive interval')
+        if type(interval) != int and type(interval) != float: duration /= interval[2]
+        now = new_task.clock()
+        new_task.deadline = now + new_task.interval
+        new_task.end_time = now + duration if duration >= 0 else None
+        self.push(new_task)
+        return new_task
+
+    def schedule_continuous_task(self, time : TimeType, callback : Callable, *args, **kwargs) -> ScheduledTask:
+        '''Runs callback on every update until time has passed.'''
+        new_task = ScheduledTask(callback, *args, **kwargs)
+        duration, new_task.clock = self.read_time(time)
+        new_task.deadline = new_task.clock() + duration
+        self.continous_tasks[new_task] = None
         return new_task
-    
+
+    def cancel(self, task : ScheduledTask):
+        '''Cancelled tasks are dropped when they come up.'''
+        task.cancel()
+        self.continous_tasks.pop(task, None)
+
+    def clear(self):
+        for heap in self.heaps.values():
+            for _, _, task in heap:
+                task.cancel()
+        for task in self.continous_tasks:
+            task.cancel()
+        self.heaps.clear()
+        self.continous_tasks.clear()
+
+    def __len__(self) -> int:
+        return sum(len(heap) for heap in self.heaps.values()) + len(self.continous_tasks)
+
     def update(self):
-        to_remove = []
-        for task in self.scheduled_tasks:
-            if self.scheduled_tasks[task].isover():
+        empty_clocks : list[Callable[[], float]] = []
+        for clock, heap in list(self.heaps.items()):
+            now = clock()
+            while heap and heap[0][0] < now:
+                deadline, _, task = heappop(heap)
+                if task.cancelled: continue
                 task.execute()
-                to_remove.append(task)
-        
-        for task in to_remove:
-            self.scheduled_tasks.pop(task)
+                if task.interval is None or task.cancelled:
+                    task.finished = True
+                    continue
+                next_deadline = deadline + task.interval * (1 + (now - deadline) // task.interval)
+                if task.end_time is not None and next_deadline > task.end_time:
+                    task.finished = True
+                    continue
+                task.deadline = next_deadline
+                heappush(heap, (next_deadline, next(self.counter), task))
+            if not heap: empty_clocks.append(clock)
 
-        to_remove.clear()
+        for clock in empty_clocks:
+            if not self.heaps.get(clock, True): self.heaps.pop(clock)
 
-        for task in self.continous_tasks:
+        if not self.continous_tasks: return
+        to_remove : list[ScheduledTask] = []
+        for task in list(self.continous_tasks):
+            if task.cancelled: continue
             task.execute()
-            if self.continous_tasks[task].isover():
-                to_remove
+            if task.clock() > task.deadline:
+                task.finished = True
+                to_remove.append(task)
 
         for task in to_remove:
-            self.continous_tasks.pop(task)
\ No newline at end of file
+            self.continous_tasks.pop(task, None)
@@ -10,6 +10,9 @@ class Ui:
         self.elements : list[UiSprite] = elements
         self.temp_elements : dict[UiSprite, Timer] = {}
         self.complete_list : list[UiSprite] = []
+        #complete_list is only sorted after elements were added. Call mark_unsorted after changing the zindex of an element
+        self.sorted : bool = True
+        self.use_fblits : bool = hasattr(pygame.Surface, 'fblits')
     
     def get_sprite(self, name : str|None = None, tag : int|None = None) -> UiSprite|None:
         for element in self.complete_list:
@@ -32,17 +35,38 @@ class Ui:
         
         return return_list
 
+    def mark_unsorted(self):
+        self.sorted = False
+
+    def get_draw_order(self) -> list[UiSprite]:
+        if not self.sorted:
+            self.complete_list.sort(key = lambda ui_sprite : ui_sprite.zindex)
+            self.sorted = True
+        return self.complete_list
+
     def render(self, display : pygame.Surface):
-        
-        self.complete_list.sort(key = lambda ui_sprite : ui_sprite.zindex)
-        for element in self.complete_list:
+        '''Draws the elements by zindex. Runs of visible elements using UiSprite.draw are submitted in one blits call.'''
+        blit_sequence : list[tuple[pygame.Surface, pygame.Rect]] = []
+        for element in self.get_draw_order():
+            if element._plain_draw:
+                if element.visible: blit_sequence.append((element.surf, element.rect))
+                continue
+            if blit_sequence:
+                self.blit_sequence(display, blit_sequence)
+                blit_sequence = []
             element.draw(display)
+        if blit_sequence: self.blit_sequence(display, blit_sequence)
         #print(self.complete_list, self.elements, self.temp_elements)
+
+    def blit_sequence(self, display : pygame.Surface, sequence : list[tuple[pygame.Surface, pygame.Rect]]):
+        if self.use_fblits: display.fblits(sequence)
+        else: display.blits(sequence, doreturn=False)
     
     def add(self, element : UiSprite, duplicate = False):
         if element not in self.elements or duplicate == True:
             self.elements.append(element)
             self.complete_list.append(element)
+            self.sorted = False
     
     def add_multiple(self, elements : list[UiSprite], duplicate = False):
         for element in elements:
@@ -73,6 +97,7 @@ class Ui:
             timer = time if type(time) == Timer else Timer(time, time_source, time_scale)
             self.temp_elements[element] = timer
             self.complete_list.append(element)
+            self.sorted = False
     
     def update(self):
         to_del = []
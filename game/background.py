@@ -1,12 +1,14 @@
 import pygame
 from core.core import core_object
 from game.sprite import Sprite
+from utils.indexed_list import IndexedList
 
 class Background(Sprite):
+    __slots__ = ('_zindex',)
     screen_size = core_object.main_display.get_size()
     screen_center = (screen_size[0] // 2, screen_size[1] // 2)
-    active_elements : list['Background'] = []
-    inactive_elements : list['Background']  = []
+    active_elements : IndexedList['Background'] = IndexedList()
+    inactive_elements : IndexedList['Background'] = IndexedList()
     areas : dict[int, pygame.Surface] = {}
     areas[0] = pygame.Surface(screen_size)
     areas[0].fill((94,129,162))
@@ -19,7 +21,6 @@ class Background(Sprite):
 
     def __init__(self) -> None:
         super().__init__()
-        Background.inactive_elements.append(self)
     
     @classmethod
     def spawn(cls, area_num : int):
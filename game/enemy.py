@@ -1,14 +1,16 @@
 import pygame
 from game.sprite import Sprite
+from utils.indexed_list import IndexedList
 from core.core import core_object
-from utils.pivot_2d import Pivot2D
 from game.projectiles import BaseProjectile, PeirceProjectile
-from utils.helpers import load_alpha_to_colorkey, scale_surf, tuple_vec_average, make_circle
+from utils.helpers import load_alpha_to_colorkey, scale_surf, make_circle
+from utils.clustering import find_clusters
 from utils.ui.textsprite import TextSprite
 from game.weapons import BaseWeapon, FiringModes, WeaponBuff, WeaponBuffTypes, WeaponStats, WEAPONS
 import utils.tween_module as TweenModule
 import utils.interpolation as interpolation
-from utils.my_timer import Timer
+from game.steering import SteeringBatch
+from utils.render_atlas import render_atlas
 
 class ZombieTypes:
     normal = 'normal'
@@ -25,23 +27,11 @@ class ZombieTypes:
     def get_dict(cls):
         cls.zombie_dict = {cls.normal : NormalZombie, cls.quick : QuickZombie, cls.tank : TankZombie, cls.ranged : RangedZombie}
 
-class ZombieCluster:
-    def __init__(self) -> None:
-        self.zombies : set[BaseZombie] = set()
-    
-    def get_count(self) -> int:
-        return len(self.zombies)
-    
-    @staticmethod
-    def combine(clusters : list['ZombieCluster']):
-        new_cluster = ZombieCluster()
-        for cluster in clusters:
-            new_cluster.zombies = new_cluster.zombies.union([*cluster.zombies])
-        return new_cluster
-
 class BaseZombie(Sprite):
-    inactive_elements : list["BaseZombie"] = []
-    active_elements : list['BaseZombie'] = []
+    #Zombies keep a handful of numbers: their surfaces and masks are shared through the render atlas
+    __slots__ = ('_zindex', 'speed', 'max_hp', 'hp', 'damage', 'flashing', 'flash_end', 'skin', 'is_dying')
+    inactive_elements : IndexedList["BaseZombie"] = IndexedList()
+    active_elements : IndexedList['BaseZombie'] = IndexedList()
 
     test_image : pygame.Surface = pygame.surface.Surface((50, 50))
     test_image.set_colorkey([0, 0, 255])
@@ -50,113 +40,103 @@ class BaseZombie(Sprite):
     ui_clusters : list[TextSprite] = []
     str_type = None
     flash_image = load_alpha_to_colorkey('assets/graphics/enemy/flash_dark.png', [0, 255, 0])
+    steering : SteeringBatch|None = None
+    seeks_player : bool = True
+    cluster_interval : int = 1
+    cluster_frame : int = 0
+    FLASH_TIME : float = 0.15
+    #Render atlas indexes of the class surface and of its flash variant, set by build_skins
+    base_skin : int = 0
+    flash_skin : int = 0
     def __init__(self) -> None:
         super().__init__()
-        self.dynamic_mask = True
         self.speed : float
         self.max_hp : int
         self.hp : int
         self.damage : int
-        self.flash_timer : Timer
+        #Game time at which the flash ends
+        self.flash_end : float = 0
         self.flashing : bool = False
-        self.og_image : pygame.Surface|None = None
+        self.skin : int = 0
         self.is_dying : bool = False
-        BaseZombie.inactive_elements.append(self)
+
+    @classmethod
+    def build_skins(cls):
+        '''Adds the class surface and its flash variant, fitted to the same size, to the render atlas.
+        Every zombie surface is the size of the flash image, so the flash looks like the old image swap.'''
+        cls.base_skin = render_atlas.add(cls.test_image)
+        cls.flash_skin = render_atlas.add_variant(cls.base_skin, cls.flash_image)
+
+    def set_skin(self, index : int):
+        '''Shows the atlas surface at index. The mask comes with it and the rect keeps its size.'''
+        self.skin = index
+        self._image = render_atlas.surfaces[index]
+        self.mask = render_atlas.masks[index]
     
     @classmethod
     def spawn(cls, new_pos : pygame.Vector2, health : int, speed : int = 3, damage : int = 1):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
 
-        element.image = cls.test_image
-        #element.mask = pygame.mask.from_surface(element.image)
+        element.set_skin(cls.base_skin)
         element.rect = element.image.get_rect()
 
         element.position = new_pos
         element.align_rect()
         element.zindex = 10
 
-        element.pivot = Pivot2D(element._position, element.image, (0, 0, 255))
-
-
         element.max_hp = health
         element.hp = health
         element.speed = speed
         element.damage = damage
 
         element.flashing = False
-        element.flash_timer = Timer(-1, core_object.game.game_timer.get_time)
-        element.og_image = None
+        element.flash_end = 0
         element.is_dying = False
+        element.prepare_spawn(new_pos, speed)
 
         cls.unpool(element)
         return element
+
+    def prepare_spawn(self, new_pos : pygame.Vector2, speed : float):
+        '''Sets up the state of a zombie type before the zombie joins the active pool.'''
+        pass
     
     def start_flashing(self):
-        if self.flashing: self.flash_timer.restart(); return
+        if not core_object.governor.hit_flash: return
+        self.flash_end = core_object.game.game_timer.get_time() + self.FLASH_TIME
+        if self.flashing: return
         self.flashing = True
-        self.flash_timer.set_duration(0.15)
-        self.og_image = self.image
-        self.image = self.flash_image
+        self.set_skin(self.flash_skin)
     
     def stop_flashing(self):
         if not self.flashing: return
         self.flashing = False
-        self.flash_timer.set_duration(-1)
-        self.image = self.og_image
-        self.og_image = None
+        self.set_skin(self.base_skin)
     
     def update_flash(self):
         if not self.flashing: return
-        if self.flash_timer.isover():
+        if core_object.game.game_timer.get_time() > self.flash_end:
             self.stop_flashing()
     
     def update_death_state(self):
         self.update_flash()
         if not self.flashing: self.kill_instance_safe()
     
-    @classmethod
-    def pool(cls, element):
-        '''Transfers an element from active to inactive state. Nothing changes if the element is already inactive.'''
-        if element in BaseZombie.active_elements:
-            BaseZombie.active_elements.remove(element)
-        
-        if element in Sprite.active_elements:
-            Sprite.active_elements.remove(element)
-        
-        if element not in BaseZombie.inactive_elements:
-            BaseZombie.inactive_elements.append(element)
-
-        if element not in Sprite.inactive_elements:
-            Sprite.inactive_elements.append(element)
-    
-    @classmethod
-    def unpool(cls, element):
-        '''Transfers an element from inactive to active state. Nothing changes if the element is already active.'''
-        if element not in BaseZombie.active_elements:
-            BaseZombie.active_elements.append(element)
-        
-        if element not in Sprite.active_elements:
-            Sprite.active_elements.append(element)
-
-
-        if element in BaseZombie.inactive_elements:
-            BaseZombie.inactive_elements.remove(element)
-
-        if element in Sprite.inactive_elements:
-            Sprite.inactive_elements.remove(element)   
-    
     def update(self, delta: float):
         if not core_object.game.is_nm_state(): return
         if self.is_dying:
             self.update_death_state()
             return
-        player_direction : pygame.Vector2 = (core_object.game.player.position - self.position).normalize()
-        self.position += player_direction * self.speed * delta
+        steering = BaseZombie.steering
+        if steering is None or self not in steering:
+            player_direction : pygame.Vector2 = (core_object.game.player.position - self.position).normalize()
+            self.move(player_direction, self.speed * delta)
         self.do_collisions()
         self.update_flash()
     
     def do_collisions(self):
-        bullets : list[BaseProjectile] = self.get_all_colliding([BaseProjectile.active_elements])
+        get_colliding = self.get_all_colliding if core_object.governor.mask_collisions else self.get_all_rect_colliding
+        bullets : list[BaseProjectile] = get_colliding(BaseProjectile)
         for bullet in bullets:
             if not isinstance(bullet, BaseProjectile):continue
             if not bullet.is_hostile(bullet.TEAMS.enemy):continue          
@@ -171,43 +151,57 @@ class BaseZombie(Sprite):
             if not alive: break
     
     @classmethod
-    def update_class(cls, delta: float):
-        clusters : dict[tuple[float, float], ZombieCluster] = {}
-        grouped_clusters : dict[tuple[float, float], int] = {}
-        for i, zombie in enumerate(BaseZombie.active_elements):
-            zombie_pos = zombie.position
-            result = ZombieCluster()
-            result.zombies.add(zombie)
-            for j, other_zombie in enumerate(BaseZombie.active_elements):
-                if i >= j: continue
-                if other_zombie == zombie: continue
-                other_zombie_pos = other_zombie.position
-                distance_squared = (zombie_pos - other_zombie_pos).magnitude_squared()
-                if distance_squared <= 18 * 18:
-                    result.zombies.add(other_zombie)
-            if result.get_count() >= 3: clusters[(zombie_pos.x, zombie_pos.y)] = result
-        
-        banned_clusters : list[tuple[float, float]] = []
-        for i, cluster in enumerate(clusters):
-            if cluster in banned_clusters: continue
-            group : list[tuple[float, float]] = [cluster]
-            for j, other_cluster in enumerate(clusters):
-                if i >= j: continue
-                if cluster == other_cluster: continue
-                if other_cluster in banned_clusters: continue
-                distance_squared = (cluster[0] - other_cluster[0]) ** 2 + (cluster[1] - other_cluster[1]) ** 2
-                if distance_squared < 18 * 18:
-                    group.append(other_cluster)
-                    banned_clusters.append(other_cluster)
+    def enable_batched_steering(cls) -> bool:
+        '''Moves every seeking zombie with one vectorized step per frame instead of one Vector2 step per zombie.
+        Requires numpy. Returns False and keeps per-instance movement if numpy is not installed.'''
+        if not SteeringBatch.is_available(): return False
+        if BaseZombie.steering is None:
+            BaseZombie.steering = SteeringBatch()
+            for zombie in BaseZombie.active_elements:
+                if zombie.seeks_player and not zombie.is_dying: BaseZombie.steering.add(zombie)
+        return True
+
+    @classmethod
+    def unpool(cls, element : 'BaseZombie'):
+        super().unpool(element)
+        if BaseZombie.steering is not None and element.seeks_player:
+            BaseZombie.steering.add(element)
+
+    @classmethod
+    def pool(cls, element : 'BaseZombie'):
+        super().pool(element)
+        if BaseZombie.steering is not None:
+            BaseZombie.steering.remove(element)
 
-            banned_clusters.append(cluster)
-            grouped_clusters[tuple_vec_average(group)] = ZombieCluster.combine([clusters[pos] for pos in group]).get_count()
-        cls.clear_clusters()
-        for cluster in grouped_clusters:
-            count : int = grouped_clusters[cluster]
-            cls.create_cluster(cluster, count)
-            
+    @classmethod
+    def update_class(cls, delta: float):
+        steering = BaseZombie.steering
+        if steering is not None and core_object.game.is_nm_state():
+            steering.step(core_object.game.player.position, delta)
+        if not core_object.governor.cluster_labels:
+            if cls.ui_clusters: cls.clear_clusters()
+            return
+        cls.cluster_frame += 1
+        if cls.cluster_frame >= cls.cluster_interval:
+            cls.cluster_frame = 0
+            cls.update_clusters()
 
+    @classmethod
+    def update_clusters(cls):
+        positions : list[tuple[float, float]] = [(zombie.position.x, zombie.position.y) for zombie in BaseZombie.active_elements]
+        grouped_clusters : dict[tuple[float, float], int] = find_clusters(positions, 18, 3)
+        labels : list[TextSprite] = cls.ui_clusters
+        for index, (pos, count) in enumerate(grouped_clusters.items()):
+            if index >= len(labels):
+                cls.create_cluster(pos, count)
+                continue
+            label = labels[index]
+            new_text : str = f'X{count}'
+            if label.text != new_text: label.text = new_text
+            label.rect.midbottom = pos
+            label.position = pygame.Vector2(label.rect.center)
+        while len(labels) > len(grouped_clusters):
+            core_object.main_ui.remove(labels.pop())
 
     @classmethod
     def clear_clusters(cls):
@@ -232,6 +226,7 @@ class BaseZombie(Sprite):
     
     def die(self):
         self.is_dying = True
+        if BaseZombie.steering is not None: BaseZombie.steering.remove(self)
         self.start_flashing()
         core_object.game.on_enemy_death(self)
         
@@ -251,230 +246,59 @@ class BaseZombie(Sprite):
     @classmethod
     def class_cleanup(self):
         self.clear_clusters()
+        if BaseZombie.steering is not None: BaseZombie.steering.clear()
 
 Sprite.register_class(BaseZombie)
+BaseZombie.enable_spatial_hash(64)
 
 class NormalZombie(BaseZombie):
     test_image : pygame.Surface = load_alpha_to_colorkey('assets/graphics/enemy/normal/main.png', [73, 197, 2])
-    inactive_elements : list['NormalZombie'] = []
-    active_elements : list['NormalZombie'] = []
+    __slots__ = ()
+    inactive_elements : IndexedList['NormalZombie'] = IndexedList()
+    active_elements : IndexedList['NormalZombie'] = IndexedList()
     str_type = ZombieTypes.normal
     def __init__(self) -> None:
         super().__init__()
-        NormalZombie.inactive_elements.append(self)
-    
-    @classmethod
-    def spawn(cls, new_pos : pygame.Vector2, health : int, speed : int = 3, damage : int = 1):
-        element = cls.inactive_elements[0]
-
-        element.image = cls.test_image
-        #element.mask = pygame.mask.from_surface(element.image)
-        element.rect = element.image.get_rect()
-
-        element.position = new_pos
-        element.align_rect()
-        element.zindex = 10
-
-        element.pivot = Pivot2D(element._position, element.image, (0, 0, 255))
-
-
-        element.max_hp = health
-        element.hp = health
-        element.speed = speed
-        element.damage = damage
-        
-        element.flashing = False
-        element.flash_timer = Timer(-1, core_object.game.game_timer.get_time)
-        element.og_image = None
-        element.is_dying = False
-
-        cls.unpool(element)
-        return element
-        
-
-    @classmethod
-    def pool(cls, element):
-        '''Transfers an element from active to inactive state. Nothing changes if the element is already inactive.'''
-        super().pool(element)
-        if element in NormalZombie.active_elements:
-            NormalZombie.active_elements.remove(element)
-        
-        if element not in NormalZombie.inactive_elements:
-            NormalZombie.inactive_elements.append(element)
     
-    @classmethod
-    def unpool(cls, element):
-        '''Transfers an element from inactive to active state. Nothing changes if the element is already active.'''
-        super().unpool(element)
-        if element not in NormalZombie.active_elements:
-            NormalZombie.active_elements.append(element)
-
-
-        if element in NormalZombie.inactive_elements:
-            NormalZombie.inactive_elements.remove(element)
 
 class QuickZombie(BaseZombie):
-    inactive_elements : list['NormalZombie'] = []
-    active_elements : list['NormalZombie'] = []
+    __slots__ = ()
+    inactive_elements : IndexedList['QuickZombie'] = IndexedList()
+    active_elements : IndexedList['QuickZombie'] = IndexedList()
 
     test_image : pygame.Surface = load_alpha_to_colorkey('assets/graphics/enemy/quick/main.png', [73, 197, 2])
     str_type = ZombieTypes.quick
     def __init__(self) -> None:
         super().__init__()
-        QuickZombie.inactive_elements.append(self)
-    
-    @classmethod
-    def spawn(cls, new_pos : pygame.Vector2, health : int, speed : int = 3, damage : int = 1):
-        element = cls.inactive_elements[0]
-
-        element.image = cls.test_image
-        #element.mask = pygame.mask.from_surface(element.image)
-        element.rect = element.image.get_rect()
-
-        element.position = new_pos
-        element.align_rect()
-        element.zindex = 10
-
-        element.pivot = Pivot2D(element._position, element.image, (0, 0, 255))
-
-
-        element.max_hp = health
-        element.hp = health
-        element.speed = speed
-        element.damage = damage
-        
-        element.flashing = False
-        element.flash_timer = Timer(-1, core_object.game.game_timer.get_time)
-        element.og_image = None
-        element.is_dying = False
-
-
-        cls.unpool(element)
-        return element
-        
-
-    @classmethod
-    def pool(cls, element):
-        '''Transfers an element from active to inactive state. Nothing changes if the element is already inactive.'''
-        super().pool(element)
-        if element in QuickZombie.active_elements:
-            QuickZombie.active_elements.remove(element)
-        
-        if element not in QuickZombie.inactive_elements:
-            QuickZombie.inactive_elements.append(element)
     
-    @classmethod
-    def unpool(cls, element):
-        '''Transfers an element from inactive to active state. Nothing changes if the element is already active.'''
-        super().unpool(element)
-        if element not in QuickZombie.active_elements:
-            QuickZombie.active_elements.append(element)
-
-
-        if element in QuickZombie.inactive_elements:
-            QuickZombie.inactive_elements.remove(element)
 
 class TankZombie(BaseZombie):
-    inactive_elements : list['NormalZombie'] = []
-    active_elements : list['NormalZombie'] = []
+    __slots__ = ()
+    inactive_elements : IndexedList['TankZombie'] = IndexedList()
+    active_elements : IndexedList['TankZombie'] = IndexedList()
 
     test_image : pygame.Surface = load_alpha_to_colorkey('assets/graphics/enemy/tank/main.png', [73, 197, 2])
     str_type = ZombieTypes.tank
     def __init__(self) -> None:
         super().__init__()
-        TankZombie.inactive_elements.append(self)
-    
-    @classmethod
-    def spawn(cls, new_pos : pygame.Vector2, health : int, speed : int = 3, damage : int = 1):
-        element = cls.inactive_elements[0]
-
-        element.image = cls.test_image
-        #element.mask = pygame.mask.from_surface(element.image)
-        element.rect = element.image.get_rect()
-
-        element.position = new_pos
-        element.align_rect()
-        element.zindex = 10
-
-        element.pivot = Pivot2D(element._position, element.image, (0, 0, 255))
-
-
-        element.max_hp = health
-        element.hp = health
-        element.speed = speed
-        element.damage = damage
-        
-        element.flashing = False
-        element.flash_timer = Timer(-1, core_object.game.game_timer.get_time)
-        element.og_image = None
-        element.is_dying = False
-
-
-        cls.unpool(element)
-        return element
-        
-
-    @classmethod
-    def pool(cls, element):
-        '''Transfers an element from active to inactive state. Nothing changes if the element is already inactive.'''
-        super().pool(element)
-        if element in TankZombie.active_elements:
-            TankZombie.active_elements.remove(element)
-        
-        if element not in TankZombie.inactive_elements:
-            TankZombie.inactive_elements.append(element)
     
-    @classmethod
-    def unpool(cls, element):
-        '''Transfers an element from inactive to active state. Nothing changes if the element is already active.'''
-        super().unpool(element)
-        if element not in TankZombie.active_elements:
-            TankZombie.active_elements.append(element)
-
-
-        if element in TankZombie.inactive_elements:
-            TankZombie.inactive_elements.remove(element)
 
 class RangedZombie(BaseZombie):
+    __slots__ = ('weapon', 'entry_tween')
     test_image : pygame.Surface = load_alpha_to_colorkey('assets/graphics/enemy/ranged/main.png', [0, 255, 0])
-    inactive_elements : list['RangedZombie'] = []
-    active_elements : list['RangedZombie'] = []
+    inactive_elements : IndexedList['RangedZombie'] = IndexedList()
+    active_elements : IndexedList['RangedZombie'] = IndexedList()
     str_type = ZombieTypes.ranged
+    seeks_player = False
     def __init__(self) -> None:
         super().__init__()
         self.weapon : BaseWeapon
         self.entry_tween : TweenModule.TweenChain|None
-        RangedZombie.inactive_elements.append(self)
     
-    @classmethod
-    def spawn(cls, new_pos : pygame.Vector2, health : int, speed : int = 3, damage : int = 1):
-        element = cls.inactive_elements[0]
-
-        element.image = cls.test_image
-        #element.mask = pygame.mask.from_surface(element.image)
-        element.rect = element.image.get_rect()
-
-        element.position = new_pos
-        element.align_rect()
-        element.zindex = 10
-
-        element.pivot = Pivot2D(element._position, element.image, (0, 0, 255))
-
-
-        element.max_hp = health
-        element.hp = health
-        element.speed = speed
-        
-        element.flashing = False
-        element.flash_timer = Timer(-1, core_object.game.game_timer.get_time)
-        element.og_image = None
-        element.is_dying = False
-
-
-        element.damage = damage
-        element.weapon = BaseWeapon(WeaponStats(1, 1, FiringModes.auto, 5), core_object.game.game_timer.get_time)
-        element.weapon.team = BaseProjectile.TEAMS.enemy
-        element.weapon.ready_shot_cooldown()
+    def prepare_spawn(self, new_pos : pygame.Vector2, speed : float):
+        self.weapon = BaseWeapon(WeaponStats(1, 1, FiringModes.auto, 5), core_object.game.game_timer.get_time)
+        self.weapon.team = BaseProjectile.TEAMS.enemy
+        self.weapon.ready_shot_cooldown()
         target_x : int|float = pygame.math.clamp(new_pos.x, 50, 960 - 50)
         target_y : int|float = pygame.math.clamp(new_pos.y, 50, 540 - 50)
         target_pos : pygame.Vector2 = pygame.Vector2(target_x, target_y)
@@ -482,10 +306,8 @@ class RangedZombie(BaseZombie):
         info1 = TweenModule.TweenInfo(interpolation.quad_ease_out, 1 / speed)
         goalwait = {}
         infowait = TweenModule.TweenInfo(lambda t : t, 0.35 / speed)
-        element.entry_tween = TweenModule.TweenChain(element, [(info1, goal1), (infowait, goalwait)], time_source=core_object.game.game_timer.get_time)
-        element.entry_tween.play()
-        cls.unpool(element)
-        return element
+        self.entry_tween = TweenModule.TweenChain(self, [(info1, goal1), (infowait, goalwait)], time_source=core_object.game.game_timer.get_time)
+        self.entry_tween.play()
     
     def update(self, delta: float):
         if not core_object.game.is_nm_state(): return
@@ -499,35 +321,16 @@ class RangedZombie(BaseZombie):
             if self.entry_tween.has_finished:
                 self.entry_tween = None
             return
-        bullet = self.weapon.shoot(self.position, (core_object.game.player.position - self.position).normalize())
-        if bullet: bullet.image = make_circle(4, (162, 42, 232))
+        self.weapon.shoot(self.position, (core_object.game.player.position - self.position).normalize())
         self.update_flash()
         
 
-    @classmethod
-    def pool(cls, element):
-        '''Transfers an element from active to inactive state. Nothing changes if the element is already inactive.'''
-        super().pool(element)
-        if element in RangedZombie.active_elements:
-            RangedZombie.active_elements.remove(element)
-        
-        if element not in RangedZombie.inactive_elements:
-            RangedZombie.inactive_elements.append(element)
-    
-    @classmethod
-    def unpool(cls, element):
-        '''Transfers an element from inactive to active state. Nothing changes if the element is already active.'''
-        super().unpool(element)
-        if element not in RangedZombie.active_elements:
-            RangedZombie.active_elements.append(element)
-
-
-        if element in RangedZombie.inactive_elements:
-            RangedZombie.inactive_elements.remove(element)
-    
     def clean_instance(self):
         super().clean_instance()
         self.entry_tween = None
         self.weapon = None
 
-ZombieTypes.get_dict()
\ No newline at end of file
+BaseProjectile.team_skins[BaseProjectile.TEAMS.enemy] = make_circle.shared(4, (162, 42, 232))
+ZombieTypes.get_dict()
+for zombie_class in (BaseZombie, NormalZombie, QuickZombie, TankZombie, RangedZombie):
+    zombie_class.build_skins()
\ No newline at end of file
@@ -1,8 +1,7 @@
 import pygame
-from dataclasses import dataclass
 from typing import Any
 from math import floor
-from random import shuffle, choice, choices
+from random import shuffle, choice
 import random
 from utils.ui.textsprite import TextSprite
 import utils.interpolation as interpolation
@@ -10,7 +9,9 @@ import utils.tween_module as TweenModule
 from utils.my_timer import Timer
 from game.sprite import Sprite
 from utils.helpers import average, random_float, Union, Task, make_right_arrow
+from utils.asset_manager import assets
 from utils.ui.ui_sprite import UiSprite
+from game.waves import WaveInfo, WaveTable, SpawnSchedule
 from utils.ui.brightness_overlay import BrightnessOverlay
 from utils.animation import Animation, AnimationTrack
 
@@ -24,30 +25,12 @@ class BreakObjectives:
     right_edge = 'RightWall'
     game_won = 'GameWon'
 
-@dataclass
-class WaveInfo:
-    spawn_delay : float
-    zombie_count : dict[str, int]
-
-    zombie_per_heat : int = 1
-
-    def copy(self):
-        return WaveInfo(self.spawn_delay, self.zombie_count.copy(), self.zombie_per_heat)
-    
-    def is_zombie_remaining(self) -> bool:
-        for zombie_count in self.zombie_count.values():
-            if zombie_count != 0: return True
-        return False
-
-    
-
 class Game:
     font_40 = pygame.Font('assets/fonts/Pixeltype.ttf', 40)
     font_50 = pygame.Font('assets/fonts/Pixeltype.ttf', 50)
     font_60 = pygame.Font('assets/fonts/Pixeltype.ttf', 60)
     font_70 = pygame.Font('assets/fonts/Pixeltype.ttf', 70)
-    main_music : pygame.mixer.Sound = pygame.mixer.Sound('assets/audio/main_theme.ogg')
-    main_music.set_volume(0.25)
+    main_music : pygame.mixer.Sound = assets.get_sound('assets/audio/main_theme.ogg', 0.25)
     def __init__(self) -> None:
         self.STATES : GameStates = GameStates()
 
@@ -62,23 +45,13 @@ class Game:
         self.enemies : list['BaseZombie']|None = None
 
         self.enemy_timer : Timer|None = None
-        self.diff_table : dict[int, WaveInfo] = {
-            1 : WaveInfo(1.5, {'normal' : 10}, 1),
-            2 : WaveInfo(1.35, {'normal' : 7, 'quick' : 1, 'tank' : 1, 'ranged' : 1}, 1),
-            3 : WaveInfo(1.2, {'normal' : 4, 'quick' : 3, 'tank' : 2, 'ranged' : 1}, 1),
-            4 : WaveInfo(1.1, {'normal' : 8, 'quick' : 4, 'tank' : 3, 'ranged' : 2}, 1),
-            5 : WaveInfo(1, {'normal' : 10, 'quick' : 5, 'tank' : 5, 'ranged' : 2}, 1),
-            6 : WaveInfo(0.9, {'normal' : 8, 'quick' : 6, 'tank' : 6, 'ranged' : 2}, 1),
-            7 : WaveInfo(0.8, {'normal' : 5, 'quick' : 8, 'tank' : 7, 'ranged' : 3}, 1),
-            8 : WaveInfo(0.7, {'normal' : 5, 'quick' : 10, 'tank' : 10, 'ranged' : 4}, 1),
-            9 : WaveInfo(0.6, {'normal' : 10, 'quick' : 10, 'tank' : 10, 'ranged' : 4}, 1),
-            10 : WaveInfo(0.5, {'normal' : 15, 'quick' : 15, 'tank' : 12, 'ranged' : 5}, 1),
-            11 : WaveInfo(0.5, {'normal' : 20, 'quick' : 15, 'tank' : 15, 'ranged' : 6}, 1),
-            12 : WaveInfo(0.45, {'normal' : 20, 'quick' : 15, 'tank' : 15, 'ranged' : 6}, 1),
-            13 : WaveInfo(0.4, {'normal' : 20, 'quick' : 15, 'tank' : 15, 'ranged' : 7}, 1),
-            14 : WaveInfo(0.35, {'normal' : 30, 'quick' : 25, 'tank' : 25, 'ranged' : 10}, 1),
-            15 : WaveInfo(0.3, {'normal' : 40, 'quick' : 30, 'tank' : 30, 'ranged' : 12}, 1)
-        }
+        self.wave_table : WaveTable = WaveTable()
+        #When set, every wave schedule is compiled from it instead of a random seed
+        self.wave_seed : int|None = None
+        #Endless mode: waves keep scaling past the final wave of the wave table instead of ending in a victory
+        self.endless : bool = False
+        self.spawn_schedule : SpawnSchedule|None = None
+        self.spawners : dict[str, tuple[type['BaseZombie'], dict[str, float]]] = {}
         self.current_wave : WaveInfo|None = None
         self.current_wave_num : int|None = None
         self.break_timer : Timer|None = None
@@ -101,12 +74,10 @@ class Game:
         self.game_data = {}
         self.make_connections()
 
-        self.current_wave = self.diff_table[1].copy()
-        self.current_wave_num = 1
-        self.wave_count = 1
         self.current_area = 0
         self.score = 0
-        self.enemy_timer = Timer(self.current_wave.spawn_delay, time_source=self.game_timer.get_time)
+        self.enemy_timer = Timer(-1, time_source=self.game_timer.get_time)
+        self.start_wave(1)
         self.break_timer = Timer(-1, time_source=self.game_timer.get_time)
         self.break_alerted = False
         self.break_objective = None
@@ -122,9 +93,8 @@ class Game:
         core_object.bg_manager.play(self.main_music, 1)
 
     def empty_wave(self, event : pygame.Event|None = None):
-        if self.current_wave:
-            for k in self.current_wave.zombie_count:
-                self.current_wave.zombie_count[k] = 0
+        if self.spawn_schedule:
+            self.spawn_schedule.skip()
 
         
 
@@ -147,12 +117,26 @@ class Game:
                     self.pause()
             elif event.key == pygame.K_LCTRL:
                 if core_object.IS_DEBUG: self.empty_wave(event)
+            elif event.key == pygame.K_F5:
+                if core_object.IS_DEBUG: self.toggle_endless()
+
+    def toggle_endless(self):
+        self.endless = not self.endless
+        self.alert_player('Endless mode' if self.endless else 'Endless mode off')
+
+    def start_wave(self, wave_num : int):
+        '''Compiles the spawn schedule of the wave and restarts the wave clock.'''
+        self.current_wave_num = wave_num
+        self.wave_count = wave_num
+        self.current_wave = self.wave_table.get_wave(wave_num)
+        seed : int = self.wave_seed + wave_num if self.wave_seed is not None else random.getrandbits(32)
+        self.spawn_schedule = SpawnSchedule(self.current_wave, seed, core_object.main_display.get_size())
+        self.spawners = {ztype : (ZombieTypes.convert(ztype), self.wave_table.get_spawn_kwargs(ztype, self.current_area))
+                         for ztype in self.current_wave.zombie_count}
+        self.enemy_timer.set_duration(-1)
 
     def next_wave(self):
-        self.current_wave_num += 1
-        self.wave_count = self.current_wave_num
-        self.current_wave = self.diff_table[self.current_wave_num].copy()
-        self.enemy_timer.set_duration(self.current_wave.spawn_delay)
+        self.start_wave(self.current_wave_num + 1)
         self.break_timer.set_duration(-1)
         self.break_objective = None
         self.break_alerted = False
@@ -160,6 +144,7 @@ class Game:
     
     def stop_waves(self, objective : str|None = None, break_time : float = 10):
         self.current_wave = None
+        self.spawn_schedule = None
         self.enemy_timer.set_duration(-1)
         self.break_timer.set_duration(break_time)
         self.break_objective = objective
@@ -176,16 +161,9 @@ class Game:
             self.break_logic()
     
     def active_logic(self):
-        if self.enemy_timer.isover():
-            self.enemy_timer.restart()
-            for _ in range(self.current_wave.zombie_per_heat):
-                if not self.is_zombie_remaining():
-                    break
-                zombie_type = self.get_random_zombie_type()
-                if self.current_wave.zombie_count[zombie_type] > 0: self.current_wave.zombie_count[zombie_type] -= 1
-                self.spawn_enemy(zombie_type)
-                if not self.is_zombie_remaining():
-                    break
+        schedule = self.spawn_schedule
+        for index in schedule.advance(self.enemy_timer.get_time()):
+            self.spawn_enemy(schedule.types[index], schedule.positions[index])
         if not self.is_zombie_remaining():
             self.next_wave_logic()
     
@@ -214,13 +192,13 @@ class Game:
         #print(Zombie.active_elements)
         if not self.current_wave:
             self.next_wave()
-        elif self.current_wave_num in [5, 10]:
+        elif self.wave_table.is_area_break(self.current_wave_num):
             if BaseZombie.active_elements: return
             self.stop_waves(objective=BreakObjectives.right_edge)
             arrow_image = make_right_arrow(100, 30, 'Red')
             ui_sprite = UiSprite(arrow_image, arrow_image.get_rect(midright = (955, 270)), 0, 'next_area_arrow')
             core_object.main_ui.add(ui_sprite)
-        elif self.current_wave_num == 15:
+        elif not self.endless and self.wave_table.is_final_wave(self.current_wave_num):
             if BaseZombie.active_elements: return
             self.stop_waves(objective=BreakObjectives.game_won, break_time=3)
         else:
@@ -234,55 +212,25 @@ class Game:
             if self.player.armor: self.player.armor.refill()
     
     def get_random_zombie_type(self) -> str:
+        '''Returns the type of the next scheduled zombie.'''
         if not self.current_wave: return None
         if not self.is_zombie_remaining(): return 'normal'
-        zombies_left = self.current_wave.zombie_count
-        return choices(list(zombies_left.keys()), list(zombies_left.values()))[0]
+        return self.spawn_schedule.types[self.spawn_schedule.cursor]
     
     def is_zombie_remaining(self) -> bool:
-        if not self.current_wave: return False
-        return self.current_wave.is_zombie_remaining()
+        if not self.spawn_schedule: return False
+        return not self.spawn_schedule.is_done()
 
 
-    def spawn_enemy(self, ztype : str):
-        spawn_pos : pygame.Vector2
-        buffer : int = 60
-        if random.randint(0,1):
-            spawn_pos = pygame.Vector2((-buffer, 960 + buffer)[random.randint(0,1)], random.randint(-buffer, 540 + buffer))
-        else:
-            spawn_pos = pygame.Vector2(random.randint(-buffer, 960 + buffer), (-buffer, 540 + buffer)[random.randint(0,1)])
-
-        match ztype:
-            case ZombieTypes.normal:
-                NormalZombie.spawn(spawn_pos, health=9, speed=3.5)
-            
-            case ZombieTypes.quick:
-                QuickZombie.spawn(spawn_pos, health=6, speed=5)
-            
-            case ZombieTypes.tank:
-                TankZombie.spawn(spawn_pos, health=20, speed=3, damage=2)
-            
-            case ZombieTypes.ranged:
-                RangedZombie.spawn(spawn_pos, health=8, speed=1 + (self.current_area * 0.6))
+    def spawn_enemy(self, ztype : str, spawn_pos : tuple[int, int]|None = None):
+        if spawn_pos is None:
+            spawn_pos = SpawnSchedule.get_edge_position(random, core_object.main_display.get_size(), 60)
+        zombie_class, kwargs = self.spawners.get(ztype) or (ZombieTypes.convert(ztype), self.wave_table.get_spawn_kwargs(ztype, self.current_area))
+        zombie_class.spawn(pygame.Vector2(spawn_pos), **kwargs)
     
     def on_enemy_death(self, enemy : 'BaseZombie'):
-        ztype = enemy.str_type
         wave_mult : float =  1 + (self.current_wave_num - 1) * 0.5
-        base_value : int
-        match ztype:
-            case ZombieTypes.normal:
-                base_value = 1
-
-            case ZombieTypes.quick:
-                base_value = 3
-
-            case ZombieTypes.tank:
-                base_value = 2
-            
-            case ZombieTypes.ranged:
-                base_value = 3
-
-        self.score += floor(base_value * wave_mult)
+        self.score += floor(self.wave_table.get_score(enemy.str_type) * wave_mult)
         self.update_score_sprite()
 
     def update_score_sprite(self):
@@ -419,6 +367,8 @@ class Game:
 
         self.current_wave_num = None
         self.current_wave = None
+        self.spawn_schedule = None
+        self.spawners.clear()
         self.break_timer = None
         self.break_alerted = False
         self.break_objective = None
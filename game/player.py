@@ -1,5 +1,6 @@
 import pygame
 from game.sprite import Sprite
+from utils.indexed_list import IndexedList
 from core.core import core_object
 
 from utils.animation import Animation
@@ -8,6 +9,7 @@ from utils.pivot_2d import Pivot2D
 from game.projectiles import BaseProjectile
 from game.enemy import BaseZombie
 from utils.helpers import make_upgrade_bar, reset_upgrade_bar, load_alpha_to_colorkey
+from utils.asset_manager import assets
 from utils.ui.ui_sprite import UiSprite
 from utils.my_timer import Timer
 from dataclasses import dataclass
@@ -17,9 +19,12 @@ from game.armor import ArmorBuff, ArmorBuffTypes, ArmorStats, ARMORS
 from game.armor import BaseArmor
 
 class Player(Sprite):
-    active_elements : list['Player'] = []
-    inactive_elements : list['Player'] = []
+    __slots__ = ('_zindex', 'max_hp', 'hp', 'main_heart', 'ui_healthbar', 'armor_healthbar', 'weapon', 'armor', 'shot_cooldown')
+    active_elements : IndexedList['Player'] = IndexedList()
+    inactive_elements : IndexedList['Player'] = IndexedList()
     offset = 0
+    #Replaces keyboard and mouse input when set. See PlayerController
+    controller : 'PlayerController|None' = None
     '''
     test_image : pygame.Surface = pygame.surface.Surface((50, 50))
     test_image.set_colorkey([0, 0, 255])
@@ -27,20 +32,13 @@ class Player(Sprite):
     pygame.draw.circle(test_image, "Green", (25, 25), 25)
     '''
     test_image : pygame.Surface = load_alpha_to_colorkey('assets/graphics/player/main.png', [0, 255, 0])
-    ui_heart_image : pygame.Surface = pygame.image.load("assets/graphics/ui/heart_green_colorkey.png")
-    ui_heart_image.set_colorkey([0, 255, 0])
-    ui_heart_image = pygame.transform.scale_by(ui_heart_image, 0.1)
+    ui_heart_image : pygame.Surface = assets.get_image("assets/graphics/ui/heart_green_colorkey.png", colorkey=[0, 255, 0], scale=0.1)
 
     death_anim : Animation = Animation.get_animation("player_death")
     screen_transition : Animation = Animation.get_animation("player_screen_transition")
-    hit_sound = pygame.mixer.Sound('assets/audio/hit.ogg')
-    hit_sound.set_volume(0.15)
-
-    shot_sfx = pygame.mixer.Sound('assets/audio/shot.ogg')
-    shot_sfx.set_volume(0.10)
-
-    fast_shot_sfx = pygame.mixer.Sound('assets/audio/fast_shot.ogg')
-    fast_shot_sfx.set_volume(0.10)
+    hit_sound = assets.get_sound('assets/audio/hit.ogg', 0.15)
+    shot_sfx = assets.get_sound('assets/audio/shot.ogg', 0.10)
+    fast_shot_sfx = assets.get_sound('assets/audio/fast_shot.ogg', 0.10)
 
     def __init__(self) -> None:
         super().__init__()
@@ -54,7 +52,6 @@ class Player(Sprite):
         self.armor : BaseArmor|None
 
         self.dynamic_mask = True
-        Player.inactive_elements.append(self)
 
     @classmethod
     def spawn(cls, new_pos : pygame.Vector2):
@@ -111,15 +108,24 @@ class Player(Sprite):
         self.update_healthbars()
     
     def input_action(self):
+        if self.controller:
+            if self.controller.is_firing(self) and self.weapon.stats.fire_mode == FiringModes.auto: self.shoot()
+            return
         if (pygame.key.get_pressed())[pygame.K_SPACE] or (pygame.mouse.get_pressed()[0] and core_object.game.game_timer.get_time() > 0.3): 
             if self.weapon.stats.fire_mode == FiringModes.auto:
                 self.shoot()
     
     def do_movement(self, delta : float):
-        keyboard_map = pygame.key.get_pressed()
-        move_vector : pygame.Vector2 = pygame.Vector2(0,0)
+        move_vector : pygame.Vector2 = self.controller.get_move_direction(self) if self.controller else self.get_keyboard_direction()
         speed : float = 7.0
         if self.armor: speed *= self.armor.speed_pen
+        if move_vector.magnitude() != 0: move_vector.normalize_ip()
+        self.move(move_vector, speed * delta)
+        self.clamp_rect(pygame.Rect(0,0, *core_object.main_display.get_size()))
+    
+    def get_keyboard_direction(self) -> pygame.Vector2:
+        keyboard_map = pygame.key.get_pressed()
+        move_vector : pygame.Vector2 = pygame.Vector2(0,0)
         if keyboard_map[pygame.K_a]:
             move_vector += pygame.Vector2(-1, 0)
         if keyboard_map[pygame.K_d]:
@@ -128,19 +134,22 @@ class Player(Sprite):
             move_vector += pygame.Vector2(0, 1)
         if keyboard_map[pygame.K_w]:
             move_vector += pygame.Vector2(0, -1)
-        if move_vector.magnitude() != 0: move_vector.normalize_ip()
-        self.position += move_vector * speed * delta
-        self.clamp_rect(pygame.Rect(0,0, *core_object.main_display.get_size()))
+        return move_vector
+    
+    def get_aim_position(self) -> pygame.Vector2:
+        if self.controller: return self.controller.get_aim_position(self)
+        return pygame.Vector2(pygame.mouse.get_pos())
     
     def do_collisions(self):
-        enemies : list[BaseZombie] = self.get_all_colliding(BaseZombie)
+        get_colliding = self.get_all_colliding if core_object.governor.mask_collisions else self.get_all_rect_colliding
+        enemies : list[BaseZombie] = get_colliding(BaseZombie)
         for enemy in enemies:
             if not isinstance(enemy, BaseZombie): continue
             if enemy.is_dying: continue
             enemy.kill_instance_safe()
             self.take_damage(enemy.damage)
         
-        bullets : list[BaseProjectile] = self.get_all_colliding(BaseProjectile)
+        bullets : list[BaseProjectile] = get_colliding(BaseProjectile)
         for bullet in bullets:
             if not isinstance(bullet, BaseProjectile): continue
             if not bullet.is_hostile('Friendly'): continue
@@ -167,7 +176,8 @@ class Player(Sprite):
     
     def shoot(self):
 
-        player_to_mouse_vector = pygame.Vector2(pygame.mouse.get_pos()) - self.position
+        player_to_mouse_vector = self.get_aim_position() - self.position
+        if player_to_mouse_vector.magnitude_squared() == 0: return
         shot_direction = player_to_mouse_vector.normalize()
         shot_origin = self.position
         if type(self.weapon) is BaseWeapon or type(self.weapon) is ShotgunWeapon or type(self.weapon) is PeirceWeapon:
@@ -236,6 +246,27 @@ class Player(Sprite):
 
 Sprite.register_class(Player)
 
+class PlayerController:
+    '''Drives a Player without keyboard or mouse input. Set Player.controller to an instance to use it.
+    The base controller stands still and holds the trigger towards the nearest zombie.'''
+    def get_move_direction(self, player : Player) -> pygame.Vector2:
+        return pygame.Vector2(0, 0)
+    
+    def get_aim_position(self, player : Player) -> pygame.Vector2:
+        nearest : BaseZombie|None = None
+        nearest_distance : float = float('inf')
+        for zombie in BaseZombie.active_elements:
+            if zombie.is_dying: continue
+            distance = player.position.distance_squared_to(zombie.position)
+            if distance < nearest_distance:
+                nearest = zombie
+                nearest_distance = distance
+        if nearest is None: return player.position + pygame.Vector2(1, 0)
+        return nearest.position.copy()
+    
+    def is_firing(self, player : Player) -> bool:
+        return True
+
 def make_connections():
     core_object.event_manager.bind(pygame.KEYDOWN, Player.receive_key_event)
     core_object.event_manager.bind(pygame.MOUSEBUTTONDOWN, Player.receive_mouse_event)
@@ -1,8 +1,10 @@
 import pygame
 from game.sprite import Sprite
+from utils.indexed_list import IndexedList
 from core.core import core_object
 
 from utils.pivot_2d import Pivot2D
+from utils.mask_cache import mask_cache
 import random
 
 class BulletTeams:
@@ -12,8 +14,9 @@ class BulletTeams:
         self.enemy = 'Enemy'
 
 class BaseProjectile(Sprite):
-    inactive_elements : list['BaseProjectile'] = []
-    active_elements : list['BaseProjectile'] = []
+    __slots__ = ('_zindex', 'velocity', 'team', 'damage')
+    inactive_elements : IndexedList['BaseProjectile'] = IndexedList()
+    active_elements : IndexedList['BaseProjectile'] = IndexedList()
 
     test_image : pygame.Surface = pygame.surface.Surface((8, 8))
     test_image.set_colorkey([0, 255, 0])
@@ -26,6 +29,8 @@ class BaseProjectile(Sprite):
     pygame.draw.rect(test_image2, "Red", (0, 0, 8, 8))
 
     game_area : pygame.Rect = pygame.Rect(0, 0, *core_object.main_display.get_size())
+    #Shared images used by spawn when no image is given, by team. They must not be modified
+    team_skins : dict[str, pygame.Surface] = {}
     TEAMS : BulletTeams = BulletTeams()
 
     def __init__(self) -> None:
@@ -33,48 +38,15 @@ class BaseProjectile(Sprite):
         self.velocity : pygame.Vector2
         self.team : str
         self.damage : float|int
-        BaseProjectile.inactive_elements.append(self)
-    
-    @classmethod
-    def pool(cls, element):
-        '''Transfers an element from active to inactive state. Nothing changes if the element is already inactive.'''
-        if element in BaseProjectile.active_elements:
-            BaseProjectile.active_elements.remove(element)
-        
-        if element in Sprite.active_elements:
-            Sprite.active_elements.remove(element)
-        
-        if element not in BaseProjectile.inactive_elements:
-            BaseProjectile.inactive_elements.append(element)
-
-        if element not in Sprite.inactive_elements:
-            Sprite.inactive_elements.append(element)
-    
-    @classmethod
-    def unpool(cls, element):
-        '''Transfers an element from inactive to active state. Nothing changes if the element is already active.'''
-        if element not in BaseProjectile.active_elements:
-            BaseProjectile.active_elements.append(element)
-        
-        if element not in Sprite.active_elements:
-            Sprite.active_elements.append(element)
-
-
-        if element in BaseProjectile.inactive_elements:
-            BaseProjectile.inactive_elements.remove(element)
-
-        if element in Sprite.inactive_elements:
-            Sprite.inactive_elements.remove(element)
-
     
     @classmethod
     def spawn(cls, pos : pygame.Vector2, speed : float, direction : pygame.Vector2, team : str = 'Friendly',
               damage : float|int = 1):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
         cls.unpool(element)
 
         element.image = cls.test_image
-        element.mask = pygame.mask.from_surface(element.image)
+        element.mask = mask_cache.get(element.image)
         element.rect = element.image.get_rect()
 
         element.position = pos.copy()
@@ -101,7 +73,7 @@ class BaseProjectile(Sprite):
     
     def update(self, delta: float):
         if not core_object.game.is_nm_state(): return
-        self.position += self.velocity * delta
+        self.move(self.velocity, delta)
         if not self.rect.colliderect(BaseProjectile.game_area):
             self.kill_instance_safe()
     
@@ -124,20 +96,20 @@ class BaseProjectile(Sprite):
 
 
 class NormalProjectile(BaseProjectile):
-    inactive_elements : list['NormalProjectile'] = []
-    active_elements : list['NormalProjectile'] = []
+    __slots__ = ()
+    inactive_elements : IndexedList['NormalProjectile'] = IndexedList()
+    active_elements : IndexedList['NormalProjectile'] = IndexedList()
     def __init__(self) -> None:
         super().__init__()
-        NormalProjectile.inactive_elements.append(self)
     
     @classmethod
     def spawn(cls, pos: pygame.Vector2, speed: float, direction: pygame.Vector2, team: str = 'Friendly', damage: float | int = 1, 
               image : pygame.Surface|None = None):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
         cls.unpool(element)
 
-        element.image = image or cls.test_image
-        element.mask = pygame.mask.from_surface(element.image)
+        element.image = image or cls.team_skins.get(team, cls.test_image)
+        element.mask = mask_cache.get(element.image)
         element.rect = element.image.get_rect()
 
         element.position = pos.copy()
@@ -153,43 +125,22 @@ class NormalProjectile(BaseProjectile):
         return element
         
 
-    @classmethod
-    def pool(cls, element):
-        '''Transfers an element from active to inactive state. Nothing changes if the element is already inactive.'''
-        super().pool(element)
-        if element in NormalProjectile.active_elements:
-            NormalProjectile.active_elements.remove(element)
-        
-        if element not in NormalProjectile.inactive_elements:
-            NormalProjectile.inactive_elements.append(element)
-    
-    @classmethod
-    def unpool(cls, element):
-        '''Transfers an element from inactive to active state. Nothing changes if the element is already active.'''
-        super().unpool(element)
-        if element not in NormalProjectile.active_elements:
-            NormalProjectile.active_elements.append(element)
-
-
-        if element in NormalProjectile.inactive_elements:
-            NormalProjectile.inactive_elements.remove(element)
-    
 class PeirceProjectile(BaseProjectile):
-    inactive_elements : list['PeirceProjectile'] = []
-    active_elements : list['PeirceProjectile'] = []
+    __slots__ = ('health', 'hit_memory')
+    inactive_elements : IndexedList['PeirceProjectile'] = IndexedList()
+    active_elements : IndexedList['PeirceProjectile'] = IndexedList()
     def __init__(self) -> None:
         super().__init__()
         self.health : int
         self.hit_memory : set[Sprite]
-        PeirceProjectile.inactive_elements.append(self)
     
     @classmethod
     def spawn(cls, pos: pygame.Vector2, speed: float, direction: pygame.Vector2, team: str = 'Friendly', damage: float | int = 1, hp = 99):
-        element = cls.inactive_elements[0]
+        element = cls.get_inactive()
         cls.unpool(element)
 
         element.image = cls.test_image2
-        element.mask = pygame.mask.from_surface(element.image)
+        element.mask = mask_cache.get(element.image)
         element.rect = element.image.get_rect()
 
         element.position = pos.copy()
@@ -207,27 +158,6 @@ class PeirceProjectile(BaseProjectile):
         return element
         
 
-    @classmethod
-    def pool(cls, element):
-        '''Transfers an element from active to inactive state. Nothing changes if the element is already inactive.'''
-        super().pool(element)
-        if element in PeirceProjectile.active_elements:
-            PeirceProjectile.active_elements.remove(element)
-        
-        if element not in PeirceProjectile.inactive_elements:
-            PeirceProjectile.inactive_elements.append(element)
-    
-    @classmethod
-    def unpool(cls, element):
-        '''Transfers an element from inactive to active state. Nothing changes if the element is already active.'''
-        super().unpool(element)
-        if element not in PeirceProjectile.active_elements:
-            PeirceProjectile.active_elements.append(element)
-
-
-        if element in PeirceProjectile.inactive_elements:
-            PeirceProjectile.inactive_elements.remove(element)
-    
     def clean_instance(self):
         self.health = None
         self.hit_memory = None
@@ -240,5 +170,6 @@ class PeirceProjectile(BaseProjectile):
     
 
 Sprite.register_class(BaseProjectile)
+BaseProjectile.enable_spatial_hash(64)
 Sprite.register_class(NormalProjectile)
 Sprite.register_class(PeirceProjectile)
\ No newline at end of file
@@ -3,15 +3,46 @@ from utils.animation import AnimationTrack, Animation
 from typing import Any
 from utils.helpers import is_sorted
 from utils.pivot_2d import Pivot2D
+from utils.spatial_hash import SpatialHash
+from utils.indexed_list import IndexedList
+from utils.mask_cache import mask_cache
+from utils.draw_buckets import DrawBuckets
 from inspect import isclass
+from time import perf_counter
 
 class Sprite:
     '''Base class for all game objects.'''
-    active_elements : list['Sprite'] = []
-    inactive_elements : list['Sprite']  = []
+    #The attributes read on every move live in slots. Subclasses that declare no __slots__ still get a __dict__.
+    #__weakref__ keeps fully slotted subclasses (zombies) usable as weak references, like any other object
+    __slots__ = ('_position', 'pivot', '_image', 'rect', 'mask', 'dynamic_mask', 'animation_tracks', '_zombie', '__weakref__')
+    active_elements : IndexedList['Sprite'] = IndexedList()
+    inactive_elements : IndexedList['Sprite'] = IndexedList()
     ordered_sprites : list['Sprite'] = []
     registered_classes : list['Sprite'] = []
     SPRITE_CLICKED : int = pygame.event.custom_type()
+    spatial_hash : SpatialHash|None = None
+    _spatial_hashes : tuple[SpatialHash, ...] = ()
+    #Every spatial hash, and the active sprites that are in none of them, for picking sprites under a point
+    picking_hashes : list[SpatialHash] = []
+    unindexed_elements : IndexedList['Sprite'] = IndexedList()
+    _pool_classes : tuple[type['Sprite'], ...] = ()
+    #Active sprites by zindex, for drawing. Classes that keep their own pools (like particles) stay out of it
+    draw_buckets : DrawBuckets['Sprite'] = DrawBuckets()
+    #Whether the class draws with Sprite.draw, so its elements can be batched in a single blits call
+    _plain_draw : bool = True
+    _zindex : int|None = None
+    use_fblits : bool = hasattr(pygame.Surface, 'fblits')
+    #Rect centers of the active sprites before the last fixed tick, for render interpolation
+    previous_centers : dict['Sprite', tuple[int, int]] = {}
+    #Pools start empty and grow by this many elements whenever a spawn finds no inactive element
+    POOL_CHUNK : int = 16
+    #Pool sizes that warm_up_pools builds up to in idle frames
+    pool_targets : dict[type['Sprite'], int] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._pool_classes = tuple(sprite_class for sprite_class in cls.__mro__ if 'active_elements' in sprite_class.__dict__)
+        cls._plain_draw = cls.draw is Sprite.draw
 
     def __init__(self) -> None:
         self._position : pygame.Vector2
@@ -20,9 +51,12 @@ class Sprite:
         self.rect : pygame.Rect
         self.mask : pygame.Mask
         self.dynamic_mask : bool = False
+        #Subclasses declaring _zindex in their __slots__ need it set before the class default can be read
+        self._zindex = None
         self.zindex : int
         self.animation_tracks : dict[str, AnimationTrack]
-        Sprite.inactive_elements.append(self)
+        for pool_class in self._pool_classes:
+            pool_class.inactive_elements.append(self)
         self._zombie : bool = False
     
     @property
@@ -36,10 +70,33 @@ class Sprite:
             if new_surf is None:
                 self.mask = None
             else:
-                self.mask = pygame.mask.from_surface(new_surf)
+                self.mask = mask_cache.get(new_surf)
     
     def align_rect(self):
-        self.rect.center = round(self.true_position)
+        pivot = self.pivot
+        #A pivot without offset never moves the sprite away from its origin, whatever the angle
+        if pivot is None: position = self._position
+        elif pivot.pivot_offset: position = pivot.position
+        else: position = pivot.origin
+        #Rounding the coordinates one by one does not allocate a Vector2 like round(position) does
+        self.rect.center = (round(position.x), round(position.y))
+        for spatial_hash in self._spatial_hashes:
+            spatial_hash.update(self, self.rect)
+
+    def move(self, velocity : pygame.Vector2, scale : float = 1):
+        '''Same as position += velocity * scale, without going through the position properties.
+        The position vector is updated in place, without allocating any Vector2.'''
+        pivot = self.pivot
+        position = self._position if pivot is None else pivot.origin
+        position.x += velocity.x * scale
+        position.y += velocity.y * scale
+        if pivot is not None:
+            pivot.is_cached = False
+            if pivot.pivot_offset: position = pivot.position
+        rect = self.rect
+        rect.center = (round(position.x), round(position.y))
+        for spatial_hash in self._spatial_hashes:
+            spatial_hash.update(self, rect)
     
     def move_rect(self, anchor : str, position : pygame.Vector2|int):
         self.rect.__setattr__(anchor, position)
@@ -53,48 +110,48 @@ class Sprite:
     
     @property
     def position(self) -> pygame.Vector2:
-        if not hasattr(self, 'pivot'): self.pivot = None
-        if self.pivot is None:
-            return self._position
-        else:
-            return self.pivot.origin
+        pivot = self.pivot
+        return self._position if pivot is None else pivot.origin
     
     @position.setter
     def position(self, new_val : pygame.Vector2):
-        if not hasattr(self, 'pivot'): self.pivot = None
-        if self.pivot is None:
+        pivot = self.pivot
+        if pivot is None:
             self._position = new_val
         else:
-            self.pivot.origin = new_val
-        
+            pivot.origin = new_val
         self.align_rect()
     
     @property
     def true_position(self) -> pygame.Vector2:
-        if not hasattr(self, 'pivot'): self.pivot = None
-        if self.pivot is None:
-            return self._position
-        else:
-            return self.pivot.position
+        pivot = self.pivot
+        return self._position if pivot is None else pivot.position
     
     @true_position.setter
     def true_position(self, new_val):
-        if not hasattr(self, 'pivot'): self.pivot = None
-        if self.pivot is None:
+        pivot = self.pivot
+        if pivot is None:
             self._position = new_val
         else:
-            self.pivot.position = new_val
-        
+            pivot.position = new_val
         self.align_rect()
     
+    @property
+    def zindex(self) -> int|None:
+        return self._zindex
+
+    @zindex.setter
+    def zindex(self, new_val : int|None):
+        self._zindex = new_val
+        if new_val is not None and self in Sprite.draw_buckets:
+            Sprite.draw_buckets.add(self, new_val)
+
     @property
     def angle(self) -> float:
-        if not hasattr(self, 'pivot'): self.pivot = None
         return self.pivot.angle
     
     @angle.setter
     def angle(self, new_val : float):
-        if not hasattr(self, 'pivot'): self.pivot = None
         self.pivot.angle = new_val
         self.image, self.rect, new_pos = self.pivot.rotate_og_image() if self.pivot.original_image else self.pivot.rotate_image()
         self.align_rect()
@@ -104,44 +161,80 @@ class Sprite:
         if class_to_register not in cls.registered_classes:
             cls.registered_classes.append(class_to_register)
     
+    @classmethod
+    def enable_spatial_hash(cls, cell_size : int = 64):
+        '''Indexes the active elements of the class (and its subclasses) in a SpatialHash used by the collision queries.'''
+        new_hash = SpatialHash(cell_size, cls)
+        cls.spatial_hash = new_hash
+        cls._spatial_hashes = cls._spatial_hashes + (new_hash,)
+        Sprite.picking_hashes.append(new_hash)
+    
+    @staticmethod
+    def remove_from_spatial_hashes(element : 'Sprite'):
+        for spatial_hash in element._spatial_hashes:
+            spatial_hash.remove(element)
+    
+    def get_collision_candidates(self, collision_group : 'list[Sprite]|type[Sprite]') -> list['Sprite']:
+        '''Returns the elements of collision_group that could collide with this sprite.
+        Classes with a spatial hash only return the elements sharing a cell with this sprite.'''
+        if not isclass(collision_group): return collision_group
+        spatial_hash = collision_group.spatial_hash
+        if spatial_hash is not None and spatial_hash.owner is collision_group:
+            return spatial_hash.query(self.rect)
+        return collision_group.active_elements
+    
     @property
     def active(self):
         return (self in self.__class__.active_elements) or (self in Sprite.active_elements)
 
     @classmethod
-    def pool(cls, element):
-        '''Transfers an element from active to inactive state. Nothing changes if the element is already inactive.'''
-        if element in cls.active_elements:
-            cls.active_elements.remove(element)
-        
-        if element in Sprite.active_elements:
-            Sprite.active_elements.remove(element)
-        
-        if element not in cls.inactive_elements:
-            cls.inactive_elements.append(element)
-
-        if element not in Sprite.inactive_elements:
-            Sprite.inactive_elements.append(element)
+    def pool(cls, element : 'Sprite'):
+        '''Transfers an element from active to inactive state in every class it belongs to. Nothing changes if the element is already inactive.'''
+        for pool_class in element._pool_classes:
+            pool_class.active_elements.discard(element)
+            pool_class.inactive_elements.append(element)
+        Sprite.remove_from_spatial_hashes(element)
+        Sprite.draw_buckets.remove(element)
+        if not element._spatial_hashes: Sprite.unindexed_elements.discard(element)
     
     @classmethod
-    def unpool(cls, element):
-        '''Transfers an element from inactive to active state. Nothing changes if the element is already active.'''
-
-        if element not in cls.active_elements:
-            cls.active_elements.append(element)
-        
-        if element not in Sprite.active_elements:
-            Sprite.active_elements.append(element)
-
+    def unpool(cls, element : 'Sprite'):
+        '''Transfers an element from inactive to active state in every class it belongs to. Nothing changes if the element is already active.'''
+        for pool_class in element._pool_classes:
+            pool_class.inactive_elements.discard(element)
+            pool_class.active_elements.append(element)
+        if Sprite in element._pool_classes:
+            Sprite.draw_buckets.add(element, element._zindex or 0)
+            Sprite.previous_centers.pop(element, None)
+            if not element._spatial_hashes: Sprite.unindexed_elements.append(element)
+    
+    @classmethod
+    def get_inactive(cls) -> 'Sprite':
+        '''Returns an inactive element of the class, growing the pool by POOL_CHUNK elements if there is none left.'''
+        inactive_elements = cls.inactive_elements
+        if not inactive_elements: cls.grow_pool(cls.POOL_CHUNK)
+        return inactive_elements[0]
 
-        if element in cls.inactive_elements:
-            cls.inactive_elements.remove(element)
+    @classmethod
+    def grow_pool(cls, count : int):
+        '''Constructs count new inactive elements.'''
+        for _ in range(count):
+            cls()
 
-        if element in Sprite.inactive_elements:
-            Sprite.inactive_elements.remove(element)
+    @classmethod
+    def get_pool_size(cls) -> int:
+        return len(cls.active_elements) + len(cls.inactive_elements)
 
+    @staticmethod
+    def warm_up_pools(budget : float) -> bool:
+        '''Grows the pools toward pool_targets one chunk at a time, for about budget seconds. Returns True once every target is met.'''
+        deadline = perf_counter() + budget
+        for sprite_class, target in Sprite.pool_targets.items():
+            while (missing := target - sprite_class.get_pool_size()) > 0:
+                if perf_counter() >= deadline: return False
+                sprite_class.grow_pool(min(missing, sprite_class.POOL_CHUNK))
+        return True
 
-    
     @classmethod
     def pool_elements(cls):
         '''Pools every element of the class'''
@@ -290,8 +383,7 @@ class Sprite:
         except TypeError:
             collision_groups = [collision_groups]
         for collision_group in collision_groups:
-            actual_group = collision_group.active_elements if isclass(collision_group) else collision_group
-            for element in actual_group:
+            for element in self.get_collision_candidates(collision_group):
                 if self.is_colliding(element) and not element._zombie: return element     
         return None
     
@@ -302,8 +394,7 @@ class Sprite:
         except TypeError:
             collision_groups = [collision_groups]
         for collision_group in collision_groups:
-            actual_group = collision_group.active_elements if isclass(collision_group) else collision_group
-            for element in actual_group:
+            for element in self.get_collision_candidates(collision_group):
                 if self.is_collding_rect(element) and not element._zombie: return element
         return None
     
@@ -315,8 +406,7 @@ class Sprite:
             collision_groups = [collision_groups]
         return_val = []
         for collision_group in collision_groups:
-            actual_group = collision_group.active_elements if isclass(collision_group) else collision_group
-            for element in actual_group:
+            for element in self.get_collision_candidates(collision_group):
                 if self.is_colliding(element) and not element._zombie:
                     return_val.append(element)
         return return_val
@@ -329,8 +419,7 @@ class Sprite:
             collision_groups = [collision_groups]
         return_val = []
         for collision_group in collision_groups:
-            actual_group = collision_group.active_elements if isclass(collision_group) else collision_group
-            for element in actual_group:
+            for element in self.get_collision_candidates(collision_group):
                 if self.is_collding_rect(element) and not element._zombie: return_val.append(element)
         return return_val
 
@@ -340,13 +429,59 @@ class Sprite:
     def is_active(self):
         return self in self.__class__.active_elements
     
+    @staticmethod
+    def store_previous_positions():
+        '''Remembers where the active sprites are. Called before each fixed tick.'''
+        Sprite.previous_centers = {element : element.rect.center for element in Sprite.active_elements}
+
+    @staticmethod
+    def interpolate_positions(alpha : float) -> list[tuple['Sprite', tuple[int, int]]]:
+        '''Moves the rects of the active sprites between their center before the last tick (alpha = 0) and their current one (alpha = 1).
+        Sprites spawned during the last tick stay where they are. Returns the real centers, to be put back with restore_positions after drawing.'''
+        previous_centers = Sprite.previous_centers
+        moved : list[tuple[Sprite, tuple[int, int]]] = []
+        for element in Sprite.active_elements:
+            previous = previous_centers.get(element, None)
+            if previous is None: continue
+            rect = element.rect
+            current = rect.center
+            if previous == current: continue
+            moved.append((element, current))
+            rect.center = (round(previous[0] + (current[0] - previous[0]) * alpha), round(previous[1] + (current[1] - previous[1]) * alpha))
+        return moved
+
+    @staticmethod
+    def restore_positions(moved : list[tuple['Sprite', tuple[int, int]]]):
+        for element, center in moved:
+            element.rect.center = center
+
+    @classmethod
+    def get_draw_order(cls) -> list['Sprite']:
+        '''Returns the active sprites sorted by zindex.'''
+        if cls is Sprite: return Sprite.draw_buckets.get_order()
+        return sorted(cls.active_elements, key=lambda sprite : sprite.zindex)
+
     @classmethod
-    def draw_all_sprites(cls, display):
-        #if not is_sorted(cls.active_elements, key=lambda sprite : sprite.zindex):
-        cls.active_elements.sort(key=lambda sprite : sprite.zindex)
+    def draw_all_sprites(cls, display : pygame.Surface):
+        '''Draws the active sprites by zindex. Runs of sprites using Sprite.draw are submitted in one blits call.'''
+        blit_sequence : list[tuple[pygame.Surface, pygame.Rect]] = []
         element : Sprite
-        for element in cls.active_elements:
-            element.draw(display)
+        for bucket in Sprite.draw_buckets.get_buckets():
+            for element in bucket:
+                if element._plain_draw:
+                    blit_sequence.append((element._image, element.rect))
+                    continue
+                if blit_sequence:
+                    Sprite.blit_sequence(display, blit_sequence)
+                    blit_sequence = []
+                element.draw(display)
+        if blit_sequence: Sprite.blit_sequence(display, blit_sequence)
+
+    @staticmethod
+    def blit_sequence(display : pygame.Surface, sequence : list[tuple[pygame.Surface, pygame.Rect]]):
+        '''Surface.fblits skips building the list of changed rects, it is used when pygame provides it.'''
+        if Sprite.use_fblits: display.fblits(sequence)
+        else: display.blits(sequence, doreturn=False)
 
     
     @classmethod
@@ -356,14 +491,28 @@ class Sprite:
                 return sprite_class
         return None
     
+    @staticmethod
+    def pick(pos : tuple[int, int]) -> list['Sprite']:
+        '''Returns the active sprites whose rect contains pos, from the lowest zindex to the highest.
+        Sprites in a spatial hash are only looked up in the cell under pos.
+        Used for the SPRITE_CLICKED events, which are only posted while an action is bound to them.'''
+        point = pygame.Rect(pos, (1, 1))
+        hit : dict[Sprite, None] = {}
+        for spatial_hash in Sprite.picking_hashes:
+            for sprite in spatial_hash.query(point):
+                if sprite.rect.collidepoint(pos): hit[sprite] = None
+        for sprite in Sprite.unindexed_elements:
+            if sprite.rect.collidepoint(pos): hit[sprite] = None
+        return sorted(hit, key = lambda sprite : sprite._zindex or 0)
+
     @classmethod
     def handle_mouse_event(cls, event : pygame.Event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.touch: return
+            if not core_object.event_manager.is_bound(Sprite.SPRITE_CLICKED): return
             press_pos : tuple = event.pos
-            hit = [sprite for sprite in Sprite.active_elements if sprite.rect.collidepoint(press_pos)]
+            hit = Sprite.pick(press_pos)
             if len(hit) == 0: return
-            hit.sort(key = lambda sprite : sprite.zindex)
             new_event = pygame.event.Event(Sprite.SPRITE_CLICKED, {'main_hit' : hit[-1], 'all_hit' : hit, 'pos' : press_pos,
                                                                    'finger_id' : -1})
             pygame.event.post(new_event)
@@ -371,12 +520,12 @@ class Sprite:
     @classmethod
     def handle_touch_event(cls, event : pygame.Event):
         if event.type == pygame.FINGERDOWN:
+            if not core_object.event_manager.is_bound(Sprite.SPRITE_CLICKED): return
             x = event.x * core_object.main_display.get_width()
             y = event.y * core_object.main_display.get_height()
             press_pos : tuple[int, int] = (round(x), round(y))
-            hit = [sprite for sprite in Sprite.active_elements if sprite.rect.collidepoint(press_pos)]
+            hit = Sprite.pick(press_pos)
             if len(hit) == 0: return
-            hit.sort(key = lambda sprite : sprite.zindex)
             new_event = pygame.event.Event(Sprite.SPRITE_CLICKED, {'main_hit' : hit[-1], 'all_hit' : hit, 'pos' : press_pos,
                                                                    'finger_id' : event.finger_id})
             pygame.event.post(new_event)
@@ -385,4 +534,6 @@ class Sprite:
     def _core_hint(cls):
         global core_object
         from core.core import core_object
-            
\ No newline at end of file
+            
+
+Sprite._pool_classes = (Sprite,)
\ No newline at end of file
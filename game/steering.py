@@ -0,0 +1,105 @@
+import pygame
+from math import gcd
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class SteeringBatch:
+    '''Keeps the positions of seeking sprites in contiguous arrays and moves them all in one vectorized pass.
+    While a sprite is in the batch, its position and rect are owned by the batch. Sprites in the batch must not have a pivot,
+    and their rect must keep the size it had when they were added. Their speed attribute is read on every step.'''
+    def __init__(self, capacity : int = 64) -> None:
+        self.sprites : list['Sprite'] = []
+        self.slots : dict['Sprite', int] = {}
+        self.positions = numpy.zeros((capacity, 2), dtype=numpy.float64)
+        self.sizes = numpy.zeros((capacity, 2), dtype=numpy.int64)
+        #Cells covered by each rect on a grid of cell_size, the gcd of the cell sizes of every spatial hash of the sprites.
+        #A rect that stays in the same cells of that grid stays in the same cells of every hash, so the hashes are left alone
+        self.spans = numpy.zeros((capacity, 4), dtype=numpy.int64)
+        self.cell_size : int = 0
+
+    @staticmethod
+    def is_available() -> bool:
+        return numpy is not None
+
+    def __len__(self) -> int:
+        return len(self.sprites)
+
+    def __contains__(self, sprite : 'Sprite') -> bool:
+        return sprite in self.slots
+
+    def add(self, sprite : 'Sprite'):
+        '''Starts steering the sprite from its current position. Nothing changes if the sprite is already in the batch.'''
+        if sprite in self.slots: return
+        slot = len(self.sprites)
+        if slot >= len(self.positions):
+            self.positions = numpy.concatenate((self.positions, numpy.zeros_like(self.positions)))
+            self.sizes = numpy.concatenate((self.sizes, numpy.zeros_like(self.sizes)))
+            self.spans = numpy.concatenate((self.spans, numpy.zeros_like(self.spans)))
+        position = sprite.position
+        self.positions[slot] = (position.x, position.y)
+        self.sizes[slot] = sprite.rect.size
+        self.slots[sprite] = slot
+        self.sprites.append(sprite)
+        cell_size = self.cell_size
+        for spatial_hash in sprite._spatial_hashes:
+            cell_size = gcd(cell_size, spatial_hash.cell_size)
+        if cell_size != self.cell_size:
+            self.cell_size = cell_size
+            self.spans[:slot + 1] = self.get_spans(numpy.array([sprite.rect.center for sprite in self.sprites]), self.sizes[:slot + 1])
+        else:
+            self.spans[slot] = self.get_spans(numpy.array([sprite.rect.center]), self.sizes[slot:slot + 1])
+
+    def remove(self, sprite : 'Sprite'):
+        '''Stops steering the sprite. The last sprite of the batch takes its slot.'''
+        slot = self.slots.pop(sprite, None)
+        if slot is None: return
+        last_slot = len(self.sprites) - 1
+        last = self.sprites.pop()
+        if slot != last_slot:
+            self.sprites[slot] = last
+            self.slots[last] = slot
+            self.positions[slot] = self.positions[last_slot]
+            self.sizes[slot] = self.sizes[last_slot]
+            self.spans[slot] = self.spans[last_slot]
+
+    def clear(self):
+        self.sprites.clear()
+        self.slots.clear()
+
+    def get_spans(self, centers, sizes):
+        '''Returns the first and last cells covered by rects of the given centers and sizes, like SpatialHash.get_span.'''
+        cell_size = self.cell_size or 1
+        topleft = centers - sizes // 2
+        return numpy.concatenate((topleft // cell_size, (topleft + sizes - 1) // cell_size), axis=1)
+
+    def step(self, target : pygame.Vector2, delta : float):
+        '''Moves every sprite towards target, then writes the new positions and rects back.
+        Spatial hashes are only updated for sprites that changed cells.'''
+        sprites = self.sprites
+        count = len(sprites)
+        if count == 0: return
+        #Speeds change during the game (slows, tweens), so they are not kept in the batch
+        speeds = numpy.array([sprite.speed for sprite in sprites], dtype=numpy.float64)
+        positions = self.positions[:count]
+        offsets = numpy.array((target.x, target.y)) - positions
+        lengths = numpy.hypot(offsets[:, 0], offsets[:, 1])
+        lengths[lengths == 0] = 1
+        positions += offsets * (speeds * delta / lengths)[:, None]
+        #numpy.rint rounds halves to even, like round(float) in Sprite.align_rect
+        centers = numpy.rint(positions).astype(numpy.int64)
+
+        for sprite, (x, y), center in zip(sprites, positions.tolist(), centers.tolist()):
+            sprite.position.update(x, y)
+            sprite.rect.center = center
+
+        if not self.cell_size: return
+        spans = self.get_spans(centers, self.sizes[:count])
+        changed = numpy.flatnonzero((spans != self.spans[:count]).any(axis=1))
+        if len(changed) == 0: return
+        self.spans[changed] = spans[changed]
+        for index in changed.tolist():
+            sprite = sprites[index]
+            for spatial_hash in sprite._spatial_hashes:
+                spatial_hash.update(sprite, sprite.rect)
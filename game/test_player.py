@@ -1,5 +1,6 @@
 import pygame
 from game.sprite import Sprite
+from utils.indexed_list import IndexedList
 from core.core import core_object
 
 from utils.animation import Animation
@@ -7,10 +8,11 @@ from utils.pivot_2d import Pivot2D
 
 
 class TestPlayer(Sprite):
+    __slots__ = ('_zindex', 'color_images', 'color_image_list')
     IMAGE_SIZE : tuple[int, int]|list[int] = (20, 60)
     test_anim : Animation = Animation.get_animation("test")
-    active_elements : list['TestPlayer'] = []
-    inactive_elements : list['TestPlayer'] = []
+    active_elements : IndexedList['TestPlayer'] = IndexedList()
+    inactive_elements : IndexedList['TestPlayer'] = IndexedList()
     #load assets
     test_image : pygame.Surface = pygame.surface.Surface(IMAGE_SIZE)
     pygame.draw.rect(test_image, "Red", (0,0, *IMAGE_SIZE))
@@ -23,12 +25,13 @@ class TestPlayer(Sprite):
         pygame.draw.rect(image, color, (0,0, *IMAGE_SIZE))
         surfaces[color] = image
         surface_list.append(image)
+    #The loop variable would shadow the Sprite.image property
+    del image, color
 
     def __init__(self) -> None:
         super().__init__()
         self.color_images : dict[str, pygame.Surface]
         self.color_image_list : list[pygame.Surface]
-        TestPlayer.inactive_elements.append(self)
 
     @classmethod
     def spawn(cls, new_pos : pygame.Vector2):
@@ -67,7 +70,7 @@ class TestPlayer(Sprite):
         if keyboard_map[pygame.K_q]:
             self.angle -= 5 * delta
         if move_vector.magnitude(): move_vector.normalize()
-        self.position += move_vector * speed * delta
+        self.move(move_vector, speed * delta)
         self.clamp_rect(pygame.Rect(0,0, *core_object.main_display.get_size()))
     
     def clean_instance(self):
@@ -0,0 +1,111 @@
+import json
+import random
+from dataclasses import dataclass
+from math import ceil
+
+@dataclass
+class WaveInfo:
+    spawn_delay : float
+    zombie_count : dict[str, int]
+
+    zombie_per_heat : int = 1
+
+    def copy(self):
+        return WaveInfo(self.spawn_delay, self.zombie_count.copy(), self.zombie_per_heat)
+
+    def is_zombie_remaining(self) -> bool:
+        for zombie_count in self.zombie_count.values():
+            if zombie_count != 0: return True
+        return False
+
+    def get_total(self) -> int:
+        return sum(self.zombie_count.values())
+
+class SpawnSchedule:
+    '''Every spawn of a wave, compiled once when the wave starts: spawn times (seconds since the start of the wave),
+    zombie types and edge positions, in spawn order. Spawning during the wave only moves a cursor forward.'''
+    __slots__ = ('times', 'types', 'positions', 'cursor', 'seed')
+    def __init__(self, wave : WaveInfo, seed : int, bounds : tuple[int, int] = (960, 540), buffer : int = 60) -> None:
+        rng = random.Random(seed)
+        #Drawing weighted by the zombies left, like the old random.choices per spawn, is the same as a shuffle
+        self.types : list[str] = [ztype for ztype, count in wave.zombie_count.items() for _ in range(count)]
+        rng.shuffle(self.types)
+        per_heat : int = max(1, wave.zombie_per_heat)
+        self.times : list[float] = [(index // per_heat + 1) * wave.spawn_delay for index in range(len(self.types))]
+        self.positions : list[tuple[int, int]] = [SpawnSchedule.get_edge_position(rng, bounds, buffer) for _ in self.types]
+        self.cursor : int = 0
+        self.seed : int = seed
+
+    @staticmethod
+    def get_edge_position(rng : random.Random, bounds : tuple[int, int], buffer : int) -> tuple[int, int]:
+        '''Returns a random point on a rectangle buffer pixels outside of bounds.'''
+        width, height = bounds
+        if rng.randint(0, 1):
+            return ((-buffer, width + buffer)[rng.randint(0, 1)], rng.randint(-buffer, height + buffer))
+        return (rng.randint(-buffer, width + buffer), (-buffer, height + buffer)[rng.randint(0, 1)])
+
+    def advance(self, elapsed : float) -> range|tuple:
+        '''Moves the cursor past every spawn due by elapsed and returns the indexes of those spawns.'''
+        start = end = self.cursor
+        times = self.times
+        count = len(times)
+        if end >= count or times[end] > elapsed: return ()
+        while end < count and times[end] <= elapsed:
+            end += 1
+        self.cursor = end
+        return range(start, end)
+
+    def skip(self):
+        self.cursor = len(self.types)
+
+    def is_done(self) -> bool:
+        return self.cursor >= len(self.types)
+
+    def get_remaining(self) -> int:
+        return len(self.types) - self.cursor
+
+class WaveTable:
+    '''The waves, zombie stats and area breaks loaded from a data file.
+    Waves past the last defined one are extrapolated from it with the scaling settings of the file.'''
+    def __init__(self, path : str = 'assets/data/waves.json') -> None:
+        with open(path, 'r') as file:
+            data : dict = json.load(file)
+        self.zombies : dict[str, dict[str, float]] = data['zombies']
+        self.defined_waves : int = len(data['waves'])
+        self.waves : dict[int, WaveInfo] = {index + 1 : WaveInfo(wave['spawn_delay'], wave['zombie_count'], wave.get('zombie_per_heat', 1))
+                                            for index, wave in enumerate(data['waves'])}
+        self.area_breaks : list[int] = data.get('area_breaks', [])
+        self.final_wave : int|None = data.get('final_wave', None)
+        self.scaling : dict[str, float] = data.get('scaling', {})
+
+    def get_wave(self, wave_num : int) -> WaveInfo:
+        '''Returns a copy of the wave, scaling the last defined wave for waves past it.'''
+        if wave_num not in self.waves:
+            self.waves[wave_num] = self.scale_wave(wave_num)
+        return self.waves[wave_num].copy()
+
+    def scale_wave(self, wave_num : int) -> WaveInfo:
+        last : WaveInfo = self.waves[self.defined_waves]
+        steps : int = wave_num - self.defined_waves
+        scaling = self.scaling
+        spawn_delay : float = max(scaling.get('min_spawn_delay', 0.1), last.spawn_delay * scaling.get('spawn_delay_mult', 1) ** steps)
+        count_mult : float = scaling.get('zombie_count_mult', 1) ** steps
+        zombie_count : dict[str, int] = {ztype : ceil(count * count_mult) for ztype, count in last.zombie_count.items()}
+        extra_heat : int = steps // scaling['waves_per_extra_heat'] if scaling.get('waves_per_extra_heat', 0) > 0 else 0
+        return WaveInfo(spawn_delay, zombie_count, last.zombie_per_heat + extra_heat)
+
+    def is_area_break(self, wave_num : int) -> bool:
+        return wave_num in self.area_breaks
+
+    def is_final_wave(self, wave_num : int) -> bool:
+        return self.final_wave is not None and wave_num >= self.final_wave
+
+    def get_spawn_kwargs(self, ztype : str, area : int) -> dict[str, float]:
+        '''Returns the keyword arguments the zombie type spawns with in the given area.'''
+        stats = self.zombies[ztype]
+        kwargs = {'health' : stats['health'], 'speed' : stats['speed'] + stats.get('speed_per_area', 0) * area}
+        if 'damage' in stats: kwargs['damage'] = stats['damage']
+        return kwargs
+
+    def get_score(self, ztype : str) -> int:
+        return self.zombies[ztype]['score']
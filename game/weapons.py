@@ -18,11 +18,14 @@ class BaseWeapon:
         self.stats : WeaponStats = stats
         self.unique_name : str|None = name
         self.team : str = BaseProjectile.TEAMS.friendly
+        #Shared image for the projectiles, the team skin of the projectile class is used when None
+        self.skin : pygame.Surface|None = None
         self.shot_cooldown : Timer = Timer(self.stats.firerate, time_source)
     
     def copy(self) -> 'BaseWeapon':
         weapon = BaseWeapon(self.stats.copy_base(), self.shot_cooldown.time_source, self.unique_name)
         weapon.team = self.team
+        weapon.skin = self.skin
         return weapon
     
     def get_game_source(self):
@@ -36,7 +39,7 @@ class BaseWeapon:
     
     def shoot(self, shot_origin : pygame.Vector2, shot_direction : pygame.Vector2) -> BaseProjectile|None:
         if not self.shot_cooldown.isover(): return None
-        boolet = NormalProjectile.spawn(shot_origin, self.stats.projectile_speed, shot_direction, self.team, self.stats.damage)
+        boolet = NormalProjectile.spawn(shot_origin, self.stats.projectile_speed, shot_direction, self.team, self.stats.damage, self.skin)
         self.reset_shot_cooldown()
         return boolet
 
@@ -51,7 +54,7 @@ class ShotgunWeapon(BaseWeapon):
         angles : list[float] = [pygame.math.lerp(-self.bullet_spread, self.bullet_spread, i / (self.pellet_count - 1)) for i in range(self.pellet_count)]
         boolets : list[BaseProjectile] = []
         for angle in angles:
-            boolet = NormalProjectile.spawn(shot_origin, self.stats.projectile_speed, shot_direction.rotate(angle), self.team, self.stats.damage)
+            boolet = NormalProjectile.spawn(shot_origin, self.stats.projectile_speed, shot_direction.rotate(angle), self.team, self.stats.damage, self.skin)
             boolets.append(boolet)
         self.reset_shot_cooldown()
         return boolets
@@ -1,3 +1,5 @@
+from time import perf_counter
+STARTUP_TIME : float = perf_counter()
 import pygame
 import asyncio
 
@@ -12,6 +14,10 @@ window = pygame.display.set_mode(window_size)
 
 pygame.mixer.set_num_channels(48)
 
+from core.profiler import StartupReport
+startup_report = StartupReport(STARTUP_TIME)
+startup_report.mark('display')
+
 from core.core import Core, core_object
 
 core = core_object
@@ -21,6 +27,7 @@ if core.is_web(): core.setup_web(1)
 
 
 pygame.display.set_caption(GAME_TITLE)
+startup_report.mark('core')
 
 from game.sprite import Sprite
 Sprite._core_hint()
@@ -42,25 +49,24 @@ from game.projectiles import BaseProjectile, PeirceProjectile, NormalProjectile
 from game.enemy import BaseZombie, NormalZombie, QuickZombie, TankZombie, RangedZombie
 from game.background import Background
 
+startup_report.mark('modules')
+
 TestPlayer()
 Player()
 Background()
-for _ in range(99):
-    NormalProjectile()
-    PeirceProjectile()
-
-for _ in range(90):
-    NormalZombie()
-    QuickZombie()
-    TankZombie()
-    RangedZombie()
-core.settings.set_defualt({'Brightness' : 0})
+#The other pools grow on demand, and up to these sizes in idle menu frames
+Sprite.pool_targets.update({NormalProjectile : 100, PeirceProjectile : 100,
+                            NormalZombie : 90, QuickZombie : 90, TankZombie : 90, RangedZombie : 90})
+POOL_WARM_UP_BUDGET : float = 0.002
+startup_report.mark('pools')
+core.settings.set_defualt({'Brightness' : 0, 'Endless' : False})
 core.settings.load()
 
 core.set_brightness(core.settings.info['Brightness'])
 
 core.menu.init()
 core.game.init()
+if core.BATCHED_STEERING: BaseZombie.enable_batched_steering()
 
 clock = pygame.Clock()
 font_40 = pygame.font.Font('assets/fonts/Pixeltype.ttf', 40)
@@ -71,6 +77,7 @@ def start_game(event : pygame.Event):
     if event.type != core.START_GAME: return
     
     core.menu.prepare_exit()
+    core.game.endless = core.settings.info['Endless']
     core.game.start_game()
 
     core_object.event_manager.bind(pygame.MOUSEBUTTONDOWN, Sprite.handle_mouse_event)
@@ -126,7 +133,10 @@ core.menu.add_connections()
 core.menu.update_highscores_stage1()
 core.event_manager.bind(core.START_GAME, start_game)
 core.event_manager.bind(core.END_GAME, end_game)
+#From here on, event types nothing is bound to are dropped by pygame instead of being queued
+core.event_manager.enable_filtering()
 core.bg_manager.play(core.menu.main_theme, 1)
+startup_report.mark('menu')
 def setup_debug_sprites():
     global fps_sprite
     global debug_sprite
@@ -144,35 +154,94 @@ cycle_timer = Timer(0.1, core_object.global_timer.get_time)
 
 setup_debug_sprites()
 
+def simulate(delta : float):
+    profiler = core.profiler
+    Sprite.update_all_sprites(delta)
+    profiler.mark('sprites')
+    Sprite.update_all_registered_classes(delta)
+    profiler.mark('classes')
+    ParticleEffect.update_particles(delta, window.get_rect())
+    profiler.mark('particles')
+    core.game.main_logic(delta)
+    profiler.mark('logic')
+
 async def main():
+    profiler = core.profiler
+    pools_warm : bool = False
+    first_frame : bool = True
     while 1:
         core.update_dt(60)
+        core.snapshot_clocks()
+        profiler.begin_frame()
+        core.governor.begin_frame()
         for event in pygame.event.get():
             core.event_manager.process_event(event)
+        profiler.mark('events')
 
+        dirty_rendering : bool = False
         if core.game.active == False:
             window.fill(core.menu.bg_color)
             core.menu.update(core.dt)
             core.menu.render(window)
+            core.renderer.request_full_redraw()
+            core.reset_fixed_step()
+            if not pools_warm: pools_warm = Sprite.warm_up_pools(POOL_WARM_UP_BUDGET)
+            profiler.mark('menu')
         else:
-            if core.game.state != core.game.STATES.paused:
-                Sprite.update_all_sprites(core.dt)
-                Sprite.update_all_registered_classes(core.dt)
-                core.game.main_logic(core.dt)
-
-            window.fill((94,129,162))    
-            Sprite.draw_all_sprites(window)
-            core.main_ui.update()
-            core.main_ui.render(window)
+            if core.game.state == core.game.STATES.paused:
+                core.reset_fixed_step()
+            elif core.FIXED_TIMESTEP:
+                for _ in range(core.update_fixed_step()):
+                    Sprite.store_previous_positions()
+                    simulate(core.tick_dt)
+                    if not core.game.active or core.game.state == core.game.STATES.paused: break
+            else:
+                simulate(core.dt)
+            moved = Sprite.interpolate_positions(core.alpha) if core.FIXED_TIMESTEP else None
+
+            #Particles are not tracked by the dirty renderer, frames showing particles are fully redrawn
+            if core.DIRTY_RENDERING and not ParticleEffect.has_particles():
+                dirty_rendering = True
+                core.main_ui.update()
+                brightness = core.get_brightness_pass()
+                overlay_rect = profiler.get_overlay_rect()
+                core.renderer.render(window, Sprite.get_draw_order(), core.main_ui.get_draw_order(), brightness, [overlay_rect] if overlay_rect else None)
+                profiler.mark('draw')
+            else:
+                core.renderer.request_full_redraw()
+                window.fill((94,129,162))    
+                Sprite.draw_all_sprites(window)
+                ParticleEffect.draw_particles(window)
+                profiler.mark('draw')
+                core.main_ui.update()
+                core.main_ui.render(window)
+                profiler.mark('ui')
+            if moved: Sprite.restore_positions(moved)
 
         core.update()
         if cycle_timer.isover(): 
             fps_sprite.text = f'FPS : {core.get_fps():0.0f}'
             cycle_timer.restart()
-        if core.settings.info['Brightness'] != 0:
-            window.blit(core.brightness_map, (0,0), special_flags=core.brightness_map_blend_mode)
+        profiler.mark('core')
+        brightness_pass = core.get_brightness_pass()
+        if brightness_pass and not dirty_rendering:
+            window.fill(brightness_pass[0], special_flags=brightness_pass[1])
+            profiler.mark('brightness')
+        profiler.draw(window)
+        profiler.mark('overlay')
             
-        pygame.display.update()
+        if dirty_rendering and not core.renderer.full_redraw:
+            pygame.display.update(core.dirty_display_rects)
+        else:
+            pygame.display.update()
+        profiler.mark('display')
+        if first_frame:
+            first_frame = False
+            startup_report.mark('first frame')
+            #Same rule as the frame trace: debug builds only, and no file system to write to on the web
+            if core.IS_DEBUG and not core.is_web(): startup_report.dump()
+        profiler.end_frame()
+        core.governor.end_frame()
         core.frame_counter += 1
         clock.tick(core.FPS)
         await asyncio.sleep(0)
@@ -0,0 +1,7 @@
+import os
+import sys
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+#Data files are loaded from paths relative to the project root
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,35 @@
+from utils.clustering import find_clusters
+
+def test_no_cluster_under_min_count():
+    assert find_clusters([(0, 0), (5, 0)], 10, 3) == {}
+    assert find_clusters([], 10, 1) == {}
+
+def test_single_cluster():
+    positions = [(0, 0), (3, 0), (0, 4), (500, 500)]
+    assert find_clusters(positions, 10, 3) == {(0, 0) : 3}
+
+def test_radius_is_inclusive():
+    assert find_clusters([(0, 0), (10, 0)], 10, 2) == {(0, 0) : 2}
+    assert find_clusters([(0, 0), (10.01, 0)], 10, 2) == {}
+
+def test_separate_clusters():
+    positions = [(0, 0), (1, 0), (2, 0), (300, 300), (301, 300), (302, 300)]
+    clusters = find_clusters(positions, 10, 3)
+    assert clusters == {(0, 0) : 3, (300, 300) : 3}
+
+def test_close_starts_are_merged():
+    #(0, 0) and (4, 0) both start clusters and are less than radius apart
+    positions = [(0, 0), (4, 0), (8, 0), (12, 0)]
+    clusters = find_clusters(positions, 10, 3)
+    assert len(clusters) == 1
+    (center, size), = clusters.items()
+    assert center == (2, 0)
+    assert size == 4
+
+def test_group_sizes_of_distant_groups():
+    sizes = [3, 5, 8]
+    positions = [(group * 400 + index % 3 * 2, index // 3 * 2) for group, size in enumerate(sizes) for index in range(size)]
+    clusters = find_clusters(positions, 10, 3)
+    assert sorted(clusters.values()) == sizes
+    for center in clusters:
+        assert any(abs(center[0] - group * 400) < 10 for group in range(len(sizes)))
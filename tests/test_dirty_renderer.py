@@ -0,0 +1,32 @@
+import pygame
+from core.dirty_renderer import DirtyRenderer
+
+BOUNDS : pygame.Rect = pygame.Rect(0, 0, 960, 540)
+
+def test_overlapping_rects_are_unioned():
+    merged = DirtyRenderer.merge_rects([pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 5, 10, 10)], BOUNDS)
+    assert merged == [pygame.Rect(0, 0, 15, 15)]
+
+def test_union_chains_through_merged_rects():
+    #The third rect only touches the union of the first two
+    rects = [pygame.Rect(0, 0, 10, 10), pygame.Rect(100, 100, 10, 10), pygame.Rect(8, 8, 95, 95)]
+    assert DirtyRenderer.merge_rects(rects, BOUNDS) == [pygame.Rect(0, 0, 110, 110)]
+
+def test_disjoint_rects_are_kept():
+    rects = [pygame.Rect(0, 0, 10, 10), pygame.Rect(10, 0, 10, 10), pygame.Rect(50, 50, 5, 5)]
+    assert DirtyRenderer.merge_rects(rects, BOUNDS) == rects
+
+def test_rects_are_clipped_and_empty_ones_dropped():
+    rects = [pygame.Rect(-20, -20, 30, 30), pygame.Rect(2000, 0, 10, 10), pygame.Rect(10, 10, 0, 5)]
+    assert DirtyRenderer.merge_rects(rects, BOUNDS) == [pygame.Rect(0, 0, 10, 10)]
+
+def test_input_is_not_modified_and_output_does_not_overlap():
+    rects = [pygame.Rect(x * 7 % 900, x * 13 % 500, 40, 30) for x in range(60)]
+    copies = [rect.copy() for rect in rects]
+    merged = DirtyRenderer.merge_rects(rects, BOUNDS)
+    assert rects == copies
+    for index, rect in enumerate(merged):
+        assert rect.collidelist(merged[index + 1:]) == -1
+        assert BOUNDS.contains(rect)
+    for rect in rects:
+        assert any(other.contains(rect) for other in merged)
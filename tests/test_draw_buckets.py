@@ -0,0 +1,41 @@
+from utils.draw_buckets import DrawBuckets
+
+def test_order_follows_zindex():
+    buckets : DrawBuckets[str] = DrawBuckets()
+    buckets.add('top', 10)
+    buckets.add('bottom', -1)
+    buckets.add('middle', 0)
+    assert buckets.get_order() == ['bottom', 'middle', 'top']
+    assert buckets.keys == [-1, 0, 10]
+
+def test_add_moves_element_to_new_zindex():
+    buckets : DrawBuckets[str] = DrawBuckets()
+    buckets.add('a', 0)
+    buckets.add('b', 1)
+    buckets.add('a', 2)
+    assert buckets.get_order() == ['b', 'a']
+    assert buckets.keys == [1, 2]
+    assert len(buckets) == 2
+
+def test_order_is_cached_until_changed():
+    buckets : DrawBuckets[str] = DrawBuckets()
+    buckets.add('a', 0)
+    order = buckets.get_order()
+    assert buckets.get_order() is order
+    buckets.add('a', 0)
+    assert buckets.get_order() is order
+    buckets.add('b', 0)
+    assert buckets.get_order() is not order
+    assert sorted(buckets.get_order()) == ['a', 'b']
+
+def test_remove_drops_empty_buckets():
+    buckets : DrawBuckets[str] = DrawBuckets()
+    buckets.add('a', 0)
+    buckets.add('b', 5)
+    buckets.remove('a')
+    buckets.remove('missing')
+    assert 'a' not in buckets
+    assert buckets.keys == [5] and list(buckets.buckets) == [5]
+    assert buckets.get_order() == ['b']
+    buckets.clear()
+    assert len(buckets) == 0 and buckets.get_order() == []
@@ -0,0 +1,66 @@
+from core.governor import QualityGovernor
+
+def feed(governor : QualityGovernor, frame_time : float, frames : int):
+    for _ in range(frames):
+        governor.add_sample(frame_time)
+
+def test_features_are_on_by_default():
+    governor = QualityGovernor(10)
+    assert governor.level == 0 and governor.get_shed() == []
+    assert all(getattr(governor, feature) for feature in QualityGovernor.SHED_ORDER)
+
+def test_sheds_one_feature_per_shed_frames():
+    governor = QualityGovernor(10)
+    governor.enable()
+    #The average needs a few frames to rise over the budget
+    feed(governor, 25, 10)
+    assert governor.level == 0
+    feed(governor, 25, governor.shed_frames * 2)
+    assert governor.get_shed() == ['cluster_labels', 'particles']
+    assert not governor.particles and governor.hit_flash
+
+def test_level_stops_at_the_last_feature():
+    governor = QualityGovernor(10)
+    feed(governor, 100, governor.shed_frames * 20)
+    assert governor.level == len(QualityGovernor.SHED_ORDER)
+    assert not any(getattr(governor, feature) for feature in QualityGovernor.SHED_ORDER)
+
+def test_restores_only_well_under_budget():
+    governor = QualityGovernor(10)
+    feed(governor, 25, governor.shed_frames * 3)
+    #Let the average settle under the budget, it can shed once more on the way down
+    feed(governor, 8, 60)
+    level = governor.level
+    assert level >= 3
+    feed(governor, 8, governor.restore_frames * 5)
+    assert governor.level == level
+    feed(governor, 1, governor.restore_frames + 40)
+    assert governor.level == level - 1
+
+def test_on_change_and_set_level():
+    changes : list[int] = []
+    governor = QualityGovernor(10, lambda governor : changes.append(governor.level))
+    governor.set_level(2)
+    governor.set_level(2)
+    governor.set_level(99)
+    governor.set_level(-5)
+    assert changes == [2, len(QualityGovernor.SHED_ORDER), 0]
+
+def test_disable_restores_everything():
+    governor = QualityGovernor(10)
+    governor.enable(5)
+    assert governor.budget == 5
+    governor.set_level(4)
+    governor.disable()
+    assert not governor.enabled and governor.level == 0
+    assert all(getattr(governor, feature) for feature in QualityGovernor.SHED_ORDER)
+
+def test_frames_are_only_timed_while_enabled():
+    governor = QualityGovernor(10)
+    governor.begin_frame()
+    governor.end_frame()
+    assert governor.average == 0
+    governor.enable()
+    governor.begin_frame()
+    governor.end_frame()
+    assert governor.average > 0
@@ -0,0 +1,50 @@
+import pytest
+from utils.indexed_list import IndexedList
+
+def check_slots(indexed : IndexedList):
+    assert len(indexed.slots) == len(indexed.elements)
+    for slot, element in enumerate(indexed.elements):
+        assert indexed.index(element) == slot
+
+def test_append_ignores_duplicates():
+    indexed = IndexedList(['a', 'b', 'a'])
+    indexed.append('b')
+    assert list(indexed) == ['a', 'b']
+    assert len(indexed) == 2
+    check_slots(indexed)
+
+def test_discard_moves_last_element_into_slot():
+    indexed = IndexedList(['a', 'b', 'c', 'd'])
+    assert indexed.discard('b')
+    assert list(indexed) == ['a', 'd', 'c']
+    assert 'b' not in indexed
+    check_slots(indexed)
+
+def test_discard_last_and_missing():
+    indexed = IndexedList(['a', 'b'])
+    assert indexed.discard('b')
+    assert not indexed.discard('b')
+    assert list(indexed) == ['a']
+    check_slots(indexed)
+
+def test_remove_missing_raises():
+    indexed = IndexedList(['a'])
+    with pytest.raises(ValueError):
+        indexed.remove('b')
+    indexed.remove('a')
+    assert len(indexed) == 0
+
+def test_sort_rebuilds_slots():
+    indexed = IndexedList([3, 1, 2])
+    indexed.sort()
+    assert list(indexed) == [1, 2, 3]
+    indexed.sort(key=lambda element : -element)
+    assert indexed[0] == 3 and indexed[-1] == 1
+    check_slots(indexed)
+
+def test_clear():
+    indexed = IndexedList([1, 2])
+    indexed.clear()
+    assert len(indexed) == 0 and 1 not in indexed
+    indexed.append(1)
+    check_slots(indexed)
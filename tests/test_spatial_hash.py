@@ -0,0 +1,48 @@
+import pygame
+from utils.spatial_hash import SpatialHash
+
+def test_query_finds_elements_in_shared_cells():
+    spatial_hash = SpatialHash(64)
+    spatial_hash.update('a', pygame.Rect(10, 10, 20, 20))
+    spatial_hash.update('b', pygame.Rect(200, 200, 20, 20))
+    assert spatial_hash.query(pygame.Rect(0, 0, 5, 5)) == ['a']
+    assert sorted(spatial_hash.query(pygame.Rect(0, 0, 256, 256))) == ['a', 'b']
+    assert spatial_hash.query(pygame.Rect(500, 500, 5, 5)) == []
+
+def test_rect_over_cell_borders_spans_every_cell():
+    spatial_hash = SpatialHash(64)
+    spatial_hash.update('a', pygame.Rect(50, 50, 30, 30))
+    assert spatial_hash.spans['a'] == (0, 0, 1, 1)
+    for x, y in ((0, 0), (64, 0), (0, 64), (64, 64)):
+        assert spatial_hash.query(pygame.Rect(x, y, 1, 1)) == ['a']
+
+def test_rect_ending_on_a_border_stays_in_one_cell():
+    spatial_hash = SpatialHash(64)
+    spatial_hash.update('a', pygame.Rect(0, 0, 64, 64))
+    assert spatial_hash.spans['a'] == (0, 0, 0, 0)
+
+def test_negative_coordinates():
+    spatial_hash = SpatialHash(64)
+    spatial_hash.update('a', pygame.Rect(-70, -10, 20, 20))
+    assert spatial_hash.spans['a'] == (-2, -1, -1, 0)
+    assert spatial_hash.query(pygame.Rect(-1, -1, 1, 1)) == ['a']
+
+def test_update_moves_element_between_cells():
+    spatial_hash = SpatialHash(64)
+    spatial_hash.update('a', pygame.Rect(10, 10, 20, 20))
+    spatial_hash.update('a', pygame.Rect(300, 10, 20, 20))
+    assert spatial_hash.query(pygame.Rect(10, 10, 1, 1)) == []
+    assert spatial_hash.query(pygame.Rect(300, 10, 1, 1)) == ['a']
+    assert list(spatial_hash.cells) == [(4, 0)]
+    assert len(spatial_hash) == 1
+
+def test_remove_drops_empty_cells():
+    spatial_hash = SpatialHash(64)
+    spatial_hash.update('a', pygame.Rect(50, 50, 30, 30))
+    spatial_hash.update('b', pygame.Rect(10, 10, 5, 5))
+    spatial_hash.remove('a')
+    spatial_hash.remove('missing')
+    assert 'a' not in spatial_hash and 'b' in spatial_hash
+    assert list(spatial_hash.cells) == [(0, 0)]
+    spatial_hash.clear()
+    assert len(spatial_hash) == 0 and not spatial_hash.cells
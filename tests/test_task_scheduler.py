@@ -0,0 +1,93 @@
+from core.task_scheduler import TaskScheduler
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now : float = 0
+
+    def __call__(self) -> float:
+        return self.now
+
+def make_scheduler() -> tuple[TaskScheduler, FakeClock, list]:
+    return TaskScheduler(), FakeClock(), []
+
+def test_task_runs_once_after_its_time():
+    scheduler, clock, calls = make_scheduler()
+    task = scheduler.schedule_task((1, clock, 1), calls.append, 'a')
+    scheduler.update()
+    clock.now = 1
+    scheduler.update()
+    assert calls == [] and task.pending
+    clock.now = 1.5
+    scheduler.update()
+    scheduler.update()
+    assert calls == ['a'] and task.finished and not task.pending
+    assert len(scheduler) == 0 and not scheduler.heaps
+
+def test_tasks_run_in_deadline_order():
+    scheduler, clock, calls = make_scheduler()
+    scheduler.schedule_task((3, clock, 1), calls.append, 3)
+    scheduler.schedule_task((1, clock, 1), calls.append, 1)
+    scheduler.schedule_task((2, clock, 1), calls.append, 2)
+    clock.now = 10
+    scheduler.update()
+    assert calls == [1, 2, 3]
+
+def test_scale_factor_divides_the_duration():
+    scheduler, clock, calls = make_scheduler()
+    scheduler.schedule_task((10, clock, 5), calls.append, 'a')
+    clock.now = 2.5
+    scheduler.update()
+    assert calls == ['a']
+
+def test_cancelled_task_does_not_run():
+    scheduler, clock, calls = make_scheduler()
+    task = scheduler.schedule_task((1, clock, 1), calls.append, 'a')
+    scheduler.cancel(task)
+    clock.now = 5
+    scheduler.update()
+    assert calls == [] and not task.pending
+
+def test_repeating_task_skips_missed_runs():
+    scheduler, clock, calls = make_scheduler()
+    task = scheduler.schedule_repeating_task((1, clock, 1), 10, lambda : calls.append(clock.now))
+    clock.now = 1.5
+    scheduler.update()
+    clock.now = 4.5
+    scheduler.update()
+    assert calls == [1.5, 4.5]
+    assert task.deadline == 5
+    clock.now = 20
+    scheduler.update()
+    assert calls == [1.5, 4.5, 20] and task.finished
+
+def test_repeating_task_needs_a_positive_interval():
+    scheduler, clock, _ = make_scheduler()
+    try:
+        scheduler.schedule_repeating_task((0, clock, 1), 1, print)
+    except ValueError:
+        return
+    assert False, 'a zero interval was accepted'
+
+def test_continuous_task_runs_every_update_until_its_time():
+    scheduler, clock, calls = make_scheduler()
+    task = scheduler.schedule_continuous_task((1, clock, 1), calls.append, 'a')
+    scheduler.update()
+    clock.now = 0.5
+    scheduler.update()
+    clock.now = 2
+    scheduler.update()
+    scheduler.update()
+    assert calls == ['a', 'a', 'a'] and task.finished
+    assert len(scheduler) == 0
+
+def test_clear_cancels_everything():
+    scheduler, clock, calls = make_scheduler()
+    tasks = [scheduler.schedule_task((1, clock, 1), calls.append, 'a'),
+             scheduler.schedule_repeating_task((1, clock, 1), -1, calls.append, 'b'),
+             scheduler.schedule_continuous_task((1, clock, 1), calls.append, 'c')]
+    assert len(scheduler) == 3
+    scheduler.clear()
+    clock.now = 5
+    scheduler.update()
+    assert calls == [] and len(scheduler) == 0
+    assert not any(task.pending for task in tasks)
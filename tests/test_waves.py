@@ -0,0 +1,85 @@
+import random
+from collections import Counter
+from math import ceil
+from game.waves import WaveInfo, SpawnSchedule, WaveTable
+
+WAVE : WaveInfo = WaveInfo(0.5, {'normal' : 5, 'quick' : 3, 'tank' : 0}, 2)
+
+def test_schedule_holds_every_zombie_of_the_wave():
+    schedule = SpawnSchedule(WAVE, 1)
+    assert Counter(schedule.types) == Counter({'normal' : 5, 'quick' : 3})
+    assert schedule.get_remaining() == 8
+    assert len(schedule.times) == len(schedule.positions) == 8
+
+def test_schedule_spawns_one_heat_per_delay():
+    schedule = SpawnSchedule(WAVE, 1)
+    assert schedule.times == [0.5, 0.5, 1.0, 1.0, 1.5, 1.5, 2.0, 2.0]
+
+def test_schedule_is_deterministic_per_seed():
+    first = SpawnSchedule(WAVE, 42)
+    second = SpawnSchedule(WAVE, 42)
+    assert first.types == second.types and first.positions == second.positions
+    third = SpawnSchedule(WAVE, 43)
+    assert (first.types, first.positions) != (third.types, third.positions)
+
+def test_positions_are_on_the_edge_rectangle():
+    bounds = (960, 540)
+    schedule = SpawnSchedule(WaveInfo(0.1, {'normal' : 200}), 7, bounds, 60)
+    for x, y in schedule.positions:
+        assert -60 <= x <= 1020 and -60 <= y <= 600
+        assert x in (-60, 1020) or y in (-60, 600)
+
+def test_get_edge_position_stays_outside_bounds():
+    rng = random.Random(3)
+    for _ in range(100):
+        x, y = SpawnSchedule.get_edge_position(rng, (100, 50), 10)
+        assert not (0 <= x <= 100 and 0 <= y <= 50)
+
+def test_advance_moves_the_cursor():
+    schedule = SpawnSchedule(WAVE, 1)
+    assert schedule.advance(0.4) == ()
+    assert list(schedule.advance(0.5)) == [0, 1]
+    assert schedule.advance(0.5) == ()
+    assert list(schedule.advance(1.7)) == [2, 3, 4, 5]
+    assert schedule.get_remaining() == 2 and not schedule.is_done()
+    assert list(schedule.advance(100)) == [6, 7]
+    assert schedule.is_done()
+    assert schedule.advance(200) == ()
+
+def test_skip():
+    schedule = SpawnSchedule(WAVE, 1)
+    schedule.skip()
+    assert schedule.is_done() and schedule.get_remaining() == 0
+
+def test_empty_wave():
+    schedule = SpawnSchedule(WaveInfo(1, {}), 1)
+    assert schedule.is_done() and schedule.advance(10) == ()
+
+def test_table_returns_copies():
+    table = WaveTable()
+    wave = table.get_wave(1)
+    wave.zombie_count['normal'] = 0
+    assert table.get_wave(1).zombie_count['normal'] == 10
+    assert table.defined_waves == 15
+
+def test_table_scales_waves_past_the_last_one():
+    table = WaveTable()
+    last = table.get_wave(15)
+    wave = table.get_wave(17)
+    assert abs(wave.spawn_delay - last.spawn_delay * 0.95 ** 2) < 1e-9
+    assert wave.zombie_count == {ztype : ceil(count * 1.1 ** 2) for ztype, count in last.zombie_count.items()}
+    assert wave.zombie_per_heat == last.zombie_per_heat
+    assert table.get_wave(20).zombie_per_heat == last.zombie_per_heat + 1
+    assert table.get_wave(200).spawn_delay == 0.1
+
+def test_table_breaks_and_final_wave():
+    table = WaveTable()
+    assert table.is_area_break(5) and table.is_area_break(10) and not table.is_area_break(6)
+    assert table.is_final_wave(15) and table.is_final_wave(16) and not table.is_final_wave(14)
+
+def test_spawn_kwargs():
+    table = WaveTable()
+    assert table.get_spawn_kwargs('normal', 0) == {'health' : 9, 'speed' : 3.5}
+    assert table.get_spawn_kwargs('tank', 1) == {'health' : 20, 'speed' : 3, 'damage' : 2}
+    assert abs(table.get_spawn_kwargs('ranged', 2)['speed'] - 2.2) < 1e-9
+    assert table.get_score('quick') == 3
@@ -0,0 +1,165 @@
+import pygame
+import os
+import sys
+import struct
+from hashlib import sha1
+from typing import Any
+
+class AssetManager:
+    '''Loads images and sounds the first time they are asked for and hands out the same object for repeated requests.
+    Images are post-processed once (converted to the display format, flattened onto a colorkey, scaled), then the raw pixels
+    are written to the disk cache and read back with frombuffer on later launches, skipping the decode and the transforms.
+    Sounds keep their decoded samples the same way. Cache entries are keyed by the source mtime and every parameter that
+    changes the result, so editing an asset or a transform rebuilds its entry.
+    Returned objects are shared: copy an image before drawing on it, and don't change the volume of a shared sound.'''
+    MAGIC : bytes = b'SZRC'
+    #magic, width, height, per pixel alpha, has colorkey, colorkey
+    IMAGE_HEADER : struct.Struct = struct.Struct('<4sHHBB4B')
+    #The layout of display surfaces that raw pixels are stored in, blue first in memory
+    DISPLAY_MASKS : tuple[int, int, int] = (0xff0000, 0xff00, 0xff)
+
+    def __init__(self, cache_dir : str = 'assets/cache') -> None:
+        self.cache_dir : str = cache_dir
+        #The browser build has no persistent disk to speak of
+        self.use_disk_cache : bool = sys.platform != 'emscripten'
+        self.images : dict[tuple, pygame.Surface] = {}
+        self.sounds : dict[tuple, pygame.mixer.Sound] = {}
+        self.hits : int = 0
+        self.disk_hits : int = 0
+        self.misses : int = 0
+
+    @staticmethod
+    def get_colorkey(colorkey : Any) -> tuple[int, int, int, int]|None:
+        if colorkey is None: return None
+        return tuple(pygame.Color(colorkey))
+
+    def get_cache_path(self, path : str, kind : str, params : tuple) -> str|None:
+        '''Returns where the processed asset is cached, or None if it can't be cached.
+        The name starts with a hash of the source path, so stale entries of the same source can be found and replaced.'''
+        if not self.use_disk_cache: return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        source = sha1(f'{kind}:{path}'.encode()).hexdigest()[:10]
+        version = sha1(repr((stat.st_mtime_ns, stat.st_size, params)).encode()).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f'{source}-{version}.{kind}')
+
+    def write_cache(self, cache_path : str, header : bytes, data : Any):
+        '''Writes the entry and removes the older entries of the same source. A failed write only costs the cache.'''
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            source = os.path.basename(cache_path).split('-')[0]
+            for name in os.listdir(self.cache_dir):
+                if name.startswith(source + '-'): os.remove(os.path.join(self.cache_dir, name))
+            temp_path = cache_path + '.tmp'
+            with open(temp_path, 'wb') as file:
+                file.write(header)
+                file.write(data)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def read_cache(cache_path : str) -> bytearray|None:
+        try:
+            with open(cache_path, 'rb') as file:
+                data = bytearray(os.fstat(file.fileno()).st_size)
+                file.readinto(data)
+            return data
+        except OSError:
+            return None
+
+    def get_image(self, path : str, alpha : bool = True, colorkey : Any = None, flatten : bool = False, scale : float = 1) -> pygame.Surface:
+        '''Returns the image at path converted for the display: with per pixel alpha if alpha is True, opaque otherwise.
+        colorkey is set on the image; with flatten, the alpha image is first blitted onto a background of colorkey.
+        The image is then scaled by scale.'''
+        colorkey = self.get_colorkey(colorkey)
+        if flatten: alpha = False
+        key = (path, alpha, colorkey, flatten, scale)
+        image = self.images.get(key, None)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        display = pygame.display.get_surface()
+        cache_path = None
+        if display is not None and display.get_bitsize() == 32 and display.get_masks()[:3] == self.DISPLAY_MASKS:
+            cache_path = self.get_cache_path(path, 'image', key)
+        if cache_path is not None: image = self.load_cached_image(cache_path)
+        if image is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            image = self.process_image(path, alpha, colorkey, flatten, scale, display is not None)
+            if cache_path is not None: self.save_cached_image(cache_path, image)
+        self.images[key] = image
+        return image
+
+    @staticmethod
+    def process_image(path : str, alpha : bool, colorkey : tuple|None, flatten : bool, scale : float, convert : bool) -> pygame.Surface:
+        image = pygame.image.load(path)
+        if flatten:
+            source = image.convert_alpha() if convert else image
+            image = pygame.Surface(source.get_size())
+            image.fill(colorkey)
+            image.blit(source, (0, 0))
+        elif convert:
+            image = image.convert_alpha() if alpha else image.convert()
+        if colorkey is not None: image.set_colorkey(colorkey)
+        if scale != 1: image = pygame.transform.scale_by(image, scale)
+        return image
+
+    def save_cached_image(self, cache_path : str, image : pygame.Surface):
+        width, height = image.get_size()
+        alpha = bool(image.get_flags() & pygame.SRCALPHA)
+        if image.get_pitch() != width * 4: return
+        colorkey = image.get_colorkey()
+        header = self.IMAGE_HEADER.pack(self.MAGIC, width, height, alpha, colorkey is not None, *(colorkey or (0, 0, 0, 0)))
+        self.write_cache(cache_path, header, image.get_buffer().raw)
+
+    def load_cached_image(self, cache_path : str) -> pygame.Surface|None:
+        data = self.read_cache(cache_path)
+        if data is None or len(data) < self.IMAGE_HEADER.size: return None
+        magic, width, height, alpha, keyed, *colorkey = self.IMAGE_HEADER.unpack_from(data)
+        pixels = memoryview(data)[self.IMAGE_HEADER.size:]
+        if magic != self.MAGIC or len(pixels) != width * height * 4: return None
+        if alpha:
+            #The surface uses the file's buffer as its pixels, it keeps the bytearray alive
+            image = pygame.image.frombuffer(pixels, (width, height), 'BGRA')
+        else:
+            #There is no frombuffer format for opaque display surfaces, so the pixels are copied straight into one
+            image = pygame.Surface((width, height))
+            if image.get_pitch() != width * 4: return None
+            image.get_buffer().write(bytes(pixels))
+        if keyed: image.set_colorkey(colorkey)
+        return image
+
+    def get_sound(self, path : str, volume : float|None = None) -> pygame.mixer.Sound:
+        '''Returns the sound at path, set to volume. Requests for the same path and volume share one Sound.'''
+        key = (path, volume)
+        sound = self.sounds.get(key, None)
+        if sound is not None:
+            self.hits += 1
+            return sound
+
+        mixer_format = pygame.mixer.get_init()
+        cache_path = self.get_cache_path(path, 'sound', mixer_format) if mixer_format else None
+        data = self.read_cache(cache_path) if cache_path is not None else None
+        if data:
+            self.disk_hits += 1
+            sound = pygame.mixer.Sound(buffer=data)
+        else:
+            self.misses += 1
+            sound = pygame.mixer.Sound(path)
+            if cache_path is not None: self.write_cache(cache_path, b'', sound.get_raw())
+        if volume is not None: sound.set_volume(volume)
+        self.sounds[key] = sound
+        return sound
+
+    def clear(self):
+        '''Forgets the loaded assets. The disk cache is kept.'''
+        self.images.clear()
+        self.sounds.clear()
+
+assets = AssetManager()
@@ -0,0 +1,68 @@
+from math import floor
+
+def build_grid(positions : list[tuple[float, float]], cell_size : float) -> dict[tuple[int, int], list[int]]:
+    '''Buckets the indexes of positions by the grid cell they fall in.'''
+    grid : dict[tuple[int, int], list[int]] = {}
+    for index, (x, y) in enumerate(positions):
+        cell = (floor(x / cell_size), floor(y / cell_size))
+        bucket = grid.get(cell, None)
+        if bucket is None:
+            grid[cell] = [index]
+        else:
+            bucket.append(index)
+    return grid
+
+def get_nearby(grid : dict[tuple[int, int], list[int]], cell_size : float, x : float, y : float) -> list[int]:
+    '''Returns the indexes in the 3x3 block of cells around (x, y).
+    Every position closer than cell_size is included, farther ones can be included too.'''
+    cx, cy = floor(x / cell_size), floor(y / cell_size)
+    found : list[int] = []
+    for ox in (-1, 0, 1):
+        for oy in (-1, 0, 1):
+            bucket = grid.get((cx + ox, cy + oy), None)
+            if bucket: found.extend(bucket)
+    return found
+
+def find_clusters(positions : list[tuple[float, float]], radius : float, min_count : int) -> dict[tuple[float, float], int]:
+    '''Finds groups of at least min_count positions within radius of each other. Returns the center and size of each group.
+    A position starts a cluster with the later positions within radius of it (inclusive).
+    Clusters that start less than radius apart are then merged into the first one that claims them.'''
+    radius_squared = radius * radius
+    #Cells a bit larger than radius so float rounding can never push a neighbour two cells away
+    cell_size = radius + 1
+    grid = build_grid(positions, cell_size)
+
+    clusters : dict[tuple[float, float], set[int]] = {}
+    for i, (x, y) in enumerate(positions):
+        members : set[int] = {i}
+        for j in get_nearby(grid, cell_size, x, y):
+            if j <= i: continue
+            other_x, other_y = positions[j]
+            if (x - other_x) ** 2 + (y - other_y) ** 2 <= radius_squared:
+                members.add(j)
+        if len(members) >= min_count: clusters[(x, y)] = members
+
+    starts : list[tuple[float, float]] = list(clusters)
+    start_grid = build_grid(starts, cell_size)
+    claimed : set[int] = set()
+    grouped : dict[tuple[float, float], int] = {}
+    for i, start in enumerate(starts):
+        if i in claimed: continue
+        claimed.add(i)
+        x, y = start
+        group : list[int] = [i]
+        for j in sorted(get_nearby(start_grid, cell_size, x, y)):
+            if j <= i or j in claimed: continue
+            other_x, other_y = starts[j]
+            if (x - other_x) ** 2 + (y - other_y) ** 2 < radius_squared:
+                group.append(j)
+                claimed.add(j)
+        members : set[int] = set()
+        x_sum : float = 0
+        y_sum : float = 0
+        for j in group:
+            members.update(clusters[starts[j]])
+            x_sum += starts[j][0]
+            y_sum += starts[j][1]
+        grouped[(x_sum / len(group), y_sum / len(group))] = len(members)
+    return grouped
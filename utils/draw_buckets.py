@@ -0,0 +1,65 @@
+from typing import Any, Generic, Iterator, TypeVar
+from utils.indexed_list import IndexedList
+
+T = TypeVar('T')
+
+class DrawBuckets(Generic[T]):
+    '''Files elements by zindex. There are only a few distinct zindexes, so the draw order is kept without sorting the elements:
+    only the zindexes are sorted, when one is added or removed. Elements of the same zindex have no particular order.'''
+    def __init__(self) -> None:
+        self.buckets : dict[Any, IndexedList[T]] = {}
+        self.keys : list[Any] = []
+        self.slots : dict[T, Any] = {}
+        self.order : list[T]|None = None
+
+    def add(self, element : T, zindex : Any):
+        '''Files the element under zindex, moving it if it was filed under another one.'''
+        current = self.slots.get(element, None)
+        if current is not None:
+            if current == zindex: return
+            self.remove(element)
+        bucket = self.buckets.get(zindex, None)
+        if bucket is None:
+            bucket = self.buckets[zindex] = IndexedList()
+            self.keys.append(zindex)
+            self.keys.sort()
+        bucket.append(element)
+        self.slots[element] = zindex
+        self.order = None
+
+    def remove(self, element : T):
+        zindex = self.slots.pop(element, None)
+        if zindex is None: return
+        bucket = self.buckets[zindex]
+        bucket.discard(element)
+        if not bucket:
+            del self.buckets[zindex]
+            self.keys.remove(zindex)
+        self.order = None
+
+    def clear(self):
+        self.buckets.clear()
+        self.keys.clear()
+        self.slots.clear()
+        self.order = None
+
+    def get_buckets(self) -> Iterator[IndexedList[T]]:
+        '''Yields the buckets from the lowest zindex to the highest.'''
+        buckets = self.buckets
+        for zindex in self.keys:
+            yield buckets[zindex]
+
+    def get_order(self) -> list[T]:
+        '''Returns every element in draw order. The list is rebuilt only after elements were added, moved or removed.'''
+        if self.order is None:
+            order : list[T] = []
+            for bucket in self.get_buckets():
+                order.extend(bucket)
+            self.order = order
+        return self.order
+
+    def __contains__(self, element : T) -> bool:
+        return element in self.slots
+
+    def __len__(self) -> int:
+        return len(self.slots)
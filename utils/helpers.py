@@ -3,6 +3,8 @@ from math import copysign
 from typing import Callable, Any, Union
 from random import random
 from collections import OrderedDict
+from functools import wraps
+from utils.asset_manager import assets
 
 def to_roman(num : int) -> str:
 
@@ -113,6 +115,30 @@ def random_float(a : float, b : float):
     return pygame.math.lerp(a, b, random())
 
 
+def _freeze(value : Any) -> Any:
+    if isinstance(value, (list, pygame.Color)): return tuple(value)
+    return value
+
+def cached_surface(factory : Callable[..., pygame.Surface]):
+    '''Memoizes a function that draws a surface from its parameters.
+    Calling the function returns a copy of the memoized surface that can be drawn on.
+    function.shared(...) returns the memoized surface itself, which must not be modified.'''
+    cache : dict[tuple, pygame.Surface] = {}
+    def shared(*args, **kwargs) -> pygame.Surface:
+        key = (tuple(_freeze(arg) for arg in args), tuple((name, _freeze(arg)) for name, arg in sorted(kwargs.items())))
+        surface = cache.get(key, None)
+        if surface is None:
+            surface = cache[key] = factory(*args, **kwargs)
+        return surface
+
+    @wraps(factory)
+    def make(*args, **kwargs) -> pygame.Surface:
+        return shared(*args, **kwargs).copy()
+    make.shared = shared
+    make.cache = cache
+    return make
+
+@cached_surface
 def make_upgrade_bar(width : int = 100, length : int = 20, count = 5, border : int = 3, border_color : str|ColorType = 'Black', 
                      bg_color : str|ColorType = (90, 90, 90)):
     surf = pygame.surface.Surface((width + border * 2, (length + border) * count + border))
@@ -129,6 +155,7 @@ def reset_upgrade_bar(surf : pygame.Surface, count : int = 5, width : int = 100,
     for index in range(count):
         pygame.draw.rect(surf, bg_color, (border, (length + border) * index + border, width, length))
 
+@cached_surface
 def make_right_arrow(height : int, width : int, color : ColorType|str = (255, 0, 0), colorkey : ColorType|str = (0, 255, 0)) -> pygame.Surface:
     surface = pygame.surface.Surface((width, height))
     surface.set_colorkey(colorkey)
@@ -136,6 +163,7 @@ def make_right_arrow(height : int, width : int, color : ColorType|str = (255, 0,
     pygame.draw.polygon(surface, color, [(0,0), (width, height // 2), (0, height)])
     return surface
 
+@cached_surface
 def make_circle(radius : int, color : ColorType|str, colorkey : ColorType|str = (0, 255, 0)) -> pygame.Surface:
     d = radius * 2
     surface : pygame.Surface = pygame.Surface((d, d))
@@ -146,12 +174,8 @@ def make_circle(radius : int, color : ColorType|str, colorkey : ColorType|str =
 
 
 def load_alpha_to_colorkey(path : str, colorkey : ColorType|str):
-    image = pygame.image.load(path).convert_alpha()
-    new_surf = pygame.surface.Surface(image.get_size())
-    new_surf.set_colorkey(colorkey)
-    new_surf.fill(colorkey)
-    new_surf.blit(image, (0,0))
-    return new_surf
+    '''Returns the image at path blitted onto a background of colorkey. The surface is shared through the asset manager.'''
+    return assets.get_image(path, colorkey=colorkey, flatten=True)
 
 def tuple_vec_average(l : list[tuple[float, float]]) -> float:
     x_sum : float = 0
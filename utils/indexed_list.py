@@ -0,0 +1,59 @@
+from typing import Callable, Generic, Iterator, TypeVar, Any
+
+T = TypeVar('T')
+
+class IndexedList(Generic[T]):
+    '''List of unique elements that remembers the slot of each element.
+    Membership checks, appends and removals are O(1). Removing an element moves the last element into its slot.'''
+    def __init__(self, elements : list[T]|None = None) -> None:
+        self.elements : list[T] = []
+        self.slots : dict[T, int] = {}
+        if elements:
+            for element in elements:
+                self.append(element)
+
+    def append(self, element : T):
+        '''Adds the element at the end. Nothing changes if the element is already present.'''
+        if element in self.slots: return
+        self.slots[element] = len(self.elements)
+        self.elements.append(element)
+
+    def discard(self, element : T) -> bool:
+        '''Removes the element by swapping the last element into its slot. Returns False if the element was not present.'''
+        slot = self.slots.pop(element, None)
+        if slot is None: return False
+        last = self.elements.pop()
+        if last is not element:
+            self.elements[slot] = last
+            self.slots[last] = slot
+        return True
+
+    def remove(self, element : T):
+        if not self.discard(element):
+            raise ValueError(f'{element} is not in the list')
+
+    def index(self, element : T) -> int:
+        return self.slots[element]
+
+    def sort(self, key : Callable[[T], Any]|None = None, reverse : bool = False):
+        self.elements.sort(key=key, reverse=reverse)
+        self.slots = {element : slot for slot, element in enumerate(self.elements)}
+
+    def clear(self):
+        self.elements.clear()
+        self.slots.clear()
+
+    def __contains__(self, element : T) -> bool:
+        return element in self.slots
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.elements)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __getitem__(self, index : int|slice) -> T|list[T]:
+        return self.elements[index]
+
+    def __repr__(self) -> str:
+        return f'IndexedList({self.elements})'
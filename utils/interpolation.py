@@ -1,4 +1,6 @@
 """Module that contains multiple lerp related utility functions."""
+from typing import Any, Callable
+
 def compatibilty_lerp(a, b, t : float):
     try: return a + (b-a) * t 
     except: pass
@@ -24,6 +26,49 @@ def lerp(a, b, t : float):
 
     return [a[i] + (b[i] - a[i]) * t for i in range(2)]
 
+def scalar_lerp(a, b, t : float):
+    '''Lerp for values supporting arithmetic (numbers and vectors).'''
+    return a + (b - a) * t
+
+def method_lerp(a, b, t : float):
+    '''Lerp for values with their own lerp method that do not support arithmetic (like pygame.Color).
+    The lerp methods of pygame refuse to extrapolate, so values of t outside of [0, 1] are handled like sequences.'''
+    if 0 <= t <= 1: return a.lerp(b, t)
+    return sequence_lerp(a, b, t)
+
+def sequence_lerp(a, b, t : float):
+    '''Lerp for sequences (like tuples), element by element.'''
+    return [a[i] + (b[i] - a[i]) * t for i in range(len(a))]
+
+def pair_lerp(a, b, t : float):
+    return [a[i] + (b[i] - a[i]) * t for i in range(2)]
+
+def get_lerp(a, b, compatibility : bool = True) -> Callable[[Any, Any, float], Any]:
+    '''Returns the specialized lerp that compatibilty_lerp (or lerp, if compatibility is False) would end up using for a and b.
+    The checks are done once here, so tweens do not go through the exceptions on every update.'''
+    try:
+        a + (b - a) * 0.5
+        return scalar_lerp
+    except Exception:
+        if not compatibility: return pair_lerp
+
+    try:
+        a.lerp(b, 0.5)
+        return method_lerp
+    except Exception: pass
+
+    try: size_a, size_b = len(a), len(b)
+    except Exception: raise ValueError("Compatibilty checks failed")
+    else:
+        if size_a != size_b: raise ValueError("Size mismatch")
+
+    try:
+        sequence_lerp(a, b, 0.5)
+        return sequence_lerp
+    except Exception: pass
+
+    raise ValueError(f"Compatibilty checks failed ({a} does not match {b})")
+
     
 
 
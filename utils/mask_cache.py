@@ -0,0 +1,30 @@
+import pygame
+from weakref import WeakKeyDictionary
+
+class MaskCache:
+    '''Shares one mask per surface. Entries are weak, so a mask is dropped together with its surface.
+    Surfaces that get drawn on after their mask was built must be passed to invalidate().'''
+    def __init__(self) -> None:
+        self.masks : WeakKeyDictionary[pygame.Surface, pygame.Mask] = WeakKeyDictionary()
+        self.hits : int = 0
+        self.misses : int = 0
+
+    def get(self, surface : pygame.Surface) -> pygame.Mask:
+        mask = self.masks.get(surface, None)
+        if mask is not None:
+            self.hits += 1
+            return mask
+        self.misses += 1
+        mask = self.masks[surface] = pygame.mask.from_surface(surface)
+        return mask
+
+    def invalidate(self, surface : pygame.Surface):
+        self.masks.pop(surface, None)
+
+    def clear(self):
+        self.masks.clear()
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+mask_cache = MaskCache()
@@ -1,7 +1,15 @@
 from time import perf_counter
 from typing import Callable
 
+def get_precise_source(time_source : Callable[[], float]) -> Callable[[], float]:
+    '''Returns a version of time_source that ignores clock snapshots, all the way down the chain of timers.'''
+    if getattr(time_source, '__func__', None) is Timer.get_time:
+        return time_source.__self__.get_precise_time
+    return time_source
+
 class Timer:
+    #Set by take_snapshot: get_time returns it instead of reading the time source, until the next snapshot or a restart/pause
+    snapshot : float|None = None
     
     @staticmethod
     def time_source() -> float:
@@ -10,9 +18,12 @@ class Timer:
     def get_timestamp(self) -> float:
         return self.time_source() * self.scale_factor
     
-    def __init__(self, treshold : float = -1, time_source : Callable[[], float]|None = None, scale_factor : float = 1.0) -> None:
+    def __init__(self, treshold : float = -1, time_source : Callable[[], float]|None = None, scale_factor : float = 1.0,
+                 precise : bool = False) -> None:
+        '''Precise timers read their clocks directly instead of the snapshots taken once per frame.'''
         self.duration = treshold
         self.time_source : Callable[[], float]
+        if precise: time_source = get_precise_source(time_source or Timer.time_source)
         if time_source: self.time_source = time_source
         self.scale_factor : float = scale_factor
         self.start_time = self.get_timestamp()
@@ -28,6 +39,7 @@ class Timer:
         return cls(duration)
     
     def restart(self):
+        self.snapshot = None
         self.start_time = self.get_timestamp()
         
         self.paused = False
@@ -40,11 +52,13 @@ class Timer:
     
     def pause(self):
         if self.paused: return
+        self.snapshot = None
         self.pause_start = self.get_timestamp()
         self.paused = True
     
     def unpause(self):
         if not self.paused: return
+        self.snapshot = None
         self.pause_duration += self.get_timestamp() - self.pause_start
         self.paused = False
         self.pause_start = None
@@ -54,7 +68,22 @@ class Timer:
         else: self.pause()
     
     def get_time(self):
+        if self.snapshot is not None: return self.snapshot
         return self.get_timestamp() - self.start_time - self.get_pause_time()
+
+    def get_precise_time(self):
+        '''get_time, reading the clocks directly even if they hold a snapshot.'''
+        timestamp = get_precise_source(self.time_source)() * self.scale_factor
+        pause_time = self.pause_duration if not self.paused else self.pause_duration + timestamp - self.pause_start
+        return timestamp - self.start_time - pause_time
+
+    def take_snapshot(self):
+        '''Freezes get_time to the current time, so timers using this one as their clock skip the chain of calls down to perf_counter.'''
+        self.snapshot = None
+        self.snapshot = self.get_precise_time()
+
+    def release_snapshot(self):
+        self.snapshot = None
     
     def get_real_time(self):
         return self.get_timestamp() - self.start_time
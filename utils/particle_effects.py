@@ -4,8 +4,14 @@ from utils.animation import Animation
 import utils.interpolation as interpolation
 from random import random
 from math import sin, radians, cos
+from itertools import repeat
 from game.sprite import Sprite
 from utils.pivot_2d import Pivot2D
+from utils.indexed_list import IndexedList
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 def __random_float(a, b):
     return random() * (b-a) + a
@@ -22,18 +28,32 @@ def vec_from_angle(angle, magnitude = 1) -> pygame.Vector2:
     y = cos(radians(angle)) * -1
     return pygame.Vector2(x, y) * magnitude
 
+def rand_array(iterable, count : int):
+    '''Vectorized rand_float: returns count values picked like rand_float(iterable) would, or None if iterable is None.'''
+    if iterable is None: return iterable
+    t = type(iterable)
+    if t == int or t == float: return numpy.full(count, iterable, dtype=numpy.float64)
+    return numpy.random.uniform(iterable[0], iterable[1], count)
+
 
 class Particle(Sprite):
-    active_elements : list['Particle'] = []
-    inactive_elements : list['Particle']  = []
+    __slots__ = ('lifetime', 'lifetime_timer', 'velocity', 'accelaration', 'drag', 'update_method', 'textures', 'active',
+                 'kill_offscreen', 'anim_track')
+    active_elements : IndexedList['Particle'] = IndexedList()
+    inactive_elements : IndexedList['Particle'] = IndexedList()
     test_image = pygame.surface.Surface((4,4))
     pygame.draw.rect(test_image, 'White', (0, 0, 4, 4))
 
+    bounding_box : pygame.Rect = pygame.Rect(0, 0, 960, 540)
+    #The active slot shadows the read-only Sprite.active property, particles keep their own flag
+
     def __init__(self) -> None:
         self._position = pygame.Vector2(0,0)
         self.lifetime : float = 0
         self.lifetime_timer : Timer = Timer(-1)
         self.pivot : Pivot2D|None = None
+        self.dynamic_mask : bool = False
+        self._zombie : bool = False
 
         self.velocity : pygame.Vector2
         self.accelaration : pygame.Vector2
@@ -49,7 +69,7 @@ class Particle(Sprite):
     
     def spawn(self, pos, lifetime, update_method, main_texture : pygame.Surface, velocity = None, accel = None, drag = None, 
               alt_textures = None, anim : Animation = None, destroy_offscreen : bool = False, angle = None, mag = None, copy_surf = False):
-        self.position = pos
+        self._position = pygame.Vector2(pos)
 
         if copy_surf is False:
             self.image = main_texture
@@ -94,7 +114,7 @@ class Particle(Sprite):
         if self.update_method == 'simulated':
 
             self.velocity += self.accelaration * 0.5 * delta
-            self.position += self.velocity * delta
+            self.move(self.velocity, delta)
             self.velocity += self.accelaration * 0.5 * delta
 
             self.velocity *=  ((1 - self.drag) ** delta)
@@ -107,24 +127,12 @@ class Particle(Sprite):
     
     def draw(self, display : pygame.Surface):
         display.blit(self.image, self.rect)
-    
-    @classmethod
-    def pool(cls, element):
-        '''Transfers an element from active to inactive state. Nothing changes if the element is already inactive.'''
-        if element in cls.active_elements:
-            cls.active_elements.remove(element)
-        
-        if element not in cls.inactive_elements:
-            cls.inactive_elements.append(element)
-    
+
     @classmethod
-    def unpool(cls, element):
-        '''Transfers an element from inactive to active state. Nothing changes if the element is already active.'''
-        if element not in cls.active_elements:
-            cls.active_elements.append(element)
-        
-        if element in cls.inactive_elements:
-            cls.inactive_elements.remove(element)
+    def update_all(cls, delta : float):
+        '''Particles pool themselves when they die, so a copy of the active elements is iterated.'''
+        for element in cls.active_elements[:]:
+            element.update(delta)
     
     @classmethod
     def clear_elements(cls):
@@ -156,9 +164,174 @@ class Particle(Sprite):
     def y(self, value):
         self.position.y = value
     
+#Particles are drawn by their effects and stay out of the Sprite lists
+Particle._pool_classes = (Particle,)
+
+class ParticleBatch:
+    '''Simulates plain particles as a structure of arrays: one vectorized integrate and cull pass per frame, one blits call to draw them.
+    Only used for effects without an animation that use the 'simulated' update method and share their texture.
+    Particles belong to a track slot, so effects can count their live particles without looking at them one by one.'''
+    FIELDS : tuple[tuple[str, int, str], ...] = (('positions', 2, 'float64'), ('velocities', 2, 'float64'), ('accels', 2, 'float64'),
+                                                 ('drags', 1, 'float64'), ('expire_times', 1, 'float64'), ('textures', 1, 'int32'),
+                                                 ('owners', 1, 'int32'), ('kill_offscreen', 1, 'bool'))
+    def __init__(self, capacity : int = 1024) -> None:
+        self.count : int = 0
+        self.capacity : int = 0
+        self.positions : numpy.ndarray
+        self.velocities : numpy.ndarray
+        self.accels : numpy.ndarray
+        self.drags : numpy.ndarray
+        self.expire_times : numpy.ndarray
+        self.textures : numpy.ndarray
+        self.owners : numpy.ndarray
+        self.kill_offscreen : numpy.ndarray
+        self.grow(capacity)
+
+        self.surfaces : list[pygame.Surface] = []
+        self.surface_indexes : dict[pygame.Surface, int] = {}
+        self.half_sizes = numpy.zeros((0, 2), dtype=numpy.float64)
+
+        self.track_counts = numpy.zeros(16, dtype=numpy.int64)
+        self.free_tracks : list[int] = list(range(15, -1, -1))
+        self.bounds : pygame.Rect = pygame.Rect(0, 0, 960, 540)
+        self.use_fblits : bool = hasattr(pygame.Surface, 'fblits')
+
+    @staticmethod
+    def is_available() -> bool:
+        return numpy is not None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def grow(self, capacity : int):
+        '''Reallocates every array to hold capacity particles, keeping the live ones.'''
+        for name, width, dtype in self.FIELDS:
+            new_array = numpy.zeros((capacity, width) if width > 1 else capacity, dtype=dtype)
+            if self.capacity: new_array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, new_array)
+        self.capacity = capacity
+
+    def get_texture_index(self, surface : pygame.Surface) -> int:
+        index = self.surface_indexes.get(surface, None)
+        if index is not None: return index
+        index = self.surface_indexes[surface] = len(self.surfaces)
+        self.surfaces.append(surface)
+        self.half_sizes = numpy.concatenate((self.half_sizes, numpy.array([surface.get_size()], dtype=numpy.float64) / 2))
+        return index
+
+    def acquire_track(self) -> int:
+        '''Returns a free track slot for a ParticleEffectTrack.'''
+        if not self.free_tracks:
+            old_size = len(self.track_counts)
+            self.track_counts = numpy.concatenate((self.track_counts, numpy.zeros(old_size, dtype=numpy.int64)))
+            self.free_tracks.extend(range(old_size * 2 - 1, old_size - 1, -1))
+        return self.free_tracks.pop()
+
+    def release_track(self, track : int):
+        '''Destroys the particles of the track slot and frees it.'''
+        if self.track_counts[track]:
+            self.cull(self.owners[:self.count] != track)
+        self.track_counts[track] = 0
+        self.free_tracks.append(track)
+
+    def emit(self, track : int, count : int, origin : pygame.Vector2, data : dict, now : float):
+        '''Spawns count particles described by an effect dictionary (see TEMPLATE) around origin.'''
+        if count <= 0: return
+        start = self.count
+        end = start + count
+        if end > self.capacity:
+            capacity = self.capacity
+            while capacity < end: capacity *= 2
+            self.grow(capacity)
+
+        positions = self.positions[start:end]
+        positions[:, 0] = rand_array(data['offset_x'], count) + origin[0]
+        positions[:, 1] = rand_array(data['offset_y'], count) + origin[1]
+
+        velocities = self.velocities[start:end]
+        if (data['velocity_x'] is None) or (data['velocity_y'] is None):
+            velocities[:] = 0
+        else:
+            velocities[:, 0] = rand_array(data['velocity_x'], count)
+            velocities[:, 1] = rand_array(data['velocity_y'], count)
+        angles = rand_array(data['angle'], count)
+        if angles is not None:
+            magnitudes = rand_array(data['speed'], count)
+            if magnitudes is None: magnitudes = 1
+            angles = numpy.radians(angles)
+            velocities[:, 0] += numpy.sin(angles) * magnitudes
+            velocities[:, 1] -= numpy.cos(angles) * magnitudes
+
+        self.accels[start:end, 0] = rand_array(data['accel_x'], count)
+        self.accels[start:end, 1] = rand_array(data['accel_y'], count)
+        drags = rand_array(data['drag'], count)
+        self.drags[start:end] = 0 if drags is None else drags
+        self.expire_times[start:end] = rand_array(data['lifetime'], count) + now
+        self.textures[start:end] = self.get_texture_index(data['main_texture'])
+        self.owners[start:end] = track
+        self.kill_offscreen[start:end] = data.get('destroy_offscreen', True)
+        self.track_counts[track] += count
+        self.count = end
+
+    def update(self, delta : float, now : float):
+        '''Integrates every particle (half-step Verlet and drag, like Particle.update) then destroys the expired and offscreen ones.'''
+        count = self.count
+        if count == 0: return
+        positions = self.positions[:count]
+        velocities = self.velocities[:count]
+        half_accels = self.accels[:count] * (0.5 * delta)
+        velocities += half_accels
+        positions += velocities * delta
+        velocities += half_accels
+        velocities *= ((1 - self.drags[:count]) ** delta)[:, None]
+
+        keep = self.expire_times[:count] >= now
+        kill_offscreen = self.kill_offscreen[:count]
+        if kill_offscreen.any():
+            bounds = self.bounds
+            half_sizes = self.half_sizes[self.textures[:count]]
+            low = positions + half_sizes
+            high = positions - half_sizes
+            onscreen = (low[:, 0] > bounds.left) & (high[:, 0] < bounds.right) & (low[:, 1] > bounds.top) & (high[:, 1] < bounds.bottom)
+            keep &= onscreen | ~kill_offscreen
+        if not keep.all(): self.cull(keep)
+
+    def cull(self, keep : numpy.ndarray):
+        '''Keeps the particles where keep is True, in order, and updates the track counts.'''
+        count = self.count
+        self.track_counts -= numpy.bincount(self.owners[:count][~keep], minlength=len(self.track_counts))
+        kept = int(numpy.count_nonzero(keep))
+        for name, _, _ in self.FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:count][keep]
+        self.count = kept
+
+    def draw(self, display : pygame.Surface):
+        '''Blits every particle in one call. Surface.fblits skips building the list of changed rects, it is used when pygame provides it.'''
+        count = self.count
+        if count == 0: return
+        textures = self.textures[:count]
+        topleft = numpy.rint(self.positions[:count] - self.half_sizes[textures]).astype(numpy.int32)
+        coordinates = zip(topleft[:, 0].tolist(), topleft[:, 1].tolist())
+        surfaces = self.surfaces
+        if len(surfaces) == 1:
+            sequence = zip(repeat(surfaces[0], count), coordinates)
+        else:
+            sequence = zip([surfaces[index] for index in textures.tolist()], coordinates)
+        if self.use_fblits: display.fblits(sequence)
+        else: display.blits(sequence, doreturn=False)
+
+    def clear(self):
+        self.count = 0
+        self.track_counts[:] = 0
+
+particle_batch : ParticleBatch|None = ParticleBatch() if ParticleBatch.is_available() else None
+
 class ParticleEffect:
     elements : list['ParticleEffect'] = []
     data : dict[str, dict] = {}
+    #Turned off by the quality governor: effects keep running their tracks but emit nothing
+    emission_enabled : bool = True
     def __init__(self, data, persistance, dynamic_origin = False) -> None:
         self.data = data
         ParticleEffect.elements.append(self)
@@ -168,6 +341,12 @@ class ParticleEffect:
         self.is_persistent = persistance
         self.dynamic_origin = dynamic_origin
         self.position = pygame.Vector2(0,0)
+        self.batched : bool = particle_batch is not None and self.can_batch(data)
+
+    @staticmethod
+    def can_batch(data : dict) -> bool:
+        '''Whether the particles of data can be simulated by the ParticleBatch rather than as Particle sprites.'''
+        return data['update_method'] == 'simulated' and data['animation'] is None and not data['copy_surface']
     
     @classmethod
     def load_effect(cls, name, persistance = False, dynamic_origin = False):
@@ -175,8 +354,25 @@ class ParticleEffect:
             return ParticleEffect(cls.data[name], persistance, dynamic_origin)
         return None
     
+    def emit_many(self, track : 'ParticleEffectTrack', count : int):
+        if count <= 0: return
+        if not ParticleEffect.emission_enabled:
+            track.total_count += count
+            return
+        if not self.batched:
+            for _ in range(count):
+                self.emit(track)
+            return
+        if track.batch_slot is None: track.batch_slot = particle_batch.acquire_track()
+        origin = self.position if self.dynamic_origin else track.origin
+        particle_batch.emit(track.batch_slot, count, origin, self.data, Timer.time_source())
+        track.total_count += count
+
     def emit(self, track : 'ParticleEffectTrack'):
-        new_particle : Particle = Particle.inactive_elements[0]
+        if self.batched or not ParticleEffect.emission_enabled:
+            self.emit_many(track, 1)
+            return
+        new_particle : Particle = Particle.get_inactive()
 
         offset = pygame.Vector2(rand_float(self.data['offset_x']), rand_float(self.data['offset_y']))
         if not self.dynamic_origin:
@@ -204,8 +400,7 @@ class ParticleEffect:
     def play(self, pos : pygame.Vector2):
         new_track = ParticleEffectTrack(pos, self.data['cooldown'])
         self.tracks.append(new_track)
-        for _ in range(self.data['init_spawn_count']):
-            self.emit(new_track)
+        self.emit_many(new_track, self.data['init_spawn_count'])
 
     def update(self):
         if len(self.tracks) <= 0 and self.is_persistent == False:
@@ -225,22 +420,14 @@ class ParticleEffect:
             count, remainder = divmod(track.timer.get_time() , track.timer.duration)
             track.timer.restart()
             if track.can_emit:
-                for _ in range(round(count)):
-                    self.emit(track)
+                self.emit_many(track, round(count))
             track.timer.start_time -= remainder
 
-            
-
-        if (len(track.active) == 0) and ((track.total_count >= self.data['target_spawn_count']) or (track.can_emit == False)):
+        if track.active:
+            track.active = [part for part in track.active if part.active]
+        if (track.get_live_count() == 0) and ((track.total_count >= self.data['target_spawn_count']) or (track.can_emit == False)):
+            track.cleanup()
             track.ended = True
-        
-        to_del = []
-        for part in track.active:
-            if part.is_active() == False:
-                to_del.append(part)
-
-        for part in to_del:
-            track.active.remove(part)
 
     def stop(self):
         for track in self.tracks:
@@ -258,8 +445,27 @@ class ParticleEffect:
     
     @classmethod
     def update_all(cls):
-        for element in cls.elements:
+        for element in cls.elements[:]:
             element.update()
+
+    @classmethod
+    def update_particles(cls, delta : float, bounds : pygame.Rect):
+        '''Updates the effects, then moves and culls every particle. Particles that leave bounds are destroyed.'''
+        cls.update_all()
+        Particle.bounding_box = bounds
+        Particle.update_all(delta)
+        if particle_batch is not None:
+            particle_batch.bounds = bounds
+            particle_batch.update(delta, Timer.time_source())
+
+    @classmethod
+    def draw_particles(cls, display : pygame.Surface):
+        Particle.draw_all(display)
+        if particle_batch is not None: particle_batch.draw(display)
+
+    @staticmethod
+    def has_particles() -> bool:
+        return len(Particle.active_elements) > 0 or (particle_batch is not None and particle_batch.count > 0)
     
     def shedule_destruction(self):
         self.destroy_on_end = True
@@ -269,6 +475,7 @@ class ParticleEffectTrack:
     def __init__(self, origin, cooldown) -> None:
         self.total_count = 0
         self.active : list[Particle] = []
+        self.batch_slot : int|None = None
         self.timer : Timer = Timer(cooldown)
         self.origin = origin
         self.ended = False
@@ -278,6 +485,14 @@ class ParticleEffectTrack:
         for part in self.active:
             part.destroy()
         self.active.clear()
+        if self.batch_slot is not None:
+            particle_batch.release_track(self.batch_slot)
+            self.batch_slot = None
+
+    def get_live_count(self) -> int:
+        live_count = len(self.active)
+        if self.batch_slot is not None: live_count += int(particle_batch.track_counts[self.batch_slot])
+        return live_count
     
     def stop_emission(self):
         self.can_emit = False
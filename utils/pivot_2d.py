@@ -1,17 +1,20 @@
 import pygame
 from typing import Any
+from utils.rotation_cache import RotationCache
 def rotate_around_pivot_accurate(image : pygame.Surface, pos : pygame.Vector2, angle : float,
-                        offset : pygame.Vector2 = None, debug = False, colorkey : pygame.Color|None = None):
-    
-    if colorkey is not None:
-        prev_colorkey = image.get_colorkey()
-        image.set_colorkey(colorkey)
-
-    new_image = pygame.transform.rotate(image, -angle)
+                        offset : pygame.Vector2 = None, debug = False, colorkey : pygame.Color|None = None, cache : RotationCache|None = None):
+    '''When a cache is given, the returned image is shared and must not be modified.'''
+    if cache is not None:
+        new_image = cache.rotate(image, angle, colorkey)
+    else:
+        if colorkey is not None:
+            prev_colorkey = image.get_colorkey()
+            image.set_colorkey(colorkey)
+        new_image = pygame.transform.rotate(image, -angle)
+        if colorkey is not None: image.set_colorkey(prev_colorkey)
     new_pos = pos - offset.rotate(angle)
 
     new_rect = new_image.get_rect(center = round(new_pos))
-    if colorkey is not None: image.set_colorkey(prev_colorkey)
     if debug:
         return new_image, new_rect, new_pos, [pygame.Vector2(0,0)]
     else:
@@ -22,7 +25,10 @@ def rotate_around_pivot_pos_only(pos : pygame.Vector2, angle : float, offset : p
 
 
 class Pivot2D:
-    def __init__(self, pos : pygame.Vector2, og_image : pygame.Surface|None = None, colorkey : pygame.Color|None = None) -> None:
+    def __init__(self, pos : pygame.Vector2, og_image : pygame.Surface|None = None, colorkey : pygame.Color|None = None,
+                 cache : RotationCache|None = None) -> None:
+        '''Rotated images come from cache when one is given (usually utils.rotation_cache.rotation_cache).
+        Only worth it for sprites that come back to the same image and angle, and the rotated images must not be modified.'''
         self._origin : pygame.Vector2 = pos
         self._pivot_offset : pygame.Vector2 = pygame.Vector2(0,0)
         self._angle : float = 0
@@ -30,6 +36,7 @@ class Pivot2D:
         self.is_cached : bool = True
         self.original_image : pygame.Surface|None = og_image
         self.img_colorkey : pygame.Color|None = colorkey
+        self.cache : RotationCache|None = cache
     
     @property
     def origin(self):
@@ -71,10 +78,10 @@ class Pivot2D:
         self.origin += offset
     
     def rotate_image(self, image : pygame.Surface) -> tuple[pygame.Surface, pygame.Rect, pygame.Vector2]:
-        return rotate_around_pivot_accurate(image, self._origin, self._angle, self._pivot_offset, debug=False, colorkey=self.img_colorkey)
+        return rotate_around_pivot_accurate(image, self._origin, self._angle, self._pivot_offset, debug=False, colorkey=self.img_colorkey, cache=self.cache)
     
     def rotate_og_image(self):
         return self.rotate_image(self.original_image)
     
     def rotate_image_debug(self, image : pygame.Surface) -> tuple[pygame.Surface, pygame.Rect, pygame.Vector2, Any]:
-        return rotate_around_pivot_accurate(image, self._origin, self._angle, self._pivot_offset, debug=True, colorkey=self.img_colorkey)
\ No newline at end of file
+        return rotate_around_pivot_accurate(image, self._origin, self._angle, self._pivot_offset, debug=True, colorkey=self.img_colorkey, cache=self.cache)
\ No newline at end of file
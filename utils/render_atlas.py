@@ -0,0 +1,47 @@
+import pygame
+from utils.mask_cache import mask_cache
+
+class RenderAtlas:
+    '''Surfaces shared by many sprites, each with its mask built once. Sprites keep the index of their surface.
+    A variant is fitted to the size of its base surface, so swapping a sprite between them never changes its rect or mask size.
+    The variant keeps its top left corner on the base, where a sprite drew a swapped image of another size without moving its rect.
+    Surfaces in the atlas are shared and must not be drawn on.'''
+    def __init__(self) -> None:
+        self.surfaces : list[pygame.Surface] = []
+        self.masks : list[pygame.Mask] = []
+        self.indexes : dict[pygame.Surface, int] = {}
+
+    def add(self, surface : pygame.Surface) -> int:
+        '''Returns the index of surface, adding it if it is not in the atlas yet.'''
+        index = self.indexes.get(surface, None)
+        if index is not None: return index
+        index = self.indexes[surface] = len(self.surfaces)
+        self.surfaces.append(surface)
+        self.masks.append(mask_cache.get(surface))
+        return index
+
+    def add_variant(self, base_index : int, surface : pygame.Surface) -> int:
+        '''Adds surface as a variant of the surface at base_index, drawn at the top left of a surface of the base size if the sizes differ.
+        Parts of a larger variant past the base size are cut off.'''
+        base = self.surfaces[base_index]
+        if surface.get_size() != base.get_size():
+            colorkey = surface.get_colorkey()
+            if colorkey is not None:
+                fitted = pygame.Surface(base.get_size(), 0, surface)
+                fitted.fill(colorkey)
+                fitted.set_colorkey(colorkey)
+            else:
+                #The space around the variant must stay see-through, even for an opaque variant
+                fitted = pygame.Surface(base.get_size(), pygame.SRCALPHA)
+                fitted.fill((0, 0, 0, 0))
+            fitted.blit(surface, (0, 0))
+            surface = fitted
+        return self.add(surface)
+
+    def get_size(self, index : int) -> tuple[int, int]:
+        return self.surfaces[index].get_size()
+
+    def __len__(self) -> int:
+        return len(self.surfaces)
+
+render_atlas = RenderAtlas()
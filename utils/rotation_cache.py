@@ -0,0 +1,61 @@
+import pygame
+from collections import OrderedDict
+
+class RotationCache:
+    '''Shared cache of rotated surfaces, keyed by (source surface, quantized angle, colorkey).
+    Angles are kept exact unless angle_step is set, in which case they are snapped to multiples of it. The least recently used surfaces are dropped once
+    the rotated surfaces take more than memory_budget bytes.
+    The source surfaces are held by the cache, so a key never points to a recycled surface.
+    Cached surfaces are shared: callers must not draw on them or change their alpha, colorkey or clip.'''
+    def __init__(self, angle_step : float = 0, memory_budget : int = 32 * 1024 * 1024) -> None:
+        self.angle_step : float = angle_step
+        self.memory_budget : int = memory_budget
+        self.entries : OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.memory_used : int = 0
+        self.hits : int = 0
+        self.misses : int = 0
+
+    def quantize(self, angle : float) -> float:
+        step = self.angle_step
+        if step <= 0: return angle % 360
+        return (round(angle / step) * step) % 360
+
+    def rotate(self, image : pygame.Surface, angle : float, colorkey : pygame.Color|tuple|None = None) -> pygame.Surface:
+        '''Returns image rotated clockwise by angle, like pygame.transform.rotate(image, -angle).
+        colorkey is applied to image only for the rotation, like Pivot2D does.'''
+        angle = self.quantize(angle)
+        key_colorkey = tuple(colorkey) if colorkey is not None else image.get_colorkey()
+        key = (image, angle, key_colorkey)
+        entries = self.entries
+        rotated = entries.get(key, None)
+        if rotated is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return rotated
+
+        self.misses += 1
+        if colorkey is not None:
+            prev_colorkey = image.get_colorkey()
+            image.set_colorkey(colorkey)
+        rotated = pygame.transform.rotate(image, -angle)
+        if colorkey is not None: image.set_colorkey(prev_colorkey)
+
+        entries[key] = rotated
+        self.memory_used += self.get_size(rotated)
+        while self.memory_used > self.memory_budget and len(entries) > 1:
+            _, evicted = entries.popitem(last=False)
+            self.memory_used -= self.get_size(evicted)
+        return rotated
+
+    @staticmethod
+    def get_size(surface : pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+    def clear(self):
+        self.entries.clear()
+        self.memory_used = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+rotation_cache = RotationCache()
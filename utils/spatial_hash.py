@@ -0,0 +1,74 @@
+import pygame
+from typing import Any
+
+class SpatialHash:
+    '''Uniform grid that buckets elements by the cells their rect overlaps.
+    Elements are moved between buckets incrementally with update() whenever their rect changes.'''
+    def __init__(self, cell_size : int = 64, owner : Any|None = None) -> None:
+        self.cell_size : int = cell_size
+        self.owner : Any|None = owner
+        self.cells : dict[tuple[int, int], dict[Any, None]] = {}
+        self.spans : dict[Any, tuple[int, int, int, int]] = {}
+
+    def get_span(self, rect : pygame.Rect) -> tuple[int, int, int, int]:
+        size = self.cell_size
+        return (rect.left // size, rect.top // size, (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def update(self, element : Any, rect : pygame.Rect):
+        '''Inserts the element or moves it to the cells covered by rect. Nothing changes if the cells are the same.'''
+        size = self.cell_size
+        left, top, width, height = rect
+        new_span = (left // size, top // size, (left + width - 1) // size, (top + height - 1) // size)
+        old_span = self.spans.get(element, None)
+        if old_span == new_span: return
+        if old_span is not None:
+            self._remove_span(element, old_span)
+        self.spans[element] = new_span
+        cells = self.cells
+        x0, y0, x1, y1 = new_span
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                bucket = cells.get((x, y), None)
+                if bucket is None:
+                    cells[(x, y)] = {element : None}
+                else:
+                    bucket[element] = None
+
+    def remove(self, element : Any):
+        '''Removes the element from the grid. Nothing changes if the element is not in the grid.'''
+        old_span = self.spans.pop(element, None)
+        if old_span is None: return
+        self._remove_span(element, old_span)
+
+    def _remove_span(self, element : Any, span : tuple[int, int, int, int]):
+        cells = self.cells
+        x0, y0, x1, y1 = span
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                bucket = cells[(x, y)]
+                del bucket[element]
+                if not bucket: del cells[(x, y)]
+
+    def query(self, rect : pygame.Rect) -> list[Any]:
+        '''Returns every element sharing at least one cell with rect. Elements can still miss the rect itself.'''
+        cells = self.cells
+        x0, y0, x1, y1 = self.get_span(rect)
+        if x0 == x1 and y0 == y1:
+            bucket = cells.get((x0, y0), None)
+            return list(bucket) if bucket else []
+        found : dict[Any, None] = {}
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                bucket = cells.get((x, y), None)
+                if bucket: found.update(bucket)
+        return list(found)
+
+    def clear(self):
+        self.cells.clear()
+        self.spans.clear()
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __contains__(self, element : Any) -> bool:
+        return element in self.spans
@@ -5,6 +5,27 @@ import utils.interpolation as interpolation
 from utils.my_timer import Timer
 from typing import Callable, Any
 from time import perf_counter
+from operator import attrgetter
+
+AttributeAccessors = tuple[Callable[[object], Any], Callable[[object, Any], None]]
+_accessors : dict[str, AttributeAccessors] = {}
+
+def get_accessors(name : str) -> AttributeAccessors:
+    '''Returns a getter and a setter for a (possibly dotted) attribute path, like "rect.centery". They are compiled once per path.
+    The objects along the path are looked up on every call, so replacing them (like a new rect) is picked up.'''
+    accessors = _accessors.get(name, None)
+    if accessors is not None: return accessors
+    getter = attrgetter(name)
+    owner_path, _, reach = name.rpartition('.')
+    if owner_path:
+        get_owner = attrgetter(owner_path)
+        def setter(obj : object, value : Any):
+            setattr(get_owner(obj), reach, value)
+    else:
+        def setter(obj : object, value : Any):
+            setattr(obj, reach, value)
+    accessors = _accessors[name] = (getter, setter)
+    return accessors
 
 def new_tween(target : object, info : 'TweenInfo', goal : dict, use_compatibilty_lerp = True, update_manually = False, play_now = True,
               time_source : Callable[[], float]|None = None, time_factor : float = 1):
@@ -23,6 +44,8 @@ class TweenTrack:
         self.info = info
         self.goal = goal
         self.start : dict[str, Any] = {}
+        #(setter, lerp, start, goal) for every goal, built by play
+        self.channels : list[tuple[Callable[[object, Any], None], Callable[[Any, Any, float], Any], Any, Any]] = []
         self.timer : Timer = None
         self.use_compatibilty_lerp : bool = use_compat_lerp
         self.is_playing = False
@@ -71,8 +94,11 @@ class TweenTrack:
 
     def play(self):
         if not self._can_play: return
-        for attr in self.goal:
-            self.start[attr] = self.get_chained_attribute(self.target, attr)
+        self.channels = []
+        for attr, goal in self.goal.items():
+            getter, setter = get_accessors(attr)
+            start = self.start[attr] = getter(self.target)
+            self.channels.append((setter, interpolation.get_lerp(start, goal, self.use_compatibilty_lerp), start, goal))
         self.timer = Timer(self.info.time, self.time_source, self.time_factor)
         self.has_finished = False
         self.is_playing = True
@@ -83,6 +109,7 @@ class TweenTrack:
     
     def destroy(self):
         self.start.clear()
+        self.channels = []
         self.goal.clear()
         self.info = None
         self.target = None
@@ -113,15 +140,11 @@ class TweenTrack:
             alpha = 1
             self.has_finished = True
             self.is_playing = False
-        lerp_func : Callable[[Any, Any, float], Any]
-        if self.use_compatibilty_lerp:
-            lerp_func = interpolation.compatibilty_lerp
-        else:
-            lerp_func = interpolation.lerp
-        for attr in self.goal:
-            result = lerp_func(self.start[attr], self.goal[attr], self.info.easying_style(alpha))
-            #print(f'{self.start[attr]} --> {self.goal[attr]} : {result}')
-            self.set_chained_attribute(self.target, attr, result)
+        if not self.channels: return
+        target = self.target
+        eased = self.info.easying_style(alpha)
+        for setter, lerp_func, start, goal in self.channels:
+            setter(target, lerp_func(start, goal, eased))
       
     @classmethod
     def update_all(cls):
@@ -3,20 +3,18 @@ from utils.ui.ui_sprite import UiSprite
 from utils.helpers import rotate_around_pivot_accurate
 
 class BrightnessOverlay(UiSprite):
+    '''Brightens or darkens what is under its rect. The overlay surface is allocated once and refilled when the brightness changes,
+    and an overlay that isn't scaled, rotated, faded or filtered is drawn with a single fill instead of a blit.'''
     def __init__(self, brightness : int, rect: pygame.Rect, tag: int, name: str | None = None, attributes: dict = None, data: dict = None, zindex: int = 0):
         super().__init__(None, rect, tag, name, None, attributes, data, None, zindex)
         self._experimental_blend : bool = True
         self._opacity = 1
         self._brightness = brightness
-        if self._experimental_blend:
-            self._blend_mode = pygame.BLEND_RGB_ADD if self._brightness >= 0 else pygame.BLEND_RGB_MULT
-            abs_brightness = abs(self._brightness) if self._brightness >= 0 else 255 - abs(self._brightness)
-        else:
-            self._blend_mode = pygame.BLEND_RGB_ADD if self._brightness >= 0 else pygame.BLEND_RGB_SUB
-            abs_brightness = abs(self._brightness)
-
-        self.surf = pygame.surface.Surface(self.rect.size)
-        self.surf.fill((abs_brightness, abs_brightness, abs_brightness))
+        self.color : tuple[int, int, int] = (0, 0, 0)
+        self.base_surf : pygame.Surface|None = None
+        #Whether surf is the plain base surface, so drawing it is the same as filling the rect with color
+        self.uniform : bool = False
+        self._render()
     
     @property
     def brightness(self):
@@ -28,6 +26,15 @@ class BrightnessOverlay(UiSprite):
         self._blend_mode = pygame.BLEND_RGB_ADD if self._brightness >= 0 else pygame.BLEND_RGB_MULT
         self._render()
     
+    @property
+    def opacity(self):
+        return self._opacity
+
+    @opacity.setter
+    def opacity(self, val):
+        UiSprite.opacity.fset(self, val)
+        self.uniform = False
+
     def _render(self):
         if self._experimental_blend:
             self._blend_mode = pygame.BLEND_RGB_ADD if self._brightness >= 0 else pygame.BLEND_RGB_MULT
@@ -35,11 +42,17 @@ class BrightnessOverlay(UiSprite):
         else:
             self._blend_mode = pygame.BLEND_RGB_ADD if self._brightness >= 0 else pygame.BLEND_RGB_SUB
             abs_brightness = abs(self._brightness)
-        self.surf = pygame.surface.Surface(self.rect.size)
-        self.surf.fill((abs_brightness, abs_brightness, abs_brightness))
+        self.color = (abs_brightness, abs_brightness, abs_brightness)
+        if self.base_surf is None or self.base_surf.get_size() != self.rect.size:
+            self.base_surf = pygame.surface.Surface(self.rect.size)
+        self.surf = self.base_surf
+        self.surf.set_alpha(None)
+        self.surf.fill(self.color)
+        self.uniform = True
         scalex_offset, scaley_offset = self._scale.x - 1, self._scale.y - 1
         if abs(scalex_offset) > 0.001 or abs(scaley_offset) > 0.001:
             self.surf = pygame.transform.scale_by(self.surf, self.scale)
+            self.uniform = False
 
         
         
@@ -48,14 +61,20 @@ class BrightnessOverlay(UiSprite):
                 self.surf, self.rect, self.position = rotate_around_pivot_accurate(self.surf, self.position, self._angle, self.position, pygame.Vector2(0,0))
             else:
                 self.surf, self.rect, self._position = self._pivot.rotate_image(self.surf)
+            self.uniform = False
 
         opacity_offset =  1- self._opacity
         if abs(opacity_offset) > 0.002:
             self.surf.set_alpha(self._opacity * 255)
+            self.uniform = False
 
         for filter in self.filters:
             filter.apply(self.surf)
+            self.uniform = False
     
     def draw(self, display : pygame.Surface):
-        if self.visible:
-            display.blit(self.surf, self.rect, special_flags=self._blend_mode)
\ No newline at end of file
+        if not self.visible: return
+        if self.uniform:
+            display.fill(self.color, self.rect, special_flags=self._blend_mode)
+        else:
+            display.blit(self.surf, self.rect, special_flags=self._blend_mode)
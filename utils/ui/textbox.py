@@ -2,9 +2,9 @@ import pygame
 from math import floor
 from utils.ui.ui_sprite import UiSprite
 from utils.helpers import rotate_around_pivot_accurate
+from utils.asset_manager import assets
 class TextBox(UiSprite):
-    main_image = pygame.image.load('assets/graphics/button_templates/textbox_green_colorkey.png').convert()
-    main_image.set_colorkey((0, 255, 0))
+    main_image = assets.get_image('assets/graphics/button_templates/textbox_green_colorkey.png', False, (0, 255, 0))
     main_font = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 40)
     def __init__(self, surf: pygame.Surface, rect: pygame.Rect, tag: int, text : str, name: str | None = None, keep_og_surf=False, 
                  attributes: dict = None, data: dict = None, forced_og_surf: pygame.Surface = None, zindex: int = 0, 
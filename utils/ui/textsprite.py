@@ -2,6 +2,7 @@ import pygame
 from math import floor
 from utils.ui.ui_sprite import UiSprite
 from utils.helpers import rotate_around_pivot_accurate
+from utils.ui.glyph_atlas import text_renderer
 class TextSprite(UiSprite):
     main_font = pygame.font.Font(r'assets/fonts/Pixeltype.ttf', 40)
     def __init__(self, position : pygame.Vector2|tuple, rect_alignment : str|None, tag: int, text : str, name: str | None = None, attributes: dict = None, 
@@ -27,6 +28,8 @@ class TextSprite(UiSprite):
         if text_stroke_settings:
             self._text_stroke_color, self._text_stroke_width = text_stroke_settings
         self.rect_alignment = rect_alignment
+        #Surface shared with the line cache of the text renderer, copied before being modified in place
+        self._shared_surf : pygame.Surface|None = None
         self._render_text(force_surf = True)
         self.rect = self.surf.get_rect()
         self.rect.__setattr__(self.rect_alignment, position) if self.rect_alignment is not None else self.rect.__setattr__('center', position)
@@ -51,8 +54,10 @@ class TextSprite(UiSprite):
                 self.surf, self.rect, self._position = self._pivot.rotate_image(self.surf)
 
         if abs(opacity_offset) > 0.002:
+            self._own_surf()
             self.surf.set_alpha(self._opacity * 255)        
         for filter in self.filters:
+            self._own_surf()
             filter.apply(self.surf)
         if self.rect_alignment:
             self.rect.__setattr__(self.rect_alignment, prev_mesure)
@@ -64,6 +69,12 @@ class TextSprite(UiSprite):
         color : pygame.Color|str
         AA_enabled : bool
         font, color, AA_enabled = self.text_settings
+        surf = text_renderer.render(self._true_text, font, color, AA_enabled, self.colorkey,
+                                    self._text_stroke_color, self._text_stroke_width, self.max_line_lentgh)
+        self._shared_surf = surf
+        if surf is not None:
+            self.surf = surf
+            return
         if self._text_stroke_color and self._text_stroke_width:
             final_surf_size = (pygame.Vector2(self._text_stroke_width, self._text_stroke_width) * 2) + (1,1) + font.size(self._true_text)
             if self.colorkey:
@@ -97,6 +108,20 @@ class TextSprite(UiSprite):
             if self.colorkey:
                 self.surf.set_colorkey(self.colorkey)
     
+    def _own_surf(self):
+        if self._shared_surf is not None and self.surf is self._shared_surf:
+            self.surf = self.surf.copy()
+        self._shared_surf = None
+
+    @property
+    def opacity(self):
+        return self._opacity
+
+    @opacity.setter
+    def opacity(self, val):
+        self._own_surf()
+        UiSprite.opacity.fset(self, val)
+
     @property
     def text(self):
         return self._text
@@ -19,6 +19,13 @@ class UiFilter:
 
 class UiSprite:
     TAG_EVENT = pygame.event.custom_type()
+    #Whether the class draws with UiSprite.draw, so its elements can be batched in a single blits call
+    _plain_draw : bool = True
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._plain_draw = cls.draw is UiSprite.draw
+
     def __init__(self, surf : pygame.Surface, rect : pygame.Rect, tag : int, name : str|None = None, keep_og_surf = False, 
                  attributes : dict = None, data : dict = None, forced_og_surf : pygame.Surface = None, zindex : int = 0,
                  colorkey : ColorType|str|None = None):
@@ -66,6 +73,7 @@ class UiSprite:
             self._position = pygame.Vector2(0,0)
         self.filters : list[UiFilter] = []
         self._angle : float = 0
+        #No rotation cache: rendered surfaces get their opacity and filters applied in place, so they can't be shared
         self._pivot : Pivot2D = Pivot2D(self.position)
         self._pivot_origin : pygame.Vector2
         self._pivot_offset : pygame.Vector2